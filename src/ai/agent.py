@@ -1,16 +1,18 @@
 from __future__ import annotations
 
+import contextlib
 import os
 import random
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 import tensorflow as tf
 
-from .buffer import ReplayBuffer
-from .checkpoint import TrainState, load_state, save_state
-from .model import build_q_network
+from .buffer import FrameReplayBuffer, PrioritizedFrameReplayBuffer, PrioritizedReplayBuffer, ReplayBuffer, Transition
+from .checkpoint import WEIGHTS_FILE, CheckpointWriter, Snapshot, TrainState, load_state, load_weights, save_state
+from .model import build_conv_q_network, build_q_network
+from .numpy_policy import NumpyPolicy
 
 
 @dataclass
@@ -26,29 +28,97 @@ class AgentConfig:
     epsilon_start: float
     epsilon_end: float
     epsilon_decay_steps: int
+    prioritized: bool = False
+    per_alpha: float = 0.6
+    per_beta_start: float = 0.4
+    per_beta_steps: int = 100000
+    double_dqn: bool = False
+    xla: bool = False
+    obs_shape: Optional[Tuple[int, ...]] = None  # (k, H, W) frame stacks; None: obs_dim features
+
+
+class KerasPolicy:
+    """Greedy policy run by the Keras model itself, for conv nets (no NumPy mirror)."""
+
+    def __init__(self, model):
+        self.model = None
+        self.sync_from(model)
+
+    def sync_from(self, model) -> None:
+        if model is not self.model:  # same model: weights are already live
+            self.model = model
+            self._q = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+
+    def act(self, obs: np.ndarray) -> int:
+        return int(np.argmax(self._q(np.asarray(obs)[None])[0]))
+
+    def act_batch(self, obs: np.ndarray) -> np.ndarray:
+        return np.argmax(self._q(np.asarray(obs)).numpy(), axis=1)
 
 
 class DQNAgent:
     def __init__(self, cfg: AgentConfig):
         self.cfg = cfg
-        self.q = build_q_network(cfg.obs_dim, cfg.n_actions, cfg.lr)
-        self.target = build_q_network(cfg.obs_dim, cfg.n_actions, cfg.lr)
+        self.q = self._build_network()
+        self.target = self._build_network()
         self.target.set_weights(self.q.get_weights())
+        self._update_fn = self._build_update_fn()
+        self._snapshot_fn = None
+        # act() runs on a NumPy mirror of self.q (KerasPolicy for conv nets), refreshed lazily after updates
+        self.policy = self._make_policy()
+        self._policy_stale = False
 
-        self.buffer = ReplayBuffer(cfg.buffer_size)
+        pixels = cfg.obs_shape is not None
+        if cfg.prioritized:
+            buffer_cls = PrioritizedFrameReplayBuffer if pixels else PrioritizedReplayBuffer
+            self.buffer = buffer_cls(cfg.buffer_size, alpha=cfg.per_alpha)
+        else:
+            # frame stacks share frames: each one is stored once
+            self.buffer = FrameReplayBuffer(cfg.buffer_size) if pixels else ReplayBuffer(cfg.buffer_size)
+        # held around priority write-back; AsyncLearner swaps in a real lock
+        self.buffer_lock = contextlib.nullcontext()
         self.step_count = 0
         self.epsilon = cfg.epsilon_start
         self.best_score = 0.0
 
+    def _build_network(self):
+        if self.cfg.obs_shape is not None:
+            return build_conv_q_network(self.cfg.obs_shape, self.cfg.n_actions, self.cfg.lr)
+        return build_q_network(self.cfg.obs_dim, self.cfg.n_actions, self.cfg.lr)
+
+    def _make_policy(self):
+        if self.cfg.obs_shape is not None:
+            return KerasPolicy(self.q)
+        return NumpyPolicy.from_keras(self.q)
+
     def act(self, obs: np.ndarray, training: bool) -> int:
         if training and random.random() < self.epsilon:
             return random.randint(0, self.cfg.n_actions - 1)
-        qvals = self.q(np.expand_dims(obs, axis=0), training=False).numpy()[0]
-        return int(np.argmax(qvals))
+        return self.numpy_policy().act(obs)
+
+    def act_batch(self, obs: np.ndarray, training: bool) -> np.ndarray:
+        """Epsilon-greedy actions for a [K, obs_dim] batch, one forward pass for all rows."""
+        actions = self.numpy_policy().act_batch(obs)
+        if training:
+            explore = np.random.rand(len(actions)) < self.epsilon
+            n = int(explore.sum())
+            if n:
+                actions[explore] = np.random.randint(0, self.cfg.n_actions, size=n)
+        return actions
+
+    def numpy_policy(self) -> NumpyPolicy:
+        """NumPy mirror of self.q (KerasPolicy for pixel input), refreshed if updates happened since the last call."""
+        if self._policy_stale:
+            self.policy.sync_from(self.q)
+            self._policy_stale = False
+        return self.policy
 
     def remember(self, s, a, r, s2, d) -> None:
         self.buffer.add(s, a, r, s2, d)
 
+    def remember_batch(self, s, a, r, s2, d) -> None:
+        self.buffer.add_batch(s, a, r, s2, d)
+
     def _decay_epsilon(self) -> None:
         if self.cfg.epsilon_decay_steps <= 0:
             return
@@ -56,49 +126,130 @@ class DQNAgent:
         self.epsilon = self.cfg.epsilon_start + frac * (self.cfg.epsilon_end - self.cfg.epsilon_start)
         self.epsilon = float(max(min(self.epsilon, self.cfg.epsilon_start), self.cfg.epsilon_end))
 
-    def train_step(self) -> Optional[float]:
+    def _per_beta(self) -> float:
+        if self.cfg.per_beta_steps <= 0:
+            return 1.0
+        frac = min(1.0, self.step_count / float(self.cfg.per_beta_steps))
+        return self.cfg.per_beta_start + frac * (1.0 - self.cfg.per_beta_start)
+
+    def sample_batch(self) -> Tuple[Transition, Optional[np.ndarray], Optional[np.ndarray]]:
+        """(batch, PER indices, IS weights) for one update; indices/weights are None for uniform replay."""
+        if self.cfg.prioritized:
+            return self.buffer.sample_prioritized(self.cfg.batch_size, self._per_beta())
+        return self.buffer.sample(self.cfg.batch_size), None, None
+
+    def train_step(self, batch: Optional[tuple] = None) -> Optional[float]:
+        """One update. `batch` is an optional pre-sampled sample_batch() result (prefetching)."""
         self.step_count += 1
         self._decay_epsilon()
 
         if len(self.buffer) < self.cfg.train_start:
             return None
 
-        batch = self.buffer.sample(self.cfg.batch_size)
-        s = batch.s
-        a = batch.a
-        r = batch.r
-        s2 = batch.s2
-        d = batch.d
+        sync = self.step_count % self.cfg.target_update == 0
+        transitions, idx, weights = batch if batch is not None else self.sample_batch()
+        loss, td_errors = self._update(transitions, weights, sync)
+        if self.cfg.prioritized:
+            with self.buffer_lock:
+                self.buffer.update_priorities(idx, td_errors)
 
-        # target Q
-        q_next = self.target(s2, training=False).numpy()
-        max_next = np.max(q_next, axis=1)
-        y = r + (1.0 - d) * self.cfg.gamma * max_next
+        return loss
 
-        q_pred = self.q(s, training=False).numpy()
-        q_pred[np.arange(len(a)), a] = y
+    def _update(self, batch: Transition, weights: Optional[np.ndarray], sync: bool) -> Tuple[float, np.ndarray]:
+        """One gradient step on a batch; returns (loss, TD errors)."""
+        if weights is None:
+            weights = np.ones(len(batch.a), dtype=np.float32)
+        loss, td_errors = self._update_fn(batch.s, batch.a, batch.r, batch.s2, batch.d, weights, sync)
+        self._policy_stale = True
+        return float(loss), td_errors.numpy()
 
-        loss = float(self.q.train_on_batch(s, q_pred))
+    def _build_update_fn(self):
+        """Target, TD loss, gradient step and optional target sync as one tf.function."""
+        q, target = self.q, self.target
+        optimizer = q.optimizer
+        if not getattr(optimizer, "built", False):
+            optimizer.build(q.trainable_variables)
+        gamma = self.cfg.gamma
+        n_actions = float(self.cfg.n_actions)
+        double_dqn = self.cfg.double_dqn
 
-        if self.step_count % self.cfg.target_update == 0:
-            self.target.set_weights(self.q.get_weights())
+        def update(s, a, r, s2, d, w, sync):
+            q_next = target(s2, training=False)
+            if double_dqn:
+                # online net picks the action, target net evaluates it
+                a_next = tf.argmax(q(s2, training=False), axis=1)
+                next_v = tf.gather(q_next, a_next, axis=1, batch_dims=1)
+            else:
+                next_v = tf.reduce_max(q_next, axis=1)
+            y = r + (1.0 - d) * gamma * next_v
 
-        return loss
+            with tf.GradientTape() as tape:
+                q_sa = tf.gather(q(s, training=True), a, axis=1, batch_dims=1)
+                td = y - q_sa
+                # same scale as Keras "mse" against the patched target matrix
+                loss = tf.reduce_mean(w * tf.square(td)) / n_actions
+            grads = tape.gradient(loss, q.trainable_variables)
+            optimizer.apply_gradients(zip(grads, q.trainable_variables))
+
+            # sync is a Python bool: one trace per value, no cond in the graph
+            if sync:
+                for t_var, q_var in zip(target.trainable_variables, q.trainable_variables):
+                    t_var.assign(q_var)
+            return loss, td
+
+        return tf.function(update, jit_compile=self.cfg.xla, reduce_retracing=True)
 
     def save(self, out_dir: str) -> None:
         os.makedirs(out_dir, exist_ok=True)
         self.q.save(os.path.join(out_dir, "model.keras"), overwrite=True)
         save_state(out_dir, TrainState(step=self.step_count, epsilon=self.epsilon, best_score=self.best_score))
 
+    def snapshot(self) -> Tuple[Snapshot, TrainState]:
+        """In-memory copy of weights, target and optimizer slots, for CheckpointWriter."""
+        groups = {"q": self.q.weights, "target": self.target.weights, "optimizer": self.q.optimizer.variables}
+        if self._snapshot_fn is None:
+            # one graph call reads every variable (eager reads cost ~30 us each)
+            variables = [v for vs in groups.values() for v in vs]
+            self._snapshot_fn = tf.function(lambda: [tf.identity(v) for v in variables])
+        values = iter(self._snapshot_fn())
+        snap = {name: [next(values).numpy() for _ in vs] for name, vs in groups.items()}
+        return snap, TrainState(step=self.step_count, epsilon=self.epsilon, best_score=self.best_score)
+
+    def save_async(self, out_dir: str, writer: CheckpointWriter) -> None:
+        """Weights-only save: snapshot now, weights.npz written by the writer thread."""
+        writer.submit(out_dir, *self.snapshot())
+
+    def _restore(self, snap: Snapshot) -> None:
+        self.q.set_weights(snap["q"])
+        self.target.set_weights(snap["target"])
+        opt_vars = self.q.optimizer.variables
+        if len(opt_vars) == len(snap.get("optimizer", [])):
+            for var, value in zip(opt_vars, snap["optimizer"]):
+                var.assign(value)
+        self._policy_stale = True
+
     def load(self, in_dir: str) -> None:
         model_path = os.path.join(in_dir, "model.keras")
-        if os.path.exists(model_path):
+        weights_path = os.path.join(in_dir, WEIGHTS_FILE)
+        # the most recent of the two formats wins (weights.npz from save_async, model.keras from save)
+        if os.path.exists(weights_path) and (
+            not os.path.exists(model_path) or os.path.getmtime(weights_path) >= os.path.getmtime(model_path)
+        ):
+            snap, st = load_weights(in_dir)  # embedded TrainState matches these weights, state.json may not
+            self._restore(snap)
+        elif os.path.exists(model_path):
             self.q = tf.keras.models.load_model(model_path)
             # rebuild target with same arch
             self.target = tf.keras.models.clone_model(self.q)
             self.target.set_weights(self.q.get_weights())
             # compile target not necessary
-        st = load_state(in_dir)
+            self._update_fn = self._build_update_fn()
+            self._snapshot_fn = None
+            self.policy = self._make_policy()
+            self._policy_stale = False
+            st = load_state(in_dir)
+        else:
+            st = None
         if st:
             self.step_count = st.step
             self.epsilon = st.epsilon
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import contextlib
+import queue
+import threading
+from typing import List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+from .agent import DQNAgent
+from .buffer import Transition
+
+
+class AsyncLearner:
+    """Runs DQNAgent.train_step on a background thread at a target replay ratio.
+
+    A sampler thread keeps a queue of `prefetch` minibatches ready, already
+    converted to tensors, so the learner thread only runs the compiled update
+    (TF releases the GIL inside ops). The game loop calls remember() after each
+    env step and never blocks on training. Buffer writes, sampling and priority
+    updates share one lock; the update itself runs outside it.
+    """
+
+    def __init__(self, agent: DQNAgent, replay_ratio: float, prefetch: int = 4, max_lag: int = 64):
+        if replay_ratio <= 0:
+            raise ValueError(f"replay_ratio must be > 0, got {replay_ratio}")
+        self.agent = agent
+        self.replay_ratio = float(replay_ratio)  # updates per env step
+        self.env_steps = 0
+        self.updates = 0
+        self._step0 = agent.step_count  # resumed agents keep their step count
+        # remember() waits once the learner is more than max_lag updates behind,
+        # so the replay ratio holds even when updates are slower than the game
+        self.max_lag = int(max_lag)
+
+        self._buffer_lock = threading.Lock()
+        agent.buffer_lock = self._buffer_lock  # train_step writes PER priorities under it
+        self._update_lock = threading.Lock()
+        self._wake = threading.Condition()
+        self._batches: "queue.Queue[tuple]" = queue.Queue(maxsize=max(1, prefetch))
+        self._losses: List[float] = []
+        self._error: Optional[BaseException] = None
+        self._stop = threading.Event()
+
+        self._threads = [
+            threading.Thread(target=self._guard, args=(self._sample_loop,), name="replay-sampler", daemon=True),
+            threading.Thread(target=self._guard, args=(self._learn_loop,), name="learner", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    # --- game thread -------------------------------------------------------
+
+    def remember(self, s, a, r, s2, d) -> None:
+        self._raise_if_failed()
+        with self._buffer_lock:
+            self.agent.remember(s, a, r, s2, d)
+        with self._wake:
+            self.env_steps += 1
+            self._wake.notify_all()
+            while self._lag() > self.max_lag and not self._stop.is_set():
+                self._wake.wait(timeout=0.1)
+
+    def drain_losses(self) -> List[float]:
+        self._raise_if_failed()
+        with self._wake:  # the learner appends under the same condition
+            losses, self._losses = self._losses, []
+        return losses
+
+    @contextlib.contextmanager
+    def paused(self):
+        """Hold off updates (e.g. while saving the model)."""
+        with self._update_lock:
+            yield
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+        for t in self._threads:
+            t.join()
+        self.agent.buffer_lock = contextlib.nullcontext()
+        self._raise_if_failed()
+
+    # --- background threads ------------------------------------------------
+
+    def _guard(self, loop) -> None:
+        try:
+            loop()
+        except BaseException as e:  # surfaced on the game thread
+            self._error = e
+            self._stop.set()
+            with self._wake:
+                self._wake.notify_all()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Async learner thread failed") from self._error
+
+    def _lag(self) -> float:
+        return self.replay_ratio * self.env_steps - (self.agent.step_count - self._step0)
+
+    def _ready(self) -> bool:
+        return len(self.agent.buffer) >= max(1, self.agent.cfg.train_start)
+
+    def _sample_loop(self) -> None:
+        while not self._stop.is_set():
+            if not self._ready():
+                with self._wake:
+                    self._wake.wait(timeout=0.05)
+                continue
+            with self._buffer_lock:
+                batch, idx, weights = self.agent.sample_batch()
+            if weights is None:
+                weights = np.ones(len(batch.a), dtype=np.float32)
+            tensors = Transition(*(tf.convert_to_tensor(x) for x in (batch.s, batch.a, batch.r, batch.s2, batch.d)))
+            item = (tensors, idx, tf.convert_to_tensor(weights))
+            while not self._stop.is_set():
+                try:
+                    self._batches.put(item, timeout=0.05)
+                    break
+                except queue.Full:
+                    continue
+
+    def _learn_loop(self) -> None:
+        agent = self.agent
+        while not self._stop.is_set():
+            with self._wake:
+                # step_count counts train_step calls, as in the synchronous loop
+                while self._lag() <= 0 and not self._stop.is_set():
+                    self._wake.wait(timeout=0.1)
+            if self._stop.is_set():
+                return
+            batch = None
+            if self._ready():
+                try:
+                    batch = self._batches.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+            with self._update_lock:
+                loss = agent.train_step(batch)
+            with self._wake:
+                if loss is not None:
+                    self._losses.append(loss)
+                    self.updates += 1
+                self._wake.notify_all()
@@ -1,9 +1,7 @@
 from __future__ import annotations
 
-import random
-from collections import deque
 from dataclasses import dataclass
-from typing import Deque, List, Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 
@@ -18,20 +16,279 @@ class Transition:
 
 
 class ReplayBuffer:
+    """Preallocated ring buffer: one contiguous array per field, O(1) write cursor."""
+
     def __init__(self, capacity: int):
-        self.buf: Deque[Transition] = deque(maxlen=int(capacity))
+        self.capacity = int(capacity)
+        self.pos = 0
+        self.size = 0
+        # allocated on first add() (observation shape unknown until then)
+        self.s: Optional[np.ndarray] = None
+        self.s2: Optional[np.ndarray] = None
+        self.a = np.zeros(self.capacity, dtype=np.int64)
+        self.r = np.zeros(self.capacity, dtype=np.float32)
+        self.d = np.zeros(self.capacity, dtype=np.float32)
 
     def __len__(self) -> int:
-        return len(self.buf)
+        return self.size
+
+    def _allocate(self, s: np.ndarray) -> None:
+        obs = np.asarray(s)
+        dtype = obs.dtype if obs.dtype == np.uint8 else np.float32
+        self.s = np.zeros((self.capacity,) + obs.shape, dtype=dtype)
+        self.s2 = np.zeros((self.capacity,) + obs.shape, dtype=dtype)
 
     def add(self, s: np.ndarray, a: int, r: float, s2: np.ndarray, d: bool) -> None:
-        self.buf.append(Transition(s, int(a), float(r), s2, bool(d)))
+        if self.s is None:
+            self._allocate(s)
+        i = self.pos
+        self.s[i] = s
+        self.a[i] = a
+        self.r[i] = r
+        self.s2[i] = s2
+        self.d[i] = d
+        self.pos = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_batch(self, s: np.ndarray, a: np.ndarray, r: np.ndarray, s2: np.ndarray, d: np.ndarray) -> np.ndarray:
+        """Vectorised add of n transitions (oldest first); returns the slots written."""
+        n = len(a)
+        if n > self.capacity:  # only the newest `capacity` transitions survive anyway
+            self.pos = (self.pos + n - self.capacity) % self.capacity
+            s, a, r, s2, d = s[-self.capacity:], a[-self.capacity:], r[-self.capacity:], s2[-self.capacity:], d[-self.capacity:]
+            n = self.capacity
+        if self.s is None:
+            self._allocate(s[0])
+        idx = (self.pos + np.arange(n)) % self.capacity
+        self.s[idx] = s
+        self.a[idx] = a
+        self.r[idx] = r
+        self.s2[idx] = s2
+        self.d[idx] = d
+        self.pos = int((self.pos + n) % self.capacity)
+        self.size = min(self.size + n, self.capacity)
+        return idx
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        return np.random.randint(0, self.size, size=min(batch_size, self.size))
+
+    def gather(self, idx: np.ndarray) -> Transition:
+        return Transition(self.s[idx], self.a[idx], self.r[idx], self.s2[idx], self.d[idx])
 
     def sample(self, batch_size: int) -> Transition:
-        batch = random.sample(self.buf, k=min(batch_size, len(self.buf)))
-        s = np.stack([t.s for t in batch], axis=0)
-        a = np.array([t.a for t in batch], dtype=np.int64)
-        r = np.array([t.r for t in batch], dtype=np.float32)
-        s2 = np.stack([t.s2 for t in batch], axis=0)
-        d = np.array([t.d for t in batch], dtype=np.float32)
-        return Transition(s, a, r, s2, d)
+        return self.gather(self.sample_indices(batch_size))
+
+
+class FrameReplayBuffer(ReplayBuffer):
+    """Replay for stacked uint8 frames (k, H, W): each frame is stored once.
+
+    A transition keeps the absolute index of the newest frame of s and of s2;
+    both stacks are rebuilt from the frame ring when sampled (frames n-k+1..n).
+    When s is not the previous s2 (episode start), its k frames are written
+    first, so a stack never straddles two episodes. Transitions whose oldest
+    frame has been overwritten are invalidated and never sampled.
+    """
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.frames: Optional[np.ndarray] = None
+        self.k = 0
+        self.n1 = np.zeros(self.capacity, dtype=np.int64)
+        self.n2 = np.zeros(self.capacity, dtype=np.int64)
+        self.valid = np.zeros(self.capacity, dtype=bool)
+        self.frame_count = 0  # frames written so far = absolute index of the next one
+        self.added = 0  # transitions written so far
+        self._checked = 0  # first transition whose frames may still be overwritten
+        self._last: Optional[int] = None  # n2 of the previous transition, if its episode goes on
+
+    def _allocate(self, s: np.ndarray) -> None:
+        obs = np.asarray(s)
+        if obs.dtype != np.uint8 or obs.ndim != 3:
+            raise ValueError(f"FrameReplayBuffer needs uint8 (k, H, W) stacks, got {obs.dtype} {obs.shape}")
+        self.k = obs.shape[0]
+        # one frame per transition, plus k per episode start: room for episodes of >= 4k steps
+        self.n_frames = self.capacity + self.capacity // 4 + 2 * self.k
+        self.frames = np.zeros((self.n_frames,) + obs.shape[1:], dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self.frames is None else self.frames.nbytes
+
+    def _stack(self, n: np.ndarray) -> np.ndarray:
+        return self.frames[(np.asarray(n)[..., None] + np.arange(1 - self.k, 1)) % self.n_frames]
+
+    def _write_frame(self, frame: np.ndarray) -> int:
+        n = self.frame_count
+        self.frames[n % self.n_frames] = frame
+        self.frame_count = n + 1
+        # oldest transitions first: stop at the first one whose frames are all still there
+        gone = self.frame_count - self.n_frames
+        t = max(self._checked, self.added - self.capacity)
+        while t < self.added and self.n1[t % self.capacity] - self.k + 1 < gone:
+            self._invalidate(t % self.capacity)
+            t += 1
+        self._checked = t
+        return n
+
+    def _invalidate(self, slot: int) -> None:
+        self.valid[slot] = False
+
+    def add(self, s: np.ndarray, a: int, r: float, s2: np.ndarray, d: bool) -> None:
+        if self.frames is None:
+            self._allocate(s)
+        last = self._last
+        if last is not None and np.array_equal(s, self._stack(last)):
+            n1 = last
+        else:
+            for frame in s:
+                n1 = self._write_frame(frame)
+        n2 = self._write_frame(s2[-1])
+        i = self.pos
+        self.n1[i] = n1
+        self.n2[i] = n2
+        self.valid[i] = True
+        self.a[i] = a
+        self.r[i] = r
+        self.d[i] = d
+        self._last = None if d else n2
+        self.pos = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.added += 1
+
+    def add_batch(self, s: np.ndarray, a: np.ndarray, r: np.ndarray, s2: np.ndarray, d: np.ndarray) -> np.ndarray:
+        idx = np.empty(len(a), dtype=np.int64)
+        for j in range(len(a)):
+            idx[j] = self.pos
+            self.add(s[j], a[j], r[j], s2[j], d[j])
+        return idx
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        idx = super().sample_indices(batch_size)
+        bad = ~self.valid[idx]
+        while bad.any():  # the newest transition is always valid
+            idx[bad] = super().sample_indices(int(bad.sum()))
+            bad = ~self.valid[idx]
+        return idx
+
+    def gather(self, idx: np.ndarray) -> Transition:
+        return Transition(self._stack(self.n1[idx]), self.a[idx], self.r[idx], self._stack(self.n2[idx]), self.d[idx])
+
+
+class SumTree:
+    """Array-backed binary sum-tree: node i has children 2i and 2i+1, root is 1."""
+
+    def __init__(self, capacity: int):
+        n = 2
+        while n < capacity:
+            n *= 2
+        self.leaf0 = n
+        self.tree = np.zeros(2 * n, dtype=np.float64)
+
+    def total(self) -> float:
+        return float(self.tree[1])
+
+    def set(self, i: int, priority: float) -> None:
+        tree = self.tree
+        pos = i + self.leaf0
+        tree[pos] = priority
+        pos //= 2
+        while pos >= 1:
+            tree[pos] = tree[2 * pos] + tree[2 * pos + 1]
+            pos //= 2
+
+    def update(self, idx: np.ndarray, priorities: np.ndarray) -> None:
+        # batched: write the leaves, then refresh each touched parent once per level
+        tree = self.tree
+        pos = np.asarray(idx, dtype=np.int64) + self.leaf0
+        tree[pos] = priorities
+        pos = np.unique(pos // 2)
+        while True:
+            tree[pos] = tree[2 * pos] + tree[2 * pos + 1]
+            if pos[0] == 1:
+                break
+            pos = np.unique(pos // 2)
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        # batched descent: every query sits at the same depth at each iteration
+        tree = self.tree
+        v = np.array(values, dtype=np.float64)
+        pos = np.ones(len(v), dtype=np.int64)
+        while pos[0] < self.leaf0:
+            left = 2 * pos
+            left_sum = tree[left]
+            go_right = v >= left_sum
+            v = np.where(go_right, v - left_sum, v)
+            pos = np.where(go_right, left + 1, left)
+        return pos - self.leaf0
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """Proportional prioritized replay (Schaul et al. 2015) on top of the ring buffer."""
+
+    def __init__(self, capacity: int, alpha: float = 0.6, eps: float = 1e-5):
+        super().__init__(capacity)
+        self.alpha = float(alpha)
+        self.eps = float(eps)
+        self.tree = SumTree(self.capacity)
+        self.max_priority = 1.0
+
+    def add(self, s: np.ndarray, a: int, r: float, s2: np.ndarray, d: bool) -> None:
+        i = self.pos
+        super().add(s, a, r, s2, d)
+        # new transitions are replayed at least once
+        self.tree.set(i, self.max_priority)
+
+    def add_batch(self, s: np.ndarray, a: np.ndarray, r: np.ndarray, s2: np.ndarray, d: np.ndarray) -> np.ndarray:
+        idx = super().add_batch(s, a, r, s2, d)
+        self.tree.update(idx, np.full(len(idx), self.max_priority))
+        return idx
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        n = min(batch_size, self.size)
+        # stratified: one draw per equal slice of the total priority mass
+        segment = self.tree.total() / n
+        values = (np.arange(n) + np.random.rand(n)) * segment
+        idx = self.tree.find(values)
+        return np.minimum(idx, self.size - 1)
+
+    def sample_prioritized(self, batch_size: int, beta: float) -> Tuple[Transition, np.ndarray, np.ndarray]:
+        idx = self.sample_indices(batch_size)
+        probs = self.tree.tree[idx + self.tree.leaf0] / self.tree.total()
+        weights = (self.size * probs) ** (-beta)
+        weights = (weights / weights.max()).astype(np.float32)
+        return self.gather(idx), idx, weights
+
+    def update_priorities(self, idx: np.ndarray, td_errors: np.ndarray) -> None:
+        priorities = (np.abs(td_errors) + self.eps) ** self.alpha
+        self.tree.update(idx, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+
+class PrioritizedFrameReplayBuffer(PrioritizedReplayBuffer, FrameReplayBuffer):
+    """Prioritized replay over deduplicated frame stacks; invalidated transitions get priority 0."""
+
+    def _invalidate(self, slot: int) -> None:
+        super()._invalidate(slot)
+        self.tree.set(slot, 0.0)
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        # the clamp in PrioritizedReplayBuffer can land on a zero-priority slot (inf IS weight)
+        idx = super().sample_indices(batch_size)
+        bad = ~self.valid[idx]
+        for _ in range(8):
+            if not bad.any():
+                return idx
+            redraw = self.tree.find(np.random.rand(int(bad.sum())) * self.tree.total())
+            idx[bad] = np.minimum(redraw, self.size - 1)
+            bad = ~self.valid[idx]
+        idx[bad] = (self.pos - 1) % self.capacity  # the newest transition is always valid
+        return idx
+
+    def update_priorities(self, idx: np.ndarray, td_errors: np.ndarray) -> None:
+        # a prefetched batch may hold slots invalidated since it was sampled: keep them at 0
+        priorities = (np.abs(td_errors) + self.eps) ** self.alpha
+        valid = self.valid[idx]
+        priorities[~valid] = 0.0
+        self.tree.update(idx, priorities)
+        if valid.any():
+            self.max_priority = max(self.max_priority, float(priorities[valid].max()))
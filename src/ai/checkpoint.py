@@ -1,7 +1,12 @@
 import json
 import os
+import threading
 from dataclasses import asdict, dataclass
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+WEIGHTS_FILE = "weights.npz"
 
 
 @dataclass
@@ -11,10 +16,29 @@ class TrainState:
     best_score: float
 
 
+def _replace_atomic(path: str, write) -> None:
+    """write(tmp_path) then rename over path: readers never see a half-written file."""
+    tmp = f"{path}.tmp{os.getpid()}"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
 def save_state(path_dir: str, state: TrainState) -> None:
     os.makedirs(path_dir, exist_ok=True)
-    with open(os.path.join(path_dir, "state.json"), "w", encoding="utf-8") as f:
-        json.dump(asdict(state), f, ensure_ascii=False, indent=2)
+
+    def write(tmp: str) -> None:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(state), f, ensure_ascii=False, indent=2)
+
+    _replace_atomic(os.path.join(path_dir, "state.json"), write)
+
+
+def _state_from_dict(d: dict) -> TrainState:
+    return TrainState(step=int(d.get("step", 0)), epsilon=float(d.get("epsilon", 1.0)), best_score=float(d.get("best_score", 0.0)))
 
 
 def load_state(path_dir: str) -> Optional[TrainState]:
@@ -23,4 +47,101 @@ def load_state(path_dir: str) -> Optional[TrainState]:
         return None
     with open(path, "r", encoding="utf-8") as f:
         d = json.load(f)
-    return TrainState(step=int(d.get("step", 0)), epsilon=float(d.get("epsilon", 1.0)), best_score=float(d.get("best_score", 0.0)))
+    return _state_from_dict(d)
+
+
+# Weights-only checkpoints: {"q": [...], "target": [...], "optimizer": [...]} lists of arrays
+Snapshot = Dict[str, List[np.ndarray]]
+
+
+def save_weights(path_dir: str, snapshot: Snapshot, state: TrainState) -> None:
+    """weights.npz (TrainState embedded) then state.json, each replaced atomically."""
+    os.makedirs(path_dir, exist_ok=True)
+    arrays = {f"{group}/{i}": a for group, values in snapshot.items() for i, a in enumerate(values)}
+    arrays["state"] = np.array(json.dumps(asdict(state)))
+
+    def write(tmp: str) -> None:
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+
+    _replace_atomic(os.path.join(path_dir, WEIGHTS_FILE), write)
+    save_state(path_dir, state)
+
+
+def load_weights(path_dir: str) -> Optional[Tuple[Snapshot, TrainState]]:
+    path = os.path.join(path_dir, WEIGHTS_FILE)
+    if not os.path.exists(path):
+        return None
+    snapshot: Snapshot = {}
+    with np.load(path) as data:
+        state = _state_from_dict(json.loads(str(data["state"])))
+        keys = sorted((k for k in data.files if k != "state"), key=lambda k: (k.split("/")[0], int(k.split("/")[1])))
+        for key in keys:
+            snapshot.setdefault(key.split("/")[0], []).append(data[key])
+    return snapshot, state
+
+
+class CheckpointWriter:
+    """Writes weight snapshots from a background thread.
+
+    submit() only queues an in-memory snapshot. Saves to the same directory
+    that arrive before the previous one was written are coalesced: only the
+    newest snapshot is written.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, Tuple[Snapshot, TrainState]] = {}
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self.written = 0
+        self.coalesced = 0
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path_dir: str, snapshot: Snapshot, state: TrainState) -> None:
+        self._raise_if_failed()
+        with self._cond:
+            if path_dir in self._pending:
+                self.coalesced += 1
+            self._pending[path_dir] = (snapshot, state)
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every submitted snapshot is on disk."""
+        with self._cond:
+            while (self._pending or self._busy) and self._error is None:
+                self._cond.wait()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Checkpoint writer failed") from self._error
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                path_dir = next(iter(self._pending))
+                snapshot, state = self._pending.pop(path_dir)
+                self._busy = True
+            try:
+                save_weights(path_dir, snapshot, state)
+                self.written += 1
+            except BaseException as e:
+                self._error = e
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+from typing import Optional, Tuple
+
+from .checkpoint import WEIGHTS_FILE, load_state, load_weights
+from .numpy_policy import POLICY_FILE, NumpyPolicy
+
+
+def _newest(model_dir: str, names) -> Optional[str]:
+    paths = [os.path.join(model_dir, n) for n in names if os.path.exists(os.path.join(model_dir, n))]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def policy_from_checkpoint(model_dir: str) -> Tuple[NumpyPolicy, str]:
+    """NumPy policy from a best/ or latest/ dir; TensorFlow is only imported for model.keras."""
+    source = _newest(model_dir, (WEIGHTS_FILE, "model.keras"))
+    if source is None:
+        raise FileNotFoundError(f"No {WEIGHTS_FILE} or model.keras in {model_dir}")
+    if source.endswith(".npz"):
+        snapshot, _ = load_weights(model_dir)
+        return NumpyPolicy.from_dense_weights(snapshot["q"]), source
+
+    import tensorflow as tf
+
+    return NumpyPolicy.from_keras(tf.keras.models.load_model(source, compile=False)), source
+
+
+def export_policy(model_dir: str, out_path: Optional[str] = None) -> str:
+    """Write <model_dir>/policy.npz (or out_path): weights + JSON header, no TensorFlow needed to load."""
+    policy, source = policy_from_checkpoint(model_dir)
+    state = load_state(model_dir)
+    meta = {"source": os.path.abspath(source)}
+    if state is not None:
+        meta.update(step=state.step, best_score=state.best_score)
+    out_path = out_path or os.path.join(model_dir, POLICY_FILE)
+    policy.save(out_path, meta)
+    return out_path
+
+
+def policy_source(path: str) -> str:
+    """File load_policy(path) reads: policy.npz, weights.npz or model.keras."""
+    if not os.path.isdir(path):
+        return path
+    exported = os.path.join(path, POLICY_FILE)
+    checkpoint = _newest(path, (WEIGHTS_FILE, "model.keras"))
+    # an export older than the checkpoint it came from is stale
+    if os.path.exists(exported) and (checkpoint is None or os.path.getmtime(exported) >= os.path.getmtime(checkpoint)):
+        return exported
+    if checkpoint is None:
+        raise FileNotFoundError(f"No {POLICY_FILE}, {WEIGHTS_FILE} or model.keras in {path}")
+    return checkpoint
+
+
+def load_policy(path: str) -> NumpyPolicy:
+    """Exported policy.npz (file or dir containing one), else the dir's checkpoint."""
+    source = policy_source(path)
+    if source.endswith(POLICY_FILE) or not os.path.isdir(path):
+        return NumpyPolicy.load(source)[0]
+    return policy_from_checkpoint(path)[0]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Tuple
+
 import tensorflow as tf
 
 
@@ -11,3 +13,18 @@ def build_q_network(input_dim: int, n_actions: int, lr: float) -> tf.keras.Model
     model = tf.keras.Model(inputs, outputs)
     model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=lr), loss="mse")
     return model
+
+
+def build_conv_q_network(obs_shape: Tuple[int, int, int], n_actions: int, lr: float) -> tf.keras.Model:
+    """Small conv Q-network for stacks of k uint8 frames (k, H, W), e.g. (4, 84, 84)."""
+    inputs = tf.keras.Input(shape=obs_shape, dtype="uint8")
+    x = tf.keras.layers.Permute((2, 3, 1))(inputs)  # frames as channels: (H, W, k)
+    x = tf.keras.layers.Rescaling(1.0 / 255.0)(x)
+    x = tf.keras.layers.Conv2D(16, 8, strides=4, activation="relu")(x)
+    x = tf.keras.layers.Conv2D(32, 4, strides=2, activation="relu")(x)
+    x = tf.keras.layers.Flatten()(x)
+    x = tf.keras.layers.Dense(256, activation="relu")(x)
+    outputs = tf.keras.layers.Dense(n_actions, activation=None)(x)
+    model = tf.keras.Model(inputs, outputs)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=lr), loss="mse")
+    return model
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+POLICY_FILE = "policy.npz"
+POLICY_FORMAT = 1
+
+
+Layer = Tuple[np.ndarray, np.ndarray, bool]  # (kernel, bias, relu)
+
+
+class NumpyPolicy:
+    """NumPy mirror of a Dense Q-network: one matmul per layer, no TF dispatch.
+
+    Scratch buffers are preallocated for the single-observation path used by
+    act(); weights are copied in place by sync_from() so the buffers stay valid.
+    """
+
+    def __init__(self, layers: Sequence[Layer]):
+        self.layers: List[Layer] = [
+            (np.array(w, dtype=np.float32), np.array(b, dtype=np.float32), bool(relu)) for w, b, relu in layers
+        ]
+        self._scratch = [np.empty(w.shape[1], dtype=np.float32) for w, _, _ in self.layers]
+
+    @property
+    def obs_dim(self) -> int:
+        return int(self.layers[0][0].shape[0])
+
+    @property
+    def n_actions(self) -> int:
+        return int(self.layers[-1][0].shape[1])
+
+    @staticmethod
+    def _dense_layers(model) -> list:
+        return [layer for layer in model.layers if getattr(layer, "kernel", None) is not None]
+
+    @classmethod
+    def from_keras(cls, model) -> "NumpyPolicy":
+        layers = []
+        for layer in cls._dense_layers(model):
+            activation = layer.get_config().get("activation", "linear")
+            if activation not in ("relu", "linear"):
+                raise ValueError(f"Unsupported activation for NumpyPolicy: {activation}")
+            w, b = layer.get_weights()
+            layers.append((w, b, activation == "relu"))
+        return cls(layers)
+
+    @classmethod
+    def from_dense_weights(cls, weights: Sequence[np.ndarray]) -> "NumpyPolicy":
+        """[W0, b0, W1, b1, ...] of build_q_network: ReLU on every layer but the last."""
+        pairs = list(zip(weights[0::2], weights[1::2]))
+        return cls([(w, b, i < len(pairs) - 1) for i, (w, b) in enumerate(pairs)])
+
+    def save(self, path: str, meta: Optional[dict] = None) -> None:
+        """Self-describing export: kernels, biases and a JSON header, loadable without TensorFlow."""
+        header = dict(meta or {})
+        header.update(format=POLICY_FORMAT, obs_dim=self.obs_dim, n_actions=self.n_actions,
+                      activations=["relu" if relu else "linear" for _, _, relu in self.layers])
+        arrays = {"meta": np.array(json.dumps(header))}
+        for i, (w, b, _) in enumerate(self.layers):
+            arrays[f"kernel_{i}"] = w
+            arrays[f"bias_{i}"] = b
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["NumpyPolicy", dict]:
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format") != POLICY_FORMAT:
+                raise ValueError(f"Unsupported policy format in {path}: {meta.get('format')}")
+            layers = [(data[f"kernel_{i}"], data[f"bias_{i}"], act == "relu") for i, act in enumerate(meta["activations"])]
+        return cls(layers), meta
+
+    def sync_from(self, model) -> None:
+        for (w, b, _), layer in zip(self.layers, self._dense_layers(model)):
+            np.copyto(w, layer.kernel.numpy())
+            np.copyto(b, layer.bias.numpy())
+
+    def q_values(self, obs: np.ndarray) -> np.ndarray:
+        """Q-values of a single observation; the returned array is reused on the next call."""
+        x = obs
+        for (w, b, relu), out in zip(self.layers, self._scratch):
+            np.dot(x, w, out=out)
+            out += b
+            if relu:
+                np.maximum(out, 0.0, out=out)
+            x = out
+        return x
+
+    def act(self, obs: np.ndarray) -> int:
+        return int(np.argmax(self.q_values(np.asarray(obs, dtype=np.float32))))
+
+    def q_values_batch(self, obs: np.ndarray) -> np.ndarray:
+        """Q-values of a [K, obs_dim] batch in one matmul per layer."""
+        x = np.asarray(obs, dtype=np.float32)
+        for w, b, relu in self.layers:
+            x = x @ w
+            x += b
+            if relu:
+                np.maximum(x, 0.0, out=x)
+        return x
+
+    def act_batch(self, obs: np.ndarray) -> np.ndarray:
+        return np.argmax(self.q_values_batch(obs), axis=1)
+
+    @property
+    def architecture(self) -> tuple:
+        """Layer shapes and activations; policies with the same one can be stacked."""
+        return tuple((w.shape, relu) for w, _, relu in self.layers)
+
+
+class StackedPolicy:
+    """P policies of one architecture evaluated together: one batched matmul per layer.
+
+    Kernels are stacked to [P, in, out], so a [P, E, obs_dim] batch (E observations
+    per policy) goes through every policy at once.
+    """
+
+    def __init__(self, policies: Sequence[NumpyPolicy]):
+        arch = policies[0].architecture
+        if any(p.architecture != arch for p in policies):
+            raise ValueError("StackedPolicy needs policies with the same architecture")
+        self.layers: List[Layer] = [
+            (np.stack([p.layers[i][0] for p in policies]), np.stack([p.layers[i][1] for p in policies])[:, None, :], relu)
+            for i, (_, relu) in enumerate(arch)
+        ]
+
+    def q_values_batch(self, obs: np.ndarray) -> np.ndarray:
+        x = np.asarray(obs, dtype=np.float32)
+        for w, b, relu in self.layers:
+            x = np.matmul(x, w)
+            x += b
+            if relu:
+                np.maximum(x, 0.0, out=x)
+        return x
+
+    def act_batch(self, obs: np.ndarray) -> np.ndarray:
+        """[P, E, obs_dim] -> [P, E] greedy actions."""
+        return np.argmax(self.q_values_batch(obs), axis=2)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .numpy_policy import NumpyPolicy
+
+
+# (shared memory name, [(kernel shape, bias shape, relu)]): picklable, sent to actor processes
+WeightsSpec = Tuple[str, List[Tuple[Tuple[int, ...], Tuple[int, ...], bool]]]
+
+
+class SharedWeights:
+    """NumpyPolicy weights in one shared-memory block, written by the learner, read by actors.
+
+    Layout: an int64 version counter followed by every kernel and bias as
+    float32. The version is odd while publish() is writing (seqlock), so a
+    reader that sees the same even version before and after its copy got a
+    consistent snapshot; otherwise it keeps its current weights and retries
+    on the next pull.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, layout, owner: bool):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self.version = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+        self.arrays: List[Tuple[np.ndarray, np.ndarray]] = []
+        offset = 8
+        for w_shape, b_shape, _ in layout:
+            w = np.ndarray(w_shape, dtype=np.float32, buffer=shm.buf, offset=offset)
+            offset += w.nbytes
+            b = np.ndarray(b_shape, dtype=np.float32, buffer=shm.buf, offset=offset)
+            offset += b.nbytes
+            self.arrays.append((w, b))
+        self._seen = -1
+
+    @staticmethod
+    def _nbytes(layout) -> int:
+        return 8 + sum(4 * (int(np.prod(w)) + int(np.prod(b))) for w, b, _ in layout)
+
+    @classmethod
+    def create(cls, policy: NumpyPolicy) -> "SharedWeights":
+        layout = [(w.shape, b.shape, relu) for w, b, relu in policy.layers]
+        shm = shared_memory.SharedMemory(create=True, size=cls._nbytes(layout))
+        shared = cls(shm, layout, owner=True)
+        shared.version[0] = 0
+        shared.publish(policy)
+        return shared
+
+    @classmethod
+    def attach(cls, spec: WeightsSpec) -> "SharedWeights":
+        name, layout = spec
+        return cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+
+    def spec(self) -> WeightsSpec:
+        return self.shm.name, list(self.layout)
+
+    def publish(self, policy: NumpyPolicy) -> None:
+        self.version[0] += 1  # odd: write in progress
+        for (w, b), (src_w, src_b, _) in zip(self.arrays, policy.layers):
+            np.copyto(w, src_w)
+            np.copyto(b, src_b)
+        self.version[0] += 1
+
+    def policy(self) -> NumpyPolicy:
+        """Fresh NumpyPolicy holding a private copy of the current weights."""
+        policy = NumpyPolicy([(w, b, relu) for (w, b), (_, _, relu) in zip(self.arrays, self.layout)])
+        self._seen = -1
+        self.pull_into(policy)
+        return policy
+
+    def pull_into(self, policy: NumpyPolicy) -> bool:
+        """Copy newer weights into policy; False if nothing new (or a write was in progress)."""
+        v = int(self.version[0])
+        if v == self._seen or v % 2:
+            return False
+        for (w, b), (dst_w, dst_b, _) in zip(self.arrays, policy.layers):
+            np.copyto(dst_w, w)
+            np.copyto(dst_b, b)
+        if int(self.version[0]) != v:
+            return False
+        self._seen = v
+        return True
+
+    def close(self, unlink: Optional[bool] = None) -> None:
+        # drop the views before closing the mapping
+        self.version = None
+        self.arrays = []
+        self.shm.close()
+        if self.owner if unlink is None else unlink:
+            self.shm.unlink()
@@ -0,0 +1,716 @@
+"""Micro-benchmarks: python -m src.bench <name> [options]"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+
+def bench_replay(args) -> None:
+    from .ai.buffer import ReplayBuffer
+
+    buf = ReplayBuffer(args.capacity)
+    obs = np.random.rand(args.capacity, 9).astype(np.float32)
+    t0 = time.perf_counter()
+    for i in range(args.capacity):
+        buf.add(obs[i], i % 3, 1.0, obs[i], False)
+    add_rate = args.capacity / (time.perf_counter() - t0)
+
+    n = args.iters
+    t0 = time.perf_counter()
+    for _ in range(n):
+        buf.sample(args.batch_size)
+    dt = time.perf_counter() - t0
+    print(f"capacity={args.capacity} batch={args.batch_size}")
+    print(f"  add:    {add_rate:,.0f} transitions/s")
+    print(f"  sample: {n / dt:,.0f} batches/s ({n * args.batch_size / dt:,.0f} samples/s)")
+
+
+def _filled_agent(args, **overrides):
+    from .ai.agent import AgentConfig, DQNAgent
+
+    cfg = AgentConfig(
+        obs_dim=9, n_actions=3, gamma=0.99, lr=1e-3, batch_size=args.batch_size,
+        buffer_size=10000, train_start=0, target_update=1000,
+        epsilon_start=0.0, epsilon_end=0.0, epsilon_decay_steps=1, **overrides,
+    )
+    agent = DQNAgent(cfg)
+    obs = np.random.rand(10000, 9).astype(np.float32)
+    for i in range(len(obs) - 1):
+        agent.remember(obs[i], i % 3, float(np.random.randn()), obs[i + 1], i % 200 == 0)
+    return agent
+
+
+def bench_update(args) -> None:
+    agent = _filled_agent(args, double_dqn=bool(args.double_dqn), xla=bool(args.xla))
+    for _ in range(20):  # warmup / tracing
+        agent.train_step()
+    t0 = time.perf_counter()
+    for _ in range(args.iters):
+        agent.train_step()
+    dt = time.perf_counter() - t0
+    print(f"batch={args.batch_size} double={args.double_dqn} xla={args.xla}: {args.iters / dt:,.0f} updates/s")
+
+
+def bench_act(args) -> None:
+    agent = _filled_agent(args)
+    obs = np.random.rand(args.iters, 9).astype(np.float32)
+    agent.act(obs[0], training=False)
+    t0 = time.perf_counter()
+    for i in range(args.iters):
+        agent.act(obs[i], training=False)
+        if args.train_freq and i % args.train_freq == 0:
+            agent.train_step()
+    dt = time.perf_counter() - t0
+    print(f"train_freq={args.train_freq}: {args.iters / dt:,.0f} steps/s")
+
+
+def bench_ckpt(args) -> None:
+    import tempfile
+
+    from .ai.checkpoint import CheckpointWriter
+
+    agent = _filled_agent(args)
+    for _ in range(5):
+        agent.train_step()
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        for _ in range(args.iters):
+            agent.save(tmp + "/keras")
+        sync_ms = (time.perf_counter() - t0) / args.iters * 1e3
+
+        writer = CheckpointWriter()
+        burst_t0 = time.perf_counter()
+        for _ in range(args.iters):  # rafale: saves coalescés
+            agent.save_async(tmp + "/npz", writer)
+        burst_ms = (time.perf_counter() - burst_t0) / args.iters * 1e3
+        writer.flush()
+        async_s = 0.0
+        for _ in range(args.iters):  # une save par épisode: l'écriture finit entre deux appels
+            t0 = time.perf_counter()
+            agent.save_async(tmp + "/npz", writer)
+            async_s += time.perf_counter() - t0
+            writer.flush()
+        async_ms = async_s / args.iters * 1e3
+        writer.close()
+
+        restored = _filled_agent(args)
+        restored.load(tmp + "/npz")
+        same = all(np.array_equal(a, b) for a, b in zip(agent.q.get_weights(), restored.q.get_weights()))
+        print(f"save (.keras, sync):   {sync_ms:.2f} ms/call")
+        print(f"save_async (.npz):     {async_ms:.3f} ms/call on the caller, {burst_ms:.3f} ms/call in a burst "
+              f"({writer.written} written, {writer.coalesced} coalesced); reload identical: {same}")
+
+
+_COLDSTART = """
+import os, sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+import numpy as np
+mode, model_dir = sys.argv[1], sys.argv[2]
+if mode == "tf":  # ancien chemin --play: DQNAgent + model.keras
+    from src.ai.agent import AgentConfig, DQNAgent
+    agent = DQNAgent(AgentConfig(9, 3, 0.99, 1e-3, 64, 50000, 1000, 1000, 0.0, 0.0, 1))
+    agent.load(model_dir)
+    act = lambda obs: agent.act(obs, training=False)
+else:
+    from src.ai.export import load_policy
+    act = load_policy(model_dir).act
+from src.cli import build_parser
+from src.main import load_game_assets
+from src.game.renderer import Renderer
+from src.game.world import build_world
+args = build_parser().parse_args(["--play", "--render", "1"])
+world = build_world(args, load_game_assets(args))
+renderer = Renderer(args.width, args.height, args.fps)
+act(np.zeros(9, dtype=np.float32))
+renderer.draw(world)
+print("tensorflow" in sys.modules)
+"""
+
+
+def bench_coldstart(args) -> None:
+    import os
+    import subprocess
+    import sys
+    import tempfile
+
+    from .ai.export import export_policy
+
+    with tempfile.TemporaryDirectory() as tmp:
+        agent = _filled_agent(args)
+        agent.save(tmp)
+        export_policy(tmp)
+        root = os.path.join(os.path.dirname(__file__), "..")
+        for mode in ("tf", "numpy"):
+            times = []
+            for _ in range(args.repeats):
+                t0 = time.perf_counter()
+                out = subprocess.run([sys.executable, "-c", _COLDSTART, mode, tmp], cwd=root,
+                                     capture_output=True, text=True, check=True)
+                times.append(time.perf_counter() - t0)
+            tf_loaded = out.stdout.strip().splitlines()[-1]
+            print(f"{mode:>6}: {min(times):.2f} s to first rendered frame (best of {args.repeats}; "
+                  f"tensorflow imported: {tf_loaded})")
+
+
+_TF_CHECK = """
+import os, runpy, sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.argv = sys.argv[1:]
+status = "ok"
+try:
+    runpy.run_module(sys.argv[0], run_name="__main__", alter_sys=True)
+except SystemExit as e:
+    status = f"exit {e.code}" if e.code else "ok"
+except Exception as e:
+    status = f"{type(e).__name__}: {e}"
+print(f"\\n{'tensorflow' in sys.modules}|{status}")
+"""
+
+# Chemins qui ne doivent jamais importer TensorFlow
+_TF_FREE_COMMANDS = {
+    "play --human 1": ["src.main", "--play", "--human", "1", "--render", "0", "--max_steps", "50"],
+    "bench sim --engine headless": ["src.bench", "sim", "--engine", "headless", "--steps", "2000"],
+    "bench vector": ["src.bench", "vector", "--steps", "50", "--n_envs", "8"],
+}
+
+
+def _tfcheck_recording(path: str) -> None:
+    """Court épisode enregistré (moteur headless) pour faire tourner la boucle de --replay"""
+    from .cli import build_parser as build_cli_parser
+    from .game.recording import WORLD_KEYS, EpisodeRecorder
+    from .game.world import build_world
+
+    world_args = build_cli_parser().parse_args(["--train", "--engine", "headless", "--spawn_tape", "1"])
+    world = build_world(world_args, None)
+    world.spawner.seed_next_episode(0)
+    world.reset()
+    recorder = EpisodeRecorder({k: getattr(world_args, k) for k in WORLD_KEYS})
+    recorder.begin(0)
+    for _ in range(120):
+        done, _ = world.step(0, 1.0 / world_args.fps)
+        recorder.record(0, world, done)
+        if done:
+            break
+    recorder.finish(world).save(path)
+
+
+def bench_tfcheck(args) -> None:
+    import importlib.util
+    import os
+    import subprocess
+    import sys
+    import tempfile
+
+    root = os.path.join(os.path.dirname(__file__), "..")
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        commands = dict(_TF_FREE_COMMANDS)
+        if importlib.util.find_spec("src.env.trex_env") is None or importlib.util.find_spec("src.env.rollout") is None:
+            # sans le module env, --play s'arrête avant la boucle de jeu: on le signale comme échec
+            print("FAIL  play --human 1: src.env.trex_env / src.env.rollout missing, the play loop cannot run")
+            failed = True
+            del commands["play --human 1"]
+        # boucle de jeu rendue (World + Renderer, SDL dummy) qui existe toujours: --replay
+        recording = os.path.join(tmp, "episode.npz")
+        _tfcheck_recording(recording)
+        commands["replay --render 1"] = ["src.main", "--replay", recording, "--render", "1"]
+        for name, cmd in commands.items():
+            if cmd[0] == "src.main":
+                cmd = cmd + ["--models_dir", os.path.join(tmp, "models"), "--logs_dir", os.path.join(tmp, "logs")]
+            out = subprocess.run([sys.executable, "-c", _TF_CHECK] + cmd, cwd=root, capture_output=True, text=True)
+            lines = out.stdout.strip().splitlines()
+            if lines and "|" in lines[-1]:
+                tf_loaded, status = lines[-1].split("|", 1)
+            else:
+                tf_loaded, status = "?", f"no result: {out.stderr.strip()[-200:]}"
+            # une commande qui plante n'a rien vérifié: échec, même sans TensorFlow
+            bad = tf_loaded != "False" or status != "ok"
+            failed |= bad
+            print(f"{'FAIL' if bad else 'ok':>4}  {name}: tensorflow imported={tf_loaded} ({status})")
+    if failed:
+        raise SystemExit(1)
+
+
+def _world_args(args) -> argparse.Namespace:
+    from .cli import build_parser as build_cli_parser
+
+    return build_cli_parser().parse_args([
+        "--train", "--engine", args.engine,
+        "--spawn_mode", args.spawn_mode, "--spawn_distance", str(args.spawn_distance),
+        "--obstacles", args.obstacles, "--spawn_tape", str(getattr(args, "spawn_tape", 0)),
+    ])
+
+
+def _make_world(args):
+    from .game.world import build_world
+
+    from .main import load_game_assets
+
+    world_args = _world_args(args)
+    return build_world(world_args, load_game_assets(world_args))
+
+
+def _trace(world, actions: np.ndarray, dt: float) -> list:
+    """Etat observable complet à chaque step (pour comparer deux moteurs)."""
+    out = []
+    for a in actions:
+        done, info = world.step(int(a), dt)
+        d = world.dino
+        obs = tuple(
+            (ob.kind, ob.x, tuple(ob.rect), getattr(ob, "passed", False), getattr(ob, "collected", False))
+            for ob in world.obstacles
+        )
+        out.append((done, info.score, info.speed, info.distance, info.bonus_collected,
+                    d.x, d.y, d.vy, d.on_ground, tuple(d.rect), obs))
+        if done:
+            world.reset()
+    return out
+
+
+def bench_parity(args) -> None:
+    import random
+
+    engines = {}
+    for engine in ("pygame", "headless"):
+        args.engine = engine
+        engines[engine] = _make_world(args)
+
+    for seed in range(args.seeds):
+        actions = np.random.RandomState(seed).choice(3, size=args.steps, p=[0.8, 0.15, 0.05])
+        traces = {}
+        for engine, world in engines.items():
+            random.seed(seed)
+            world.reset()
+            traces[engine] = _trace(world, actions, args.dt)
+        for i, (a, b) in enumerate(zip(traces["pygame"], traces["headless"])):
+            if a != b:
+                print(f"seed={seed} step={i}: MISMATCH\n  pygame:   {a}\n  headless: {b}")
+                raise SystemExit(1)
+        deaths = sum(1 for row in traces["pygame"] if row[0])
+        print(f"seed={seed}: {args.steps} steps identical ({deaths} deaths)")
+
+
+def bench_sim(args) -> None:
+    world = _make_world(args)
+    actions = np.random.RandomState(0).choice(3, size=args.steps, p=[0.8, 0.15, 0.05])
+    n_obstacles = 0
+    t0 = time.perf_counter()
+    for a in actions:
+        done, _ = world.step(int(a), args.dt)
+        n_obstacles += len(world.obstacles)
+        if done and not args.ignore_done:
+            world.reset()
+    dt = time.perf_counter() - t0
+    print(f"engine={args.engine} spawn_distance={args.spawn_distance}: "
+          f"{args.steps / dt:,.0f} steps/s ({dt / args.steps * 1e6:.1f} us/step, "
+          f"{n_obstacles / args.steps:.1f} obstacles on screen)")
+
+
+def bench_alloc(args) -> None:
+    import tracemalloc
+
+    world = _make_world(args)
+    actions = np.random.RandomState(0).choice(3, size=args.steps, p=[0.8, 0.15, 0.05])
+
+    def run(trace: bool) -> tuple:
+        world.reset()
+        transient = 0
+        t0 = time.perf_counter()
+        for a in actions:
+            if trace:
+                base = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            done, info = world.step(int(a), args.dt)
+            world.dino.state()
+            for ob in world.obstacles:
+                if hasattr(ob, "state"):
+                    ob.state()
+            if trace:
+                transient += tracemalloc.get_traced_memory()[1] - base
+            if done:
+                world.reset()
+        return time.perf_counter() - t0, transient
+
+    elapsed, _ = run(trace=False)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    _, transient = run(trace=True)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    new_blocks = sum(s.count_diff for s in stats if s.count_diff > 0)
+    print(f"engine={args.engine} steps={args.steps}: {elapsed * 1e3:.1f} ms "
+          f"({elapsed / args.steps * 1e6:.2f} us/step)")
+    print(f"  transient allocation peak: {transient / args.steps:.0f} B/step; "
+          f"blocks still allocated after run: {new_blocks}")
+
+
+def bench_vector(args) -> None:
+    from .game.headless import default_geometry
+    from .game.vector_world import VectorWorld
+
+    world = VectorWorld.from_args(_world_args(args), args.n_envs, default_geometry(), seed=0)
+    actions = np.random.RandomState(0).choice(3, size=(args.steps, args.n_envs), p=[0.8, 0.15, 0.05])
+    episodes = 0
+    t0 = time.perf_counter()
+    for a in actions:
+        done, info = world.step(a, args.dt)
+        episodes += int(done.sum())
+    dt = time.perf_counter() - t0
+    print(f"n_envs={args.n_envs}: {args.steps * args.n_envs / dt:,.0f} env-steps/s "
+          f"({args.steps / dt:,.0f} vector steps/s, {episodes} episodes)")
+
+
+def _course(world, actions: np.ndarray, dt: float, other=None) -> list:
+    """Obstacles apparus en len(actions) steps, collisions ignorées (type, x, y); `other` avance en même temps"""
+    seen, course = set(), []
+    for a in actions:
+        world.step(int(a), dt)
+        if other is not None:
+            other.step(int(a), dt)
+        for ob in world.obstacles:
+            if not ob.passed and id(ob) not in seen:
+                seen.add(id(ob))
+                course.append((ob.kind, round(ob.x, 3), ob.y))
+        seen.intersection_update(id(ob) for ob in world.obstacles if not ob.passed)
+    return course
+
+
+def bench_tape(args) -> None:
+    import os
+    import random
+    import tempfile
+
+    from .game.spawn_tape import SpawnTape, TapeSpawner, load_tapes, save_tapes
+    from .game.spawner import build_config, build_spawner
+
+    cfg = build_config(args.spawn_mode, args.spawn_distance, args.obstacles)
+    n = args.tapes * args.length
+
+    legacy = build_spawner(args.spawn_mode, args.spawn_distance, args.obstacles)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        legacy._draw_spec()
+    t_legacy = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    tapes = [SpawnTape.generate(seed, cfg, args.length) for seed in range(args.tapes)]
+    t_tape = time.perf_counter() - t0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tapes.npz")
+        save_tapes(path, tapes)
+        t0 = time.perf_counter()
+        loaded = load_tapes(path, cfg)
+        t_load = time.perf_counter() - t0
+    same = all(np.array_equal(loaded[t.seed].kind, t.kind) and np.array_equal(loaded[t.seed].gap, t.gap) for t in tapes)
+    print(f"{n} spawns: random module {t_legacy / n * 1e6:.2f} us/spawn, "
+          f"tape {t_tape / n * 1e6:.2f} us/spawn (generation), load {t_load / n * 1e6:.2f} us/spawn; "
+          f"reloaded identical={same}")
+
+    # la course d'un épisode ne dépend que de sa graine, pas d'un autre env du processus
+    args.spawn_tape = 1
+    actions = np.random.RandomState(0).choice(3, size=args.steps, p=[0.8, 0.15, 0.05])
+    world, other = _make_world(args), _make_world(args)
+    courses = []
+    for with_other in (False, True):
+        world.spawner.seed_next_episode(7)
+        world.reset()
+        other.reset()
+        random.seed(123 + with_other)
+        courses.append(_course(world, actions, args.dt, other if with_other else None))
+    world.spawner = TapeSpawner(cfg, {7: loaded[7]} if 7 in loaded else None)
+    world.spawner.seed_next_episode(7)
+    world.reset()
+    courses.append(_course(world, actions, args.dt))
+    print(f"tape course alone / interleaved with a 2nd env / from file: "
+          f"{'identical' if courses[0] == courses[1] == courses[2] else 'DIFFERENT'} "
+          f"({len(courses[0])} obstacles)")
+    if not same or not courses[0] == courses[1] == courses[2]:
+        raise SystemExit(1)
+
+
+def bench_capture(args) -> None:
+    import os
+    import tempfile
+    import zipfile
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from .game.capture import FrameCapture
+    from .game.renderer import Renderer
+
+    args.engine = "pygame"
+    world = _make_world(args)
+    renderer = Renderer(world.width, world.height, 60, realtime=False)
+    actions = np.random.RandomState(0).choice(3, size=args.steps, p=[0.8, 0.15, 0.05])
+
+    def run(capture=None):
+        import random
+
+        random.seed(0)
+        world.reset()
+        renderer.capture = capture
+        t0, c0 = time.perf_counter(), time.process_time()
+        for a in actions:
+            if world.step(int(a), args.dt)[0]:
+                world.reset()
+            renderer.draw(world)
+        n = len(actions) / 1e3
+        # process_time: CPU du seul processus de jeu (l'encodeur tourne à part)
+        return (time.perf_counter() - t0) / n, (time.process_time() - c0) / n
+
+    base_ms, base_cpu = run()
+    with tempfile.TemporaryDirectory() as tmp:
+        for block in (False, True):
+            path = os.path.join(tmp, f"capture_{int(block)}.zip")
+            cap = FrameCapture(path, (world.width, world.height), 60, every=args.every, scale=args.scale, block=block)
+            ms, cpu = run(cap)
+            last = cap.frames[cap.last_slot].view(np.uint8).reshape(cap.shape + (4,))[..., list(cap._rgb)].copy()
+            renderer.capture = None
+            t0 = time.perf_counter()
+            cap.close()
+            flush_ms = (time.perf_counter() - t0) * 1e3
+            with zipfile.ZipFile(path) as zf:
+                names = sorted(n for n in zf.namelist() if n.endswith(".png"))
+                size_kb = sum(i.file_size for i in zf.infolist()) / 1024
+                # sans perte: la dernière frame relue = le tampon copié de l'écran
+                img = pygame.image.load(zf.open(names[-1]), "frame.png")
+                same = np.array_equal(pygame.surfarray.array3d(img).transpose(1, 0, 2), last)
+            mode = "block" if block else "drop"
+            print(f"{mode}: game loop CPU {cpu:.2f} ms/frame vs {base_cpu:.2f} without capture (+{cpu - base_cpu:.2f}), "
+                  f"wall {ms:.2f} vs {base_ms:.2f} ms/frame, "
+                  f"{len(names)} frames kept, {cap.dropped} dropped, close {flush_ms:.0f} ms, "
+                  f"{size_kb / max(len(names), 1):.1f} KB/frame, lossless: {same}")
+    renderer.close()
+
+
+def bench_render(args) -> None:
+    import os
+    import random
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from .game.renderer import Renderer
+
+    args.engine = "pygame"
+    actions = np.random.RandomState(0).choice(3, size=args.steps, p=[0.8, 0.15, 0.05])
+    results, frames = {}, {}
+    for mode in ("full", "dirty"):
+        world = _make_world(args)
+        renderer = Renderer(world.width, world.height, 60, realtime=False, dirty=mode == "dirty")
+        random.seed(0)
+        world.reset()
+        shots = []
+        t_draw = 0.0
+        t0 = time.perf_counter()
+        for i, a in enumerate(actions):
+            if world.step(int(a), args.dt)[0]:
+                world.reset()
+            t1 = time.perf_counter()
+            renderer.draw(world)
+            t_draw += time.perf_counter() - t1
+            if i % 50 == 0:
+                shots.append(pygame.surfarray.array3d(renderer.screen))
+        wall = time.perf_counter() - t0
+        results[mode] = (len(actions) / wall, len(actions) / t_draw)
+        frames[mode] = shots
+    # hors HUD (glyphes juxtaposés != font.render d'une chaîne), les deux rendus sont identiques au pixel près
+    same = all(np.array_equal(a[:, 70:], b[:, 70:]) for a, b in zip(frames["full"], frames["dirty"]))
+    for mode, (fps, draw_fps) in results.items():
+        print(f"{mode:5s}: {fps:,.0f} FPS (step + draw, no clock cap), draw alone {draw_fps:,.0f}/s")
+    print(f"dirty vs full: x{results['dirty'][1] / results['full'][1]:.2f} draw rate, "
+          f"identical below the HUD: {same}")
+    pygame.quit()
+    if not same:
+        raise SystemExit(1)
+
+
+def bench_pixels(args) -> None:
+    import os
+    import random
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from .ai.buffer import FrameReplayBuffer, ReplayBuffer
+    from .game.pixels import FrameStack, make_view
+
+    actions = np.random.RandomState(0).choice(3, size=args.steps, p=[0.8, 0.15, 0.05])
+    k, size = args.frame_stack, args.pixel_size
+
+    # 1) coût par image, et même image raster pour les deux moteurs
+    images = {}
+    for source, engine in (("raster", "headless"), ("raster", "pygame"), ("sprites", "pygame")):
+        args.engine = engine
+        world = _make_world(args)
+        view = make_view(source, world.width, world.height, size)
+        stack = FrameStack(k, (size, size))
+        random.seed(0)
+        world.reset()
+        shots, t_draw = [], 0.0
+        for i, a in enumerate(actions):
+            if world.step(int(a), args.dt)[0]:
+                world.reset()
+            t0 = time.perf_counter()
+            view.draw(world, stack.next_frame())
+            stack.push()
+            t_draw += time.perf_counter() - t0
+            if i % 100 == 0:
+                shots.append(stack.view()[-1].copy())
+        images[source, engine] = shots
+        print(f"{source:7s} ({engine:8s}): {t_draw / len(actions) * 1e6:.0f} us/frame "
+              f"(draw {size}x{size} + push into the stack)")
+    same = all(np.array_equal(a, b) for a, b in zip(images["raster", "headless"], images["raster", "pygame"]))
+    print(f"raster images identical for pygame and headless: {same}")
+
+    # 2) replay dédupliqué vs stockage des piles complètes (mêmes transitions)
+    args.engine = "headless"
+    world = _make_world(args)
+    view = make_view("raster", world.width, world.height, size)
+    stack = FrameStack(k, (size, size))
+    dedup, full = FrameReplayBuffer(args.capacity), ReplayBuffer(args.capacity)
+    random.seed(0)
+    world.reset()
+    view.draw(world, stack.next_frame())
+    obs = stack.fill()
+    t_add, episodes = 0.0, 1
+    for i, a in enumerate(actions):
+        done, _ = world.step(int(a), args.dt)
+        view.draw(world, stack.next_frame())
+        next_obs = stack.push()
+        t0 = time.perf_counter()
+        dedup.add(obs, int(a), 0.0, next_obs, done)
+        t_add += time.perf_counter() - t0
+        full.add(obs, int(a), 0.0, next_obs, done)
+        obs = next_obs
+        if done:
+            world.reset()
+            view.draw(world, stack.next_frame())
+            obs = stack.fill()
+            episodes += 1
+    idx = np.flatnonzero(dedup.valid[:dedup.size])
+    a, b = dedup.gather(idx), full.gather(idx)
+    exact = np.array_equal(a.s, b.s) and np.array_equal(a.s2, b.s2)
+    full_bytes = full.s.nbytes + full.s2.nbytes
+    t0 = time.perf_counter()
+    for _ in range(200):
+        dedup.sample(64)
+    sample_ms = (time.perf_counter() - t0) / 200 * 1e3
+    print(f"replay capacity={args.capacity}, {len(actions)} transitions over {episodes} episodes: "
+          f"frames {dedup.nbytes / 2**20:.1f} MiB vs {full_bytes / 2**20:.1f} MiB for full stacks "
+          f"(x{full_bytes / max(dedup.nbytes, 1):.1f}); add {t_add / len(actions) * 1e6:.1f} us, "
+          f"sample(64) {sample_ms:.2f} ms; {len(idx)}/{dedup.size} valid, stacks rebuilt exactly: {exact}")
+    if not (same and exact):
+        raise SystemExit(1)
+
+
+def _add_world_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--steps", type=int, default=20000)
+    p.add_argument("--dt", type=float, default=1.0 / 60.0)
+    p.add_argument("--spawn_mode", type=str, default="regular", choices=["regular", "random"])
+    p.add_argument("--spawn_distance", type=int, default=600)
+    p.add_argument("--obstacles", type=str, default="cactus,bird,bonus")
+    p.add_argument("--spawn_tape", type=int, default=0, choices=[0, 1])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser("T-Rex AI benchmarks")
+    sub = p.add_subparsers(dest="name", required=True)
+
+    rp = sub.add_parser("replay", help="Débit add/sample du ReplayBuffer")
+    rp.add_argument("--capacity", type=int, default=50000)
+    rp.add_argument("--batch_size", type=int, default=64)
+    rp.add_argument("--iters", type=int, default=2000)
+    rp.set_defaults(func=bench_replay)
+
+    up = sub.add_parser("update", help="Débit de DQNAgent.train_step (CPU)")
+    up.add_argument("--batch_size", type=int, default=64)
+    up.add_argument("--iters", type=int, default=500)
+    up.add_argument("--double_dqn", type=int, default=0, choices=[0, 1])
+    up.add_argument("--xla", type=int, default=0, choices=[0, 1])
+    up.set_defaults(func=bench_update)
+
+    ap = sub.add_parser("act", help="Débit de DQNAgent.act (greedy)")
+    ap.add_argument("--iters", type=int, default=5000)
+    ap.add_argument("--batch_size", type=int, default=64)
+    ap.add_argument("--train_freq", type=int, default=0, help="Intercaler un train_step tous les N act (0 = jamais)")
+    ap.set_defaults(func=bench_act)
+
+    cp = sub.add_parser("ckpt", help="Coût par appel de DQNAgent.save vs save_async")
+    cp.add_argument("--iters", type=int, default=50)
+    cp.add_argument("--batch_size", type=int, default=64)
+    cp.set_defaults(func=bench_ckpt)
+
+    csp = sub.add_parser("coldstart", help="Démarrage à froid de --play jusqu'à la première frame (TF vs NumPy)")
+    csp.add_argument("--repeats", type=int, default=3)
+    csp.add_argument("--batch_size", type=int, default=64)
+    csp.set_defaults(func=bench_coldstart)
+
+    tp = sub.add_parser("tfcheck", help="Échoue si --play --human 1 ou la simulation headless importent TensorFlow")
+    tp.set_defaults(func=bench_tfcheck)
+
+    pp = sub.add_parser("parity", help="Vérifie que HeadlessWorld reproduit World step par step")
+    _add_world_args(pp)
+    pp.add_argument("--seeds", type=int, default=5)
+    pp.set_defaults(func=bench_parity)
+
+    sp = sub.add_parser("sim", help="Débit de World.step")
+    _add_world_args(sp)
+    sp.add_argument("--engine", type=str, default="pygame", choices=["pygame", "headless"])
+    sp.add_argument("--ignore_done", action="store_true", help="Continuer après collision (densité d'obstacles stable)")
+    sp.set_defaults(func=bench_sim)
+
+    alp = sub.add_parser("alloc", help="Temps et allocations (tracemalloc) de World.step + state()")
+    _add_world_args(alp)
+    alp.set_defaults(steps=10000)
+    alp.add_argument("--engine", type=str, default="pygame", choices=["pygame", "headless"])
+    alp.set_defaults(func=bench_alloc)
+
+    tap = sub.add_parser("tape", help="Coût des bandes de spawn vs module random, et reproductibilité")
+    _add_world_args(tap)
+    tap.set_defaults(steps=5000)
+    tap.add_argument("--engine", type=str, default="headless", choices=["pygame", "headless"])
+    tap.add_argument("--tapes", type=int, default=100)
+    tap.add_argument("--length", type=int, default=128)
+    tap.set_defaults(func=bench_tape)
+
+    cap = sub.add_parser("capture", help="Surcoût de --capture par image rendue (SDL dummy) et archive sans perte")
+    _add_world_args(cap)
+    cap.set_defaults(steps=600)
+    cap.add_argument("--every", type=int, default=1)
+    cap.add_argument("--scale", type=int, default=1)
+    cap.set_defaults(func=bench_capture)
+
+    rdp = sub.add_parser("render", help="FPS sans plafond du Renderer plein écran vs --dirty_render (SDL dummy)")
+    _add_world_args(rdp)
+    rdp.set_defaults(steps=3000)
+    rdp.set_defaults(func=bench_render)
+
+    pxp = sub.add_parser("pixels", help="Coût des observations en pixels et mémoire du replay dédupliqué")
+    _add_world_args(pxp)
+    pxp.set_defaults(steps=5000)
+    pxp.add_argument("--frame_stack", type=int, default=4)
+    pxp.add_argument("--pixel_size", type=int, default=84)
+    pxp.add_argument("--capacity", type=int, default=4000)
+    pxp.set_defaults(func=bench_pixels)
+
+    vp = sub.add_parser("vector", help="Débit de VectorWorld (env-steps/s)")
+    _add_world_args(vp)
+    vp.set_defaults(engine="headless", steps=2000)
+    vp.add_argument("--n_envs", type=int, default=256)
+    vp.set_defaults(func=bench_vector)
+
+    return p
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,22 +7,53 @@ def build_parser() -> argparse.ArgumentParser:
     mode = p.add_mutually_exclusive_group(required=True)
     mode.add_argument("--train", action="store_true", help="Entrainer l'agent")
     mode.add_argument("--play", action="store_true", help="Jouer (agent ou humain)")
+    mode.add_argument("--eval", action="store_true",
+                      help="Évaluer --model sur --episodes épisodes gloutons (seeds fixes, en parallèle)")
+    mode.add_argument("--league", action="store_true",
+                      help="Classer tous les checkpoints de --league_root sur les mêmes seeds (résultats en cache)")
+    mode.add_argument("--replay", type=str, default=None, metavar="EPISODE",
+                      help="Revoir un épisode enregistré (fichier .npz, ou dossier episodes/: le meilleur)")
+    mode.add_argument("--export", action="store_true",
+                      help="Exporter --model (dossier best/latest) en policy.npz, jouable sans TensorFlow")
 
     # Global
     p.add_argument("--render", type=int, default=0, choices=[0, 1], help="Activer le rendu Pygame")
     p.add_argument("--episodes", type=int, default=500)
     p.add_argument("--max_steps", type=int, default=5000, help="Max steps par episode")
     p.add_argument("--seed", type=int, default=42)
-    p.add_argument("--fps", type=int, default=60)
+    p.add_argument("--fps", type=int, default=60, help="Pas de simulation fixe dt = 1/fps")
+    p.add_argument("--startup_profile", action="store_true",
+                   help="Afficher le temps de chaque phase du démarrage (imports, SDL, assets, modèle, 1er step)")
+    p.add_argument("--realtime", type=int, default=0, choices=[0, 1],
+                   help="Cadencer à fps images/s (pour regarder avec --render 1); sinon vitesse CPU max")
+    p.add_argument("--dirty_render", type=int, default=0, choices=[0, 1],
+                   help="Rendu par rectangles modifiés (fond en cache, HUD en glyphes, display.update) au lieu du flip plein écran")
 
     # Game
+    p.add_argument("--engine", type=str, default="pygame", choices=["pygame", "headless"],
+                   help="Moteur de simulation: pygame (sprites) ou headless (sans SDL, sans nuages)")
     p.add_argument("--width", type=int, default=1100)
     p.add_argument("--height", type=int, default=600)
+    p.add_argument("--frame_skip", type=int, default=1, help="Répéter chaque action de l'agent sur K frames (1 = désactivé)")
+    p.add_argument("--frame_skip_distance", type=float, default=0.0,
+                   help="Frame skip adaptatif: ne répéter que si aucun obstacle à moins de N px du dino (0 = toujours K)")
+
+    # Observations
+    p.add_argument("--obs", type=str, default="features", choices=["features", "pixels"],
+                   help="Observation de l'agent: 9 features, ou pile d'images en niveaux de gris (réseau convolutif)")
+    p.add_argument("--frame_stack", type=int, default=4, help="Images empilées par observation (--obs pixels)")
+    p.add_argument("--pixel_size", type=int, default=84, help="Côté des images réduites (--obs pixels)")
+    p.add_argument("--pixel_source", type=str, default="raster", choices=["raster", "sprites"],
+                   help="Image: hitbox remplies en NumPy (tous moteurs) ou sprites hors écran (moteur pygame)")
 
     # Obstacles
     p.add_argument("--spawn_mode", type=str, default="regular", choices=["regular", "random"])
     p.add_argument("--spawn_distance", type=int, default=600, help="Distance fixe (pixels) entre obstacles en mode regular")
     p.add_argument("--obstacles", type=str, default="cactus,bird,bonus", help="Types actifs: cactus ou cactus,bird et bonus")
+    p.add_argument("--spawn_tape", type=int, default=0, choices=[0, 1],
+                   help="Obstacles de chaque épisode tirés d'avance (np.random.Generator par épisode), sans le module random")
+    p.add_argument("--spawn_tape_file", type=str, default=None,
+                   help="Bandes enregistrées (python -m src.game.spawn_tape), relues par graine d'épisode; implique --spawn_tape 1")
 
     # Speed/difficulty (paramètres du jeu Chrome original)
     # Vitesse initiale ~6, max 13, accélération 0.001/frame
@@ -49,13 +80,68 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--train_start", type=int, default=1000, help="Nb transitions avant d'entrainer")
     p.add_argument("--target_update", type=int, default=1000, help="Steps entre updates du target network")
     p.add_argument("--train_freq", type=int, default=4, help="Entrainer tous les N steps (plus grand = plus rapide)")
+    p.add_argument("--double_dqn", type=int, default=0, choices=[0, 1], help="Cible Double-DQN (action choisie par le réseau online)")
+    p.add_argument("--xla", type=int, default=0, choices=[0, 1], help="Compiler l'update avec XLA (jit_compile)")
 
     p.add_argument("--epsilon_start", type=float, default=1.0)
     p.add_argument("--epsilon_end", type=float, default=0.01)
-    p.add_argument("--epsilon_decay_steps", type=int, default=10000)
+    p.add_argument("--epsilon_decay_steps", type=int, default=10000,
+                   help="Durée de la décroissance d'epsilon, en updates (~ train_freq steps de jeu chacun, aussi par acteur avec --actors)")
+
+    # Learner asynchrone (thread)
+    p.add_argument("--async_learner", type=int, default=0, choices=[0, 1],
+                   help="Entraîner dans un thread en arrière-plan (la boucle de jeu ne fait que act/remember)")
+    p.add_argument("--replay_ratio", type=float, default=0.0, help="Updates par step de jeu visés (0 = 1/train_freq)")
+    p.add_argument("--prefetch", type=int, default=4, help="Minibatches préparés d'avance pour le learner asynchrone")
+
+    # Acteurs/learner multi-process
+    p.add_argument("--actors", type=int, default=0, help="Nb de processus acteurs (0 = boucle mono-process)")
+    p.add_argument("--weights_sync_every", type=int, default=100, help="Updates entre deux diffusions des poids aux acteurs")
+    p.add_argument("--actor_chunk", type=int, default=64, help="Transitions envoyées au learner par message")
+
+    # Prioritized replay (sum-tree)
+    p.add_argument("--prioritized", type=int, default=0, choices=[0, 1], help="Replay priorisé par l'erreur TD")
+    p.add_argument("--per_alpha", type=float, default=0.6, help="Exposant de priorité (0 = uniforme)")
+    p.add_argument("--per_beta_start", type=float, default=0.4, help="Correction importance-sampling initiale")
+    p.add_argument("--per_beta_steps", type=int, default=100000, help="Steps pour amener beta à 1")
 
     # Play
-    p.add_argument("--model", type=str, default=None, help="Chemin vers un modèle (dossier best/latest) pour --play")
+    p.add_argument("--model", type=str, default=None,
+                   help="Chemin vers un modèle (dossier best/latest, ou policy.npz exporté) pour --play/--export")
+    p.add_argument("--export_out", type=str, default=None, help="Fichier de sortie de --export (défaut: <model>/policy.npz)")
     p.add_argument("--human", type=int, default=0, choices=[0, 1], help="En mode play: contrôle humain (ESPACE)")
 
+
+    # Évaluation (--eval)
+    p.add_argument("--eval_seeds", type=str, default=None,
+                   help="Seeds des épisodes, ex. \"1,2,3\" (défaut: seed, seed+1, ... sur --episodes)")
+    p.add_argument("--eval_workers", type=int, default=0, help="Processus d'évaluation (0 = nb de CPU)")
+    p.add_argument("--eval_ci", type=float, default=0.05,
+                   help="Arrêt anticipé quand l'IC 95%% du score moyen < eval_ci × moyenne (0 = tous les épisodes)")
+    p.add_argument("--eval_min_episodes", type=int, default=20, help="Épisodes minimum avant l'arrêt anticipé")
+    p.add_argument("--eval_out", type=str, default=None,
+                   help="Dossier du rapport (défaut: logs du run pour --eval, <logs_dir>/league pour --league)")
+
+    # Évaluation périodique pendant --train
+    p.add_argument("--eval_every", type=int, default=0,
+                   help="Évaluer les poids tous les N épisodes dans un processus à part; best/ choisi sur ce score (0 = avg20)")
+    p.add_argument("--eval_episodes", type=int, default=10, help="Épisodes gloutons par évaluation périodique (seeds fixes)")
+
+    # Enregistrement / relecture d'épisodes
+    p.add_argument("--record_top", type=int, default=0,
+                   help="Garder les N meilleurs épisodes (graine + actions RLE, quelques Ko) dans logs/.../episodes; exige --spawn_tape 1")
+    p.add_argument("--replay_speed", type=float, default=1.0, help="Vitesse de --replay (1 = temps réel, 4 = accéléré, 0.5 = ralenti)")
+    p.add_argument("--replay_seek", type=str, default="",
+                   help="Commencer --replay à une frame (nombre) ou 2 s avant la collision (death)")
+
+    # Capture vidéo du rendu (--render 1, marche avec SDL_VIDEODRIVER=dummy)
+    p.add_argument("--capture", type=str, default=None,
+                   help="Enregistrer les images rendues: .zip (PNG sans perte) ou .mp4/.gif/.webm (ffmpeg)")
+    p.add_argument("--capture_every", type=int, default=1, help="Garder une image rendue sur N")
+    p.add_argument("--capture_scale", type=int, default=1, help="Réduire les images d'un facteur entier (2 = moitié)")
+
+    # Ligue (--league)
+    p.add_argument("--league_root", type=str, default=None, help="Dossier parcouru à la recherche de checkpoints (défaut: models_dir)")
+    p.add_argument("--league_envs", type=int, default=8, help="Épisodes joués en même temps par checkpoint (forward batché)")
+
     return p
@@ -0,0 +1,85 @@
+"""Action repeat (frame skip) autour de TrexEnv.
+
+Une décision de l'agent est rejouée sur plusieurs World.step: act() et
+ReplayBuffer.add ne sont appelés qu'une fois par décision. La récompense est
+cumulée sur les frames répétées et la répétition s'arrête à la collision.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass
+class RepeatResult:
+    obs: Any
+    reward: float
+    done: bool
+    info: Dict[str, Any]  # info de la dernière frame + "frames" (nb de World.step joués)
+
+
+def obstacle_near(world, distance: float) -> bool:
+    """Vrai si un obstacle pas encore passé est à moins de `distance` px devant le dino"""
+    dino_x = world.dino.x
+    for ob in world.obstacles:  # triés par x: le premier non passé est le plus proche
+        if not ob.passed:
+            return ob.x - dino_x < distance
+    return False
+
+
+class ActionRepeatEnv:
+    """Rejoue chaque action `frame_skip` fois.
+
+    Mode adaptatif (near_distance > 0): la répétition s'arrête dès qu'un
+    obstacle est à moins de near_distance px, pour que l'agent décide à
+    chaque frame près des obstacles et saute les frames de course à vide.
+    """
+
+    def __init__(self, env, frame_skip: int, near_distance: float = 0.0, clock=None):
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be >= 1, got {frame_skip}")
+        self.env = env
+        self.frame_skip = int(frame_skip)
+        self.near_distance = float(near_distance)
+        self.clock = clock  # SimClock de la boucle d'entraînement (sinon env.tick)
+        self._quit = False
+
+    def __getattr__(self, name: str):
+        return getattr(self.env, name)
+
+    def reset(self):
+        self._quit = False
+        return self.env.reset()
+
+    def _keep_repeating(self) -> bool:
+        if self.near_distance <= 0:
+            return True
+        return not obstacle_near(self.env.world, self.near_distance)
+
+    def step(self, action: int, dt: float) -> RepeatResult:
+        env = self.env
+        res = env.step(action, dt)
+        reward = float(res.reward)
+        frames = 1
+        while frames < self.frame_skip and not res.done and self._keep_repeating():
+            # les frames intermédiaires sont affichées et cadencées comme les autres
+            if env.render_enabled and env.render():
+                self._quit = True
+                break
+            res = env.step(action, self.clock.tick() if self.clock is not None else env.tick())
+            reward += float(res.reward)
+            frames += 1
+        info = dict(res.info)
+        info["frames"] = frames
+        return RepeatResult(obs=res.obs, reward=reward, done=res.done, info=info)
+
+    def render(self) -> bool:
+        return self._quit or self.env.render()
+
+
+def wrap_action_repeat(env, args, clock=None):
+    """Enveloppe env si --frame_skip > 1, sinon le renvoie tel quel"""
+    frame_skip = getattr(args, "frame_skip", 1)
+    if frame_skip <= 1:
+        return env
+    return ActionRepeatEnv(env, frame_skip, getattr(args, "frame_skip_distance", 0.0), clock=clock)
@@ -0,0 +1,55 @@
+"""Observations en pixels (--obs pixels): remplace l'obs de TrexEnv par la pile des k dernières images.
+
+Se place au-dessus d'ActionRepeatEnv: une image par décision de l'agent, pas
+par frame répétée. L'obs rendue est une vue (k, H, W) uint8 sur l'anneau de
+FrameStack, valable jusqu'au step suivant inclus (obs et next_obs d'une
+transition); ReplayBuffer / FrameReplayBuffer la copient à l'ajout.
+"""
+from __future__ import annotations
+
+import copy
+import dataclasses
+from typing import Optional, Tuple
+
+from ..game.pixels import FrameStack, make_view
+
+
+def pixel_obs_shape(args) -> Optional[Tuple[int, int, int]]:
+    """(k, H, W) des observations en pixels, None en mode features"""
+    if getattr(args, "obs", "features") != "pixels":
+        return None
+    return (args.frame_stack, args.pixel_size, args.pixel_size)
+
+
+class PixelObsEnv:
+    def __init__(self, env, source: str, k: int, size: int):
+        self.env = env
+        world = env.world
+        self.view = make_view(source, world.width, world.height, size)
+        self.stack = FrameStack(k, (size, size))
+
+    def __getattr__(self, name: str):
+        return getattr(self.env, name)
+
+    def reset(self):
+        self.env.reset()
+        self.view.draw(self.env.world, self.stack.next_frame())
+        return self.stack.fill()
+
+    def step(self, action: int, dt: float):
+        res = self.env.step(action, dt)
+        self.view.draw(self.env.world, self.stack.next_frame())
+        obs = self.stack.push()
+        if dataclasses.is_dataclass(res):
+            return dataclasses.replace(res, obs=obs)
+        res = copy.copy(res)
+        res.obs = obs
+        return res
+
+
+def wrap_pixels(env, args):
+    """PixelObsEnv si --obs pixels, sinon env inchangé"""
+    shape = pixel_obs_shape(args)
+    if shape is None:
+        return env
+    return PixelObsEnv(env, args.pixel_source, shape[0], shape[1])
@@ -0,0 +1,56 @@
+"""Enregistre les épisodes d'un TrexEnv et garde les meilleurs (--record_top N).
+
+Se place sous ActionRepeatEnv: chaque World.step joué est enregistré, frames
+répétées comprises. Les fichiers vont dans <logs du run>/episodes (voir
+game/recording.py pour le format et --replay pour les revoir).
+"""
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from ..game.recording import EpisodeRecorder, TopEpisodes
+
+
+class RecordingEnv:
+    def __init__(self, env, out_dir: str, keep: int, world_params: dict):
+        self.env = env
+        self.recorder = EpisodeRecorder(world_params)
+        self.top = TopEpisodes(out_dir, keep)
+        self.episode = 0
+        self.last_saved: Optional[str] = None
+
+    def __getattr__(self, name: str):
+        return getattr(self.env, name)
+
+    def _finish(self) -> None:
+        rec = self.recorder.finish(self.env.world, meta={"episode": self.episode})
+        if rec is not None:
+            self.last_saved = self.top.offer(rec, f"ep{self.episode:06d}") or self.last_saved
+
+    def reset(self):
+        self._finish()
+        obs = self.env.reset()
+        self.episode += 1
+        # la course ne dépend que de la graine de la bande de spawn
+        self.recorder.begin(self.env.world.spawner.tape.seed)
+        return obs
+
+    def step(self, action: int, dt: float):
+        res = self.env.step(action, dt)
+        self.recorder.record(int(action), self.env.world, bool(res.done))
+        return res
+
+    def close(self) -> None:
+        self._finish()
+        self.env.close()
+
+
+def wrap_recorder(env, args, logs_run_dir: str):
+    """RecordingEnv si --record_top > 0 (exige --spawn_tape), sinon env inchangé"""
+    if args.record_top <= 0:
+        return env
+    from ..game.recording import WORLD_KEYS
+
+    return RecordingEnv(env, os.path.join(logs_run_dir, "episodes"), args.record_top,
+                        {k: getattr(args, k) for k in WORLD_KEYS})
@@ -0,0 +1,165 @@
+"""K copies de TrexEnv dans des processus, résultats écrits en mémoire partagée.
+
+Chaque worker lit son action et écrit obs / reward / done directement dans un
+bloc NumPy partagé: par step, seul un octet de commande transite par le pipe
+(rien n'est picklé). Les workers font l'auto-reset: quand done, final_obs
+reçoit l'observation terminale et obs celle du nouvel épisode.
+Fonctionne avec le World pygame (chaque worker charge ses propres sprites).
+"""
+from __future__ import annotations
+
+import copy
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..game.clock import SimClock
+
+_STEP, _RESET, _CLOSE, _OK = b"s", b"r", b"c", b"k"
+
+
+def make_trex_env(args, worker_id: int, clock):
+    """Fabrique par défaut: TrexEnv sans rendu (+ frame skip), graine propre au worker"""
+    from ..main import load_game_assets
+    from ..utils import set_seed
+    from .action_repeat import wrap_action_repeat
+    from .trex_env import TrexEnv
+
+    args = copy.copy(args)
+    args.render = 0
+    set_seed(args.seed + worker_id)
+    return wrap_action_repeat(TrexEnv(args, load_game_assets(args), render=False), args, clock=clock)
+
+
+class _SharedBlock:
+    """Tableaux (K, ...) alloués dans un seul segment de mémoire partagée"""
+
+    def __init__(self, n_envs: int, obs_dim: int, name: Optional[str] = None):
+        self.fields = [
+            ("obs", (n_envs, obs_dim), np.float32),
+            ("final_obs", (n_envs, obs_dim), np.float32),
+            ("reward", (n_envs,), np.float32),
+            ("score", (n_envs,), np.float64),
+            ("done", (n_envs,), np.bool_),
+            ("action", (n_envs,), np.int64),
+        ]
+        offsets = []
+        size = 0
+        for _, shape, dt in self.fields:
+            size = -(-size // 8) * 8  # chaque champ aligné sur 8 octets
+            offsets.append(size)
+            size += int(np.prod(shape)) * np.dtype(dt).itemsize
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.arrays: Dict[str, np.ndarray] = {
+            field: np.ndarray(shape, dtype=dt, buffer=self.shm.buf, offset=offset)
+            for (field, shape, dt), offset in zip(self.fields, offsets)
+        }
+
+    def close(self, unlink: bool = False) -> None:
+        self.arrays = {}
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _worker(worker_id: int, args, env_fn: Callable, shm_name: str, n_envs: int, obs_dim: int, conn) -> None:
+    block = _SharedBlock(n_envs, obs_dim, shm_name)
+    obs, final_obs = block.arrays["obs"][worker_id], block.arrays["final_obs"][worker_id]
+    arrays = block.arrays
+    clock = SimClock(args.fps)
+    env = env_fn(args, worker_id, clock)
+    frames = 0
+    try:
+        while True:
+            cmd = conn.recv_bytes()
+            if cmd == _STEP:
+                res = env.step(int(arrays["action"][worker_id]), clock.tick())
+                frames += res.info.get("frames", 1)
+                done = bool(res.done) or frames >= args.max_steps
+                arrays["reward"][worker_id] = res.reward
+                arrays["score"][worker_id] = res.info["score"]
+                arrays["done"][worker_id] = done
+                if done:
+                    final_obs[:] = res.obs
+                    obs[:] = env.reset()
+                    frames = 0
+                else:
+                    obs[:] = res.obs
+            elif cmd == _RESET:
+                obs[:] = env.reset()
+                frames = 0
+                arrays["reward"][worker_id] = 0.0
+                arrays["score"][worker_id] = 0.0
+                arrays["done"][worker_id] = False
+            elif cmd == _CLOSE:
+                break
+            conn.send_bytes(_OK)
+    finally:
+        env.close()
+        obs = final_obs = arrays = None  # plus de vue sur le segment avant close()
+        block.close()
+        conn.close()
+
+
+class SubprocVectorEnv:
+    """Interface batchée: reset() -> obs[K, obs_dim]; step(actions[K]) -> (obs, reward, done, info).
+
+    Les tableaux renvoyés sont des copies; info["final_obs"] donne l'observation
+    terminale des envs dont done est vrai (leur obs est déjà celle du reset).
+    """
+
+    def __init__(self, args, n_envs: int, obs_dim: int = 9, env_fn: Callable = make_trex_env):
+        self.n_envs = int(n_envs)
+        self.obs_dim = int(obs_dim)
+        self.block = _SharedBlock(self.n_envs, self.obs_dim)
+        ctx = mp.get_context("spawn")
+        self.conns = []
+        self.procs = []
+        for i in range(self.n_envs):
+            parent, child = ctx.Pipe()
+            p = ctx.Process(target=_worker, args=(i, args, env_fn, self.block.shm.name, self.n_envs, self.obs_dim, child),
+                            daemon=True)
+            p.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(p)
+        self.closed = False
+
+    def _broadcast(self, cmd: bytes) -> None:
+        for conn in self.conns:
+            conn.send_bytes(cmd)
+        for conn in self.conns:
+            if conn.recv_bytes() != _OK:
+                raise RuntimeError("Vector env worker failed")
+
+    def reset(self) -> np.ndarray:
+        self._broadcast(_RESET)
+        return self.block.arrays["obs"].copy()
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        arrays = self.block.arrays
+        arrays["action"][:] = actions
+        self._broadcast(_STEP)
+        done = arrays["done"].copy()
+        info = {"score": arrays["score"].copy(), "final_obs": arrays["final_obs"].copy()}
+        return arrays["obs"].copy(), arrays["reward"].copy(), done, info
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self.conns:
+            try:
+                conn.send_bytes(_CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+        for p in self.procs:
+            p.join(timeout=5.0)
+            if p.is_alive():
+                p.terminate()
+        self.block.close(unlink=True)
@@ -0,0 +1,207 @@
+"""Cache des sprites précompilé: un seul fichier mappé en mémoire au démarrage.
+
+python -m src.game.asset_cache [--assets DIR] [--out FICHIER] [--masks]
+
+Contenu: pixels RGBA bruts, tailles, hitbox précalculées (mêmes règles que
+Dino/make_cactus/make_bird) et, en option, masques de collision (alpha > 0,
+bits packés). Format: 8 octets de longueur + en-tête JSON, puis les tableaux
+alignés sur 64 octets. Le fichier est ouvert avec np.memmap: les processus qui
+le lisent partagent les pages via le cache du système, sans décoder de PNG.
+"""
+import argparse
+import json
+import os
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+from .geometry import BIRD_SHRINK, DINO_SHRINK, Rect, Size, SpriteGeometry, cactus_shrink, shrunk_rect
+
+CACHE_FILE = "sprites.cache"
+CACHE_FORMAT = 1
+_ALIGN = 64
+
+DINO_SPRITES = ("DinoRun1", "DinoRun2", "DinoDuck1", "DinoDuck2", "DinoJump")
+LARGE_CACTI = ("LargeCactus1", "LargeCactus2", "LargeCactus3")
+SMALL_CACTI = ("SmallCactus1", "SmallCactus2", "SmallCactus3")
+BIRDS = ("Bird1", "Bird2")
+DECOR = ("Track", "Cloud", "GameOver", "Reset")
+SPRITES = DINO_SPRITES + LARGE_CACTI + SMALL_CACTI + BIRDS + DECOR
+
+
+def hitbox_for(name: str, size: Size) -> Rect:
+    """Hitbox (dx, dy, w, h) relative au coin haut-gauche du sprite"""
+    w, h = size
+    if name in DINO_SPRITES:
+        return shrunk_rect(0, 0, w, h, DINO_SHRINK[0], DINO_SHRINK[1])
+    if name in LARGE_CACTI or name in SMALL_CACTI:
+        s = cactus_shrink(w, name in LARGE_CACTI)
+        return shrunk_rect(0, 0, w, h, 2 * s, s)
+    if name in BIRDS:
+        return shrunk_rect(0, 0, w, h, 2 * BIRD_SHRINK, BIRD_SHRINK)
+    return 0, 0, w, h
+
+
+def _sources(assets_dir: str) -> Dict[str, list]:
+    out = {}
+    for name in SPRITES:
+        st = os.stat(os.path.join(assets_dir, f"{name}.png"))
+        out[name] = [st.st_size, st.st_mtime_ns]
+    return out
+
+
+def default_cache_path(assets_dir: str) -> str:
+    return os.path.join(assets_dir, CACHE_FILE)
+
+
+def build_asset_cache(assets_dir: str, out_path: Optional[str] = None, masks: bool = False) -> str:
+    """Décode les PNG une fois (pygame, sans affichage) et écrit le cache"""
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+
+    out_path = out_path or default_cache_path(assets_dir)
+    arrays = []
+    sprites = {}
+    offset = 0
+
+    def put(arr: np.ndarray) -> dict:
+        nonlocal offset
+        offset = -(-offset // _ALIGN) * _ALIGN
+        entry = {"offset": offset, "shape": list(arr.shape)}
+        arrays.append((offset, np.ascontiguousarray(arr)))
+        offset += arr.nbytes
+        return entry
+
+    for name in SPRITES:
+        img = pygame.image.load(os.path.join(assets_dir, f"{name}.png"))
+        w, h = img.get_size()
+        rgba = np.frombuffer(pygame.image.tobytes(img, "RGBA"), dtype=np.uint8).reshape(h, w, 4)
+        entry = {"size": [w, h], "hitbox": list(hitbox_for(name, (w, h))), "pixels": put(rgba)}
+        if masks:
+            entry["mask"] = put(np.packbits(rgba[:, :, 3] > 0, axis=1))
+        sprites[name] = entry
+
+    header = json.dumps({"format": CACHE_FORMAT, "sources": _sources(assets_dir), "sprites": sprites}).encode("utf-8")
+    base = -(-(8 + len(header)) // _ALIGN) * _ALIGN
+    tmp = f"{out_path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for off, arr in arrays:
+            f.seek(base + off)
+            f.write(arr.tobytes())
+    os.replace(tmp, out_path)
+    return out_path
+
+
+class AssetCache:
+    """Vue en lecture seule (np.memmap) sur un cache construit par build_asset_cache"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            (n,) = struct.unpack("<Q", f.read(8))
+            self.header = json.loads(f.read(n).decode("utf-8"))
+        if self.header.get("format") != CACHE_FORMAT:
+            raise ValueError(f"Unsupported asset cache format in {path}: {self.header.get('format')}")
+        self._base = -(-(8 + n) // _ALIGN) * _ALIGN
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+        self.sprites = self.header["sprites"]
+
+    def fresh(self, assets_dir: str) -> bool:
+        """Faux si un PNG a changé depuis la construction du cache"""
+        try:
+            return self.header["sources"] == _sources(assets_dir)
+        except OSError:
+            return False
+
+    def _view(self, entry: dict) -> np.ndarray:
+        shape = tuple(entry["shape"])
+        start = self._base + entry["offset"]
+        return self._data[start:start + int(np.prod(shape))].reshape(shape)
+
+    def pixels(self, name: str) -> np.ndarray:
+        """(h, w, 4) uint8 RGBA, sans copie"""
+        return self._view(self.sprites[name]["pixels"])
+
+    def size(self, name: str) -> Size:
+        w, h = self.sprites[name]["size"]
+        return w, h
+
+    def hitbox(self, name: str) -> Rect:
+        dx, dy, w, h = self.sprites[name]["hitbox"]
+        return dx, dy, w, h
+
+    def mask(self, name: str) -> Optional[np.ndarray]:
+        """Masque (h, w) booléen (alpha > 0) si le cache a été construit avec --masks"""
+        entry = self.sprites[name].get("mask")
+        if entry is None:
+            return None
+        w = self.size(name)[0]
+        return np.unpackbits(self._view(entry), axis=1, count=w).astype(bool)
+
+    def geometry(self) -> SpriteGeometry:
+        size = self.size
+        return SpriteGeometry(
+            dino_run=(size("DinoRun1"), size("DinoRun2")),
+            dino_duck=(size("DinoDuck1"), size("DinoDuck2")),
+            dino_jump=size("DinoJump"),
+            cacti=tuple(size(n) for n in LARGE_CACTI + SMALL_CACTI),
+            birds=tuple(size(n) for n in BIRDS),
+            cloud=size("Cloud"),
+        )
+
+    def surface(self, name: str, convert: bool = False):
+        """Surface pygame qui lit directement les pixels mappés (copie seulement si convert)"""
+        import pygame
+
+        surf = pygame.image.frombuffer(self.pixels(name), self.size(name), "RGBA")
+        return surf.convert_alpha() if convert else surf
+
+    def game_assets(self, convert: bool = False):
+        """Même GameAssets que load_assets(); convert=True exige un mode vidéo (rendu)"""
+        from .assets import GameAssets
+
+        s = lambda name: self.surface(name, convert)  # noqa: E731
+        return GameAssets(
+            dino_run1=s("DinoRun1"),
+            dino_run2=s("DinoRun2"),
+            dino_jump=s("DinoJump"),
+            dino_duck1=s("DinoDuck1"),
+            dino_duck2=s("DinoDuck2"),
+            cacti=[s(n) for n in LARGE_CACTI + SMALL_CACTI],
+            birds=[s(n) for n in BIRDS],
+            track=s("Track"),
+            cloud=s("Cloud"),
+            game_over=s("GameOver"),
+            reset=s("Reset"),
+        )
+
+
+def open_asset_cache(assets_dir: str, path: Optional[str] = None) -> Optional[AssetCache]:
+    """Cache à jour pour assets_dir, ou None (absent, illisible ou périmé)"""
+    path = path or default_cache_path(assets_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        cache = AssetCache(path)
+    except (ValueError, OSError, KeyError):
+        return None
+    return cache if cache.fresh(assets_dir) else None
+
+
+def main() -> None:
+    from .headless import ASSETS_DIR
+
+    p = argparse.ArgumentParser("Construire le cache des sprites")
+    p.add_argument("--assets", type=str, default=ASSETS_DIR)
+    p.add_argument("--out", type=str, default=None, help=f"Défaut: <assets>/{CACHE_FILE}")
+    p.add_argument("--masks", action="store_true", help="Inclure les masques de collision (alpha > 0)")
+    a = p.parse_args()
+    path = build_asset_cache(a.assets, a.out, masks=a.masks)
+    print(f"Asset cache: {path} ({os.path.getsize(path) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
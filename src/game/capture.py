@@ -0,0 +1,241 @@
+"""Capture vidéo du Renderer sans bloquer la boucle de jeu.
+
+Renderer.draw() copie les pixels 32 bits de l'écran (vue surfarray, une seule
+copie ligne à ligne) dans un anneau de tampons NumPy en mémoire partagée; un
+processus encodeur extrait le RGB, encode et rend le tampon à l'anneau.
+Sortie selon l'extension:
+
+- .zip: une image PNG par frame (sans perte) + capture.json (fps, taille)
+- .mp4 / .gif / .webm / .mkv: flux RGB envoyé à ffmpeg (doit être dans le PATH)
+
+Fonctionne avec SDL_VIDEODRIVER=dummy (aucune fenêtre requise):
+SDL_VIDEODRIVER=dummy python -m src.main --play --model models/runs/<run>/best --render 1 --capture demo.zip
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing as mp
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import time
+import zipfile
+import zlib
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+CAPTURE_RING = 32  # tampons de frame en vol entre le jeu et l'encodeur
+FFMPEG_EXTS = (".mp4", ".gif", ".webm", ".mkv")
+PNG_LEVEL = 3  # zlib: 2x plus rapide que le niveau 6 de pygame.image.save, ~1.5x plus gros
+
+
+def _png_bytes(rgb: np.ndarray, level: int = PNG_LEVEL) -> bytes:
+    """PNG RGB 8 bits (filtre None), sans passer par SDL_image"""
+    h, w, _ = rgb.shape
+    raw = np.empty((h, 1 + 3 * w), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = rgb.reshape(h, 3 * w)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), level)) + chunk(b"IEND", b""))
+
+
+def _rgb_index(surface) -> Tuple[int, int, int]:
+    """Octets R, G, B d'un pixel 32 bits de `surface` (vu comme 4 x uint8)"""
+    idx = [shift // 8 for shift in surface.get_shifts()[:3]]
+    return tuple(i if sys.byteorder == "little" else 3 - i for i in idx)
+
+
+class _ZipPngWriter:
+    def __init__(self, path: str, shape: Tuple[int, int, int], fps: float):
+        self.tmp = f"{path}.tmp{os.getpid()}"
+        self.path = path
+        self.zf = zipfile.ZipFile(self.tmp, "w", compression=zipfile.ZIP_STORED)  # PNG déjà compressé
+        self.shape = shape
+        self.fps = fps
+        self.n = 0
+
+    def write(self, frame: np.ndarray) -> None:
+        self.zf.writestr(f"frame_{self.n:06d}.png", _png_bytes(frame))
+        self.n += 1
+
+    def close(self) -> None:
+        h, w, _ = self.shape
+        self.zf.writestr("capture.json", json.dumps({"frames": self.n, "fps": self.fps, "width": w, "height": h}))
+        self.zf.close()
+        os.replace(self.tmp, self.path)
+
+
+class _FfmpegWriter:
+    def __init__(self, path: str, shape: Tuple[int, int, int], fps: float):
+        h, w, _ = self.shape = shape
+        cmd = ["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}",
+               "-r", f"{fps:g}", "-i", "-"]
+        if path.endswith(".mp4"):
+            cmd += ["-pix_fmt", "yuv420p"]
+        self.proc = subprocess.Popen(cmd + [path], stdin=subprocess.PIPE)
+        self.n = 0
+
+    def write(self, frame: np.ndarray) -> None:
+        self.proc.stdin.write(np.ascontiguousarray(frame).data)
+        self.n += 1
+
+    def close(self) -> None:
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with code {self.proc.returncode}")
+
+
+def _open_writer(path: str, shape: Tuple[int, int, int], fps: float):
+    if path.lower().endswith(FFMPEG_EXTS):
+        return _FfmpegWriter(path, shape, fps)
+    return _ZipPngWriter(path, shape, fps)
+
+
+def _encoder_main(shm_name: str, ring: int, shape, path: str, fps: float, todo, free, done) -> None:
+    """Processus encodeur: todo -> (slot) encodé -> slot rendu via free; None pour finir"""
+    h, w = shape
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        frames = np.ndarray((ring, h, w), dtype=np.uint32, buffer=shm.buf)
+        writer = _open_writer(path, (h, w, 3), fps)
+        t_enc = 0.0
+        while True:
+            item = todo.get()
+            if item is None:
+                break
+            slot, rgb = item
+            t0 = time.perf_counter()
+            writer.write(frames[slot].view(np.uint8).reshape(h, w, 4)[..., list(rgb)])
+            t_enc += time.perf_counter() - t0
+            free.put(slot)
+        writer.close()
+        done.put((writer.n, t_enc))
+        del frames
+    finally:
+        shm.close()
+
+
+class FrameCapture:
+    """Anneau de `ring` frames (H, W) en pixels 32 bits, en mémoire partagée + processus encodeur.
+
+    grab() ne fait qu'une copie (sous-échantillonnée) de l'écran dans un tampon
+    libre. Si l'encodeur a pris du retard: en `block=False` la frame est perdue
+    (comptée dans dropped) pour ne pas ralentir le jeu; en `block=True` (rendu
+    non cadencé, personne ne regarde) on attend un tampon libre.
+    """
+
+    def __init__(self, path: str, size: Tuple[int, int], fps: float, every: int = 1, scale: int = 1,
+                 ring: int = CAPTURE_RING, block: bool = False):
+        if path.lower().endswith(FFMPEG_EXTS) and shutil.which("ffmpeg") is None:
+            raise RuntimeError(f"--capture {path} needs ffmpeg in PATH (use a .zip archive of PNG frames instead)")
+        self.every = max(1, int(every))
+        self.scale = max(1, int(scale))
+        self.block = block
+        w, h = size
+        self.shape = (-(-h // self.scale), -(-w // self.scale))
+        self.path = path
+        self.seen = 0
+        self.queued = 0
+        self.dropped = 0
+
+        ctx = mp.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=ring * int(np.prod(self.shape)) * 4)
+        self.frames = np.ndarray((ring,) + self.shape, dtype=np.uint32, buffer=self._shm.buf)
+        self._rgb: Optional[Tuple[int, int, int]] = None
+        self.last_slot: Optional[int] = None
+        self._todo, self._free, self._done = ctx.Queue(), ctx.Queue(), ctx.Queue()
+        self._slots = list(range(ring))  # tampons libres connus côté jeu
+        self._proc = ctx.Process(target=_encoder_main, daemon=True,
+                                 args=(self._shm.name, ring, self.shape, path, fps / self.every,
+                                       self._todo, self._free, self._done))
+        self._proc.start()
+
+    def _free_slot(self) -> Optional[int]:
+        while not self._slots:
+            try:
+                self._slots.append(self._free.get(timeout=1.0) if self.block else self._free.get_nowait())
+            except queue.Empty:
+                if not self.block:
+                    return None
+                self._check_alive()
+        # récupérer sans attendre les autres tampons déjà rendus
+        while True:
+            try:
+                self._slots.append(self._free.get_nowait())
+            except queue.Empty:
+                break
+        return self._slots.pop()
+
+    def _check_alive(self) -> None:
+        if self._proc.exitcode is not None:
+            raise RuntimeError(f"Capture encoder exited with code {self._proc.exitcode}")
+
+    def grab(self, surface) -> None:
+        """Copie `surface` (écran pygame) dans l'anneau, une frame sur `every`"""
+        import pygame
+
+        self.seen += 1
+        if (self.seen - 1) % self.every:
+            return
+        slot = self._free_slot()
+        if slot is None:
+            self.dropped += 1
+            return
+        if surface.get_bytesize() != 4:
+            surface = surface.convert(32)
+        if self._rgb is None:
+            self._rgb = _rgb_index(surface)
+        s = self.scale
+        view = pygame.surfarray.pixels2d(surface)  # (W, H) uint32, verrouille la surface
+        try:
+            # .T: lignes contiguës des deux côtés, copie au débit mémoire
+            np.copyto(self.frames[slot], view[::s, ::s].T)
+        finally:
+            del view
+        self._todo.put((slot, self._rgb))
+        self.last_slot = slot
+        self.queued += 1
+
+    def close(self) -> None:
+        """Attend la fin de l'encodage (frames en vol comprises)"""
+        if self._proc is None:
+            return
+        self._todo.put(None)
+        try:
+            while True:
+                alive = self._proc.is_alive()
+                try:
+                    n, t_enc = self._done.get(timeout=1.0)
+                    break
+                except queue.Empty:
+                    if not alive:
+                        self._check_alive()
+            self._proc.join()
+        finally:
+            self._proc = None
+            del self.frames
+            self._shm.close()
+            self._shm.unlink()
+        h, w = self.shape
+        lost = f", {self.dropped} perdues (encodeur en retard)" if self.dropped else ""
+        print(f"Capture: {self.path}  {n} frames {w}x{h}{lost}, encodage {1e3 * t_enc / max(n, 1):.1f} ms/frame")
+
+
+def capture_from_args(args, size: Tuple[int, int], fps: float, realtime: bool) -> Optional[FrameCapture]:
+    """FrameCapture selon --capture / --capture_every / --capture_scale, sinon None.
+
+    Rendu cadencé (realtime): frames perdues plutôt que de ralentir; sinon l'encodeur donne le rythme.
+    """
+    if not getattr(args, "capture", None):
+        return None
+    return FrameCapture(args.capture, size, fps, every=args.capture_every, scale=args.capture_scale,
+                        block=not realtime)
@@ -0,0 +1,30 @@
+import time
+
+
+class SimClock:
+    """Horloge de simulation à pas fixe: tick() renvoie toujours dt = 1/fps.
+
+    La physique ne dépend donc plus du temps réel (parties rejouables à
+    l'identique). Sans realtime, aucune attente: la simulation tourne à la
+    vitesse du CPU. Avec realtime, tick() dort pour tenir fps images/s (humain
+    qui regarde ou qui joue), sans changer dt.
+    """
+
+    def __init__(self, fps: int = 60, realtime: bool = False):
+        self.fps = fps
+        self.dt = 1.0 / fps
+        self.realtime = realtime
+        self.frames = 0
+        self._deadline = None
+
+    def tick(self) -> float:
+        self.frames += 1
+        if self.realtime:
+            now = time.perf_counter()
+            if self._deadline is None or now - self._deadline > self.dt:
+                # premier tick, ou trop en retard: on ne rattrape pas
+                self._deadline = now
+            elif self._deadline > now:
+                time.sleep(self._deadline - now)
+            self._deadline += self.dt
+        return self.dt
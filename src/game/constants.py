@@ -1,6 +1,7 @@
 # Gameplay defaults (non-parametres): utilise les args CLI pour le reste.
 
 GROUND_Y = 310  # position top-left du dino sur le sol (comme le jeu original)
+TRACK_Y = 380  # haut de la piste (sprite du sol)
 
 # Couleurs (rendu)
 BG_COLOR = (255, 255, 255)
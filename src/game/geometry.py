@@ -0,0 +1,97 @@
+"""Géométrie des sprites et règles de hitbox, sans pygame.
+
+Les tailles sont lues dans l'en-tête IHDR des PNG (pas de décodage), ce qui
+permet au moteur headless de calculer les collisions sans SDL.
+"""
+import os
+import struct
+from dataclasses import dataclass
+from typing import Tuple
+
+Size = Tuple[int, int]
+Rect = Tuple[int, int, int, int]  # (left, top, width, height)
+
+# Dino: hitbox réduite de 10 px de chaque côté, 10 px en haut (bas aligné)
+DINO_X = 80
+DINO_SHRINK = (20, 10)
+DINO_DUCK_OFFSET = 30  # Y_POS_DUCK - Y_POS
+
+# Obstacles (positions du jeu original)
+CACTUS_Y_LARGE = 300
+CACTUS_Y_SMALL = 325
+N_LARGE_CACTI = 3  # assets.cacti = 3 LargeCactus puis 3 SmallCactus
+N_SMALL_CACTI = 3
+BIRD_HEIGHTS = (200, 280, 340)
+BIRD_SHRINK = 20
+BONUS_SIZE = 32
+BONUS_Y_OFFSETS = (20, 120)  # au-dessus de ground_y: bas / haut
+
+SPAWN_MARGIN = 100  # les obstacles apparaissent à width + SPAWN_MARGIN
+
+DINO_ANIM_SPEED = 0.1
+BIRD_ANIM_SPEED = 0.15
+
+
+@dataclass(frozen=True)
+class SpriteGeometry:
+    dino_run: Tuple[Size, Size]
+    dino_duck: Tuple[Size, Size]
+    dino_jump: Size
+    cacti: Tuple[Size, ...]
+    birds: Tuple[Size, ...]
+    cloud: Size
+
+
+def png_size(path: str) -> Size:
+    with open(path, "rb") as f:
+        head = f.read(24)
+    if head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        raise ValueError(f"Not a PNG file: {path}")
+    w, h = struct.unpack(">II", head[16:24])
+    return int(w), int(h)
+
+
+def load_geometry(assets_dir: str) -> SpriteGeometry:
+    def size(name: str) -> Size:
+        return png_size(os.path.join(assets_dir, name))
+
+    return SpriteGeometry(
+        dino_run=(size("DinoRun1.png"), size("DinoRun2.png")),
+        dino_duck=(size("DinoDuck1.png"), size("DinoDuck2.png")),
+        dino_jump=size("DinoJump.png"),
+        cacti=tuple(size(f"LargeCactus{i}.png") for i in (1, 2, 3)) + tuple(size(f"SmallCactus{i}.png") for i in (1, 2, 3)),
+        birds=(size("Bird1.png"), size("Bird2.png")),
+        cloud=size("Cloud.png"),
+    )
+
+
+def geometry_from_assets(assets) -> SpriteGeometry:
+    return SpriteGeometry(
+        dino_run=(assets.dino_run1.get_size(), assets.dino_run2.get_size()),
+        dino_duck=(assets.dino_duck1.get_size(), assets.dino_duck2.get_size()),
+        dino_jump=assets.dino_jump.get_size(),
+        cacti=tuple(s.get_size() for s in assets.cacti),
+        birds=tuple(s.get_size() for s in assets.birds),
+        cloud=assets.cloud.get_size(),
+    )
+
+
+def cactus_shrink(width: int, is_large: bool) -> int:
+    if not is_large:
+        return 0  # Pas de réduction pour les petits cactus (déjà étroits)
+    # Très permissif pour les grands cactus à 3 segments
+    return 30 if width >= 75 else 13
+
+
+def bonus_y(ground_y: int, variant: int) -> int:
+    return ground_y - BONUS_Y_OFFSETS[variant]
+
+
+def shrunk_rect(x: float, y: float, w: int, h: int, shrink_w: int, shrink_h: int) -> Rect:
+    """Equivalent de Rect(x, y, w, h).inflate(-shrink_w, -shrink_h) avec le bas réaligné."""
+    return int(x) + shrink_w // 2, int(y) + shrink_h, w - shrink_w, h - shrink_h
+
+
+def rects_overlap(a: Rect, b: Rect) -> bool:
+    """Même test que pygame.Rect.colliderect pour des tailles positives."""
+    return a[0] < b[0] + b[2] and a[1] < b[1] + b[3] and a[0] + a[2] > b[0] and a[1] + a[3] > b[1]
@@ -0,0 +1,256 @@
+"""Moteur de simulation headless: même physique et mêmes collisions que World,
+sans pygame ni état cosmétique (nuages).
+
+Les hitbox sont calculées à partir des tailles de sprites (geometry.py) avec
+les mêmes règles de réduction que Dino/Obstacle, en tuples d'entiers au lieu de
+pygame.Rect. Les timers d'animation sont conservés: la taille du sprite courant
+(course 1/2, oiseau 1/2) change la hitbox, donc l'issue de la partie.
+"""
+import os
+from typing import List, Optional
+
+from .constants import GROUND_Y
+from .dino import DinoBody
+from .geometry import (
+    BIRD_ANIM_SPEED, BIRD_HEIGHTS, BIRD_SHRINK, BONUS_SIZE, CACTUS_Y_LARGE, CACTUS_Y_SMALL, DINO_SHRINK, DINO_X,
+    SpriteGeometry, bonus_y, cactus_shrink, geometry_from_assets, load_geometry, rects_overlap, shrunk_rect,
+)
+from .obstacles import ObstacleKind, ObstacleState
+from .pool import EntityPool
+from .spawner import Spawner, SpawnSpec
+from .world import WorldInfo
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "assets")
+
+
+def default_geometry(assets=None) -> SpriteGeometry:
+    if assets is not None:
+        return geometry_from_assets(assets)
+    from .asset_cache import open_asset_cache
+
+    cache = open_asset_cache(ASSETS_DIR)
+    if cache is not None:
+        return cache.geometry()
+    return load_geometry(ASSETS_DIR)
+
+
+class HeadlessDino(DinoBody):
+    def __init__(self, x: int, ground_y: int, jump_vel: float, gravity: float, geometry: SpriteGeometry):
+        super().__init__(x, ground_y, jump_vel, gravity)
+        self.size_run = geometry.dino_run
+        self.size_duck = geometry.dino_duck
+        self.size_jump = geometry.dino_jump
+        w, h = self.size_run[0]
+        self.rect = (int(self.x), int(self.y), w, h)
+
+    def update(self, dt: float) -> None:
+        self._move(dt)
+        w, h = self.size()
+        self.rect = shrunk_rect(self.x, self.y, w, h, DINO_SHRINK[0], DINO_SHRINK[1])
+
+    def size(self):
+        if not self.on_ground:
+            return self.size_jump
+        if self.is_ducking:
+            return self.size_duck[self.anim_frame]
+        return self.size_run[self.anim_frame]
+
+
+class HeadlessObstacle:
+    __slots__ = ("x", "y", "sizes", "kind", "shrink", "passed", "anim_frame", "anim_timer", "rect")
+    collected = False
+
+    def __init__(self, x: float, y: float, sizes, kind: ObstacleKind, shrink_hitbox: int = 0):
+        self.setup(x, y, sizes, kind, shrink_hitbox)
+
+    def setup(self, x: float, y: float, sizes, kind: ObstacleKind, shrink_hitbox: int = 0) -> "HeadlessObstacle":
+        self.x = float(x)
+        self.y = float(y)
+        self.sizes = sizes
+        self.kind = kind
+        self.shrink = shrink_hitbox
+        self.passed = False
+        self.anim_frame = 0
+        self.anim_timer = 0.0
+        self.rect = self._hitbox()
+        return self
+
+    def _hitbox(self):
+        w, h = self.sizes[self.anim_frame]
+        return shrunk_rect(self.x, self.y, w, h, 2 * self.shrink, self.shrink)
+
+    def update(self, speed: float, dt: float) -> None:
+        k = min(1.0, dt * 60.0)
+        self.x -= speed * k
+        # hitbox du sprite courant, avant d'avancer l'animation (comme Obstacle)
+        self.rect = self._hitbox()
+        if self.kind == "bird" and len(self.sizes) > 1:
+            self.anim_timer += dt
+            if self.anim_timer >= BIRD_ANIM_SPEED:
+                self.anim_timer = 0.0
+                self.anim_frame = (self.anim_frame + 1) % len(self.sizes)
+
+    def offscreen(self) -> bool:
+        return self.x + self.rect[2] < 0
+
+    def state(self) -> ObstacleState:
+        kind_id = 0 if self.kind == "cactus" else 1 if self.kind == "bird" else 2
+        return ObstacleState(x=self.x, y=self.y, w=self.rect[2], h=self.rect[3], kind=kind_id)
+
+
+class HeadlessBonus:
+    __slots__ = ("x", "y", "size", "rect", "collected", "passed")
+    kind = "bonus"
+
+    def __init__(self, x: float, y: int, size: int = BONUS_SIZE):
+        self.setup(x, y, size)
+
+    def setup(self, x: float, y: int, size: int = BONUS_SIZE) -> "HeadlessBonus":
+        self.x = x
+        self.y = y
+        self.size = size
+        self.rect = (int(x), int(y), size, size)
+        self.collected = False
+        self.passed = False
+        return self
+
+    def update(self, speed: float, dt: float) -> None:
+        k = min(1.0, dt * 60.0)
+        self.x -= speed * k
+        self.rect = (int(self.x), self.rect[1], self.size, self.size)
+
+    def offscreen(self) -> bool:
+        return self.x + self.size < 0
+
+    def state(self) -> ObstacleState:
+        return ObstacleState(x=self.x, y=self.y, w=self.size, h=self.size, kind=2)
+
+
+class HeadlessWorld:
+    """Même interface que World (reset/step/make_obstacle), pour l'entraînement sans rendu."""
+
+    def __init__(self, width: int, height: int, geometry: SpriteGeometry, spawner: Spawner,
+                 base_speed: float, max_speed: float,
+                 gravity: float, jump_vel: float, acceleration: float = 0.001):
+        self.width = width
+        self.height = height
+        self.geometry = geometry
+        self.spawner = spawner
+
+        self.base_speed = float(base_speed)
+        self.max_speed = float(max_speed)
+        self.acceleration = float(acceleration)
+        self.gravity = float(gravity)
+        self.jump_vel = float(jump_vel)
+        self.ground_y = GROUND_Y
+
+        self.dino: HeadlessDino
+        self.obstacles: List = []
+        self.score = 0.0
+        self.speed = self.base_speed
+        self.distance = 0.0
+        self.last_bonus_collected = False
+        self.pool = EntityPool()
+        self.info = WorldInfo(score=0.0, speed=self.speed, distance=0.0)
+        self.passed_by_kind = {"cactus": 0, "bird": 0, "bonus": 0}
+        self.killed_by: Optional[str] = None
+
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        self.score = 0.0
+        self.speed = self.base_speed
+        self.distance = 0.0
+        self.dino = HeadlessDino(DINO_X, self.ground_y, self.jump_vel, self.gravity, self.geometry)
+        self.passed_by_kind = dict.fromkeys(self.passed_by_kind, 0)
+        self.killed_by = None
+        self.pool.release_all(self.obstacles)
+        self.obstacles = []
+        self.spawner.reset(self, seed)
+
+    def make_obstacle(self, spec: SpawnSpec, x: float):
+        if spec.kind == "bird":
+            y = BIRD_HEIGHTS[spec.variant % 3]
+            return self.pool.acquire(HeadlessObstacle).setup(x, y, self.geometry.birds, "bird", BIRD_SHRINK)
+        if spec.kind == "bonus":
+            return self.pool.acquire(HeadlessBonus).setup(x, bonus_y(self.ground_y, spec.variant))
+        size = self.geometry.cacti[spec.variant]
+        is_large = spec.kind == "cactus_large"
+        y = CACTUS_Y_LARGE if is_large else CACTUS_Y_SMALL
+        return self.pool.acquire(HeadlessObstacle).setup(x, y, (size,), "cactus", cactus_shrink(size[0], is_large))
+
+    def _advance_obstacles(self, dt: float) -> bool:
+        """Même passe unique que World._advance_obstacles, sur des tuples."""
+        dino = self.dino
+        drect = dino.rect
+        d_left, d_right, dino_x = drect[0], drect[0] + drect[2], dino.x
+        speed = self.speed
+        obstacles = self.obstacles
+
+        done = False
+        self.last_bonus_collected = False
+        head = 0
+        stray = None
+        near = True
+        for i, ob in enumerate(obstacles):
+            ob.update(speed, dt)
+            rect = ob.rect
+            right = ob.x + rect[2]
+            if right < dino_x and not ob.passed:
+                ob.passed = True
+                self.passed_by_kind[ob.kind] += 1
+            if right < 0 or ob.collected:
+                if i == head:
+                    head += 1
+                else:
+                    stray = stray or []
+                    stray.append(ob)
+                continue
+            if near and ob.x >= d_right:
+                near = False
+            if not near or rect[0] + rect[2] <= d_left or not rects_overlap(drect, rect):
+                continue
+            if ob.kind == "bonus" and not self.last_bonus_collected:
+                ob.collected = True
+                self.score += 10
+                self.last_bonus_collected = True
+            else:
+                done = True
+                self.killed_by = ob.kind
+
+        pool = self.pool
+        if stray:
+            pool.release_all(stray)
+            self.obstacles = [ob for ob in obstacles[head:] if not any(ob is s for s in stray)]
+        if head:
+            for i in range(head):
+                pool.release(obstacles[i])
+            if not stray:
+                del obstacles[:head]
+        return done
+
+    def step(self, action: int, dt: float) -> tuple[bool, WorldInfo]:
+        dino = self.dino
+        if action == 1:
+            dino.jump()
+        elif action == 2:
+            dino.duck()
+        else:
+            dino.stand()
+
+        k = min(1.0, dt * 60.0)
+        self.speed = min(self.max_speed, self.speed + (self.acceleration * k))
+        self.distance += self.speed * k
+        self.score = round(self.distance * 0.025)
+
+        dino.update(dt)
+        self.spawner.update(self)
+
+        done = self._advance_obstacles(dt)
+
+        info = self.info
+        info.score = self.score
+        info.speed = self.speed
+        info.distance = self.distance
+        info.bonus_collected = self.last_bonus_collected
+        return done, info
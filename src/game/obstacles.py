@@ -1,7 +1,14 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import List, Literal, Optional
+from typing import TYPE_CHECKING, List, Literal, Optional
+
+from .geometry import BIRD_ANIM_SPEED, BIRD_HEIGHTS, BIRD_SHRINK, BONUS_SIZE, CACTUS_Y_LARGE, CACTUS_Y_SMALL, cactus_shrink
 
-import pygame
+from .pool import EntityPool
+
+if TYPE_CHECKING:
+    import pygame
 
 
 ObstacleKind = Literal["cactus", "bird", "bonus"]
@@ -9,6 +16,7 @@ ObstacleKind = Literal["cactus", "bird", "bonus"]
 
 @dataclass
 class ObstacleState:
+    __slots__ = ("x", "y", "w", "h", "kind")
     x: float
     y: float
     w: int
@@ -17,8 +25,17 @@ class ObstacleState:
 
 
 class Obstacle:
+    __slots__ = ("x", "y", "sprite", "sprites", "kind", "shrink", "passed", "rect", "_hitbox_sprite",
+                 "anim_frame", "anim_timer", "anim_speed")
+    collected = False  # seuls les bonus se collectent
+
     def __init__(self, x: float, y: float, sprite: pygame.Surface, kind: ObstacleKind, 
                  sprites: Optional[List[pygame.Surface]] = None, shrink_hitbox: int = 0):
+        self.setup(x, y, sprite, kind, sprites, shrink_hitbox)
+
+    def setup(self, x: float, y: float, sprite: pygame.Surface, kind: ObstacleKind,
+              sprites: Optional[List[pygame.Surface]] = None, shrink_hitbox: int = 0) -> Obstacle:
+        """(Ré)initialise l'obstacle; utilisé par __init__ et par EntityPool"""
         self.x = float(x)
         self.y = float(y)
         self.sprite = sprite
@@ -30,18 +47,25 @@ class Obstacle:
         full_rect = sprite.get_rect(topleft=(int(self.x), int(self.y)))
         self.rect = full_rect.inflate(-shrink_hitbox * 2, -shrink_hitbox)  # réduit largeur et hauteur
         self.rect.bottom = full_rect.bottom  # garde le bas aligné
+        self._hitbox_sprite = sprite  # sprite dont self.rect a les dimensions
         
         # Animation
         self.anim_frame = 0
         self.anim_timer = 0.0
-        self.anim_speed = 0.15  # secondes entre frames 
+        self.anim_speed = BIRD_ANIM_SPEED  # secondes entre frames
+        return self
 
     def update(self, speed: float, dt: float) -> None:
         k = min(1.0, dt * 60.0)  # Plafonne k pour stabilité
         self.x -= speed * k
-        full_rect = self.sprite.get_rect(topleft=(int(self.x), int(self.y)))
-        self.rect = full_rect.inflate(-self.shrink * 2, -self.shrink)
-        self.rect.bottom = full_rect.bottom
+        if self.sprite is self._hitbox_sprite:
+            # Même sprite: seule la position change (inflate décale x de shrink)
+            self.rect.x = int(self.x) + self.shrink
+        else:
+            full_rect = self.sprite.get_rect(topleft=(int(self.x), int(self.y)))
+            self.rect = full_rect.inflate(-self.shrink * 2, -self.shrink)
+            self.rect.bottom = full_rect.bottom
+            self._hitbox_sprite = self.sprite
         
         # Animation pour les oiseaux
         if self.kind == "bird" and len(self.sprites) > 1:
@@ -59,26 +83,68 @@ class Obstacle:
         return ObstacleState(x=self.x, y=self.y, w=self.rect.width, h=self.rect.height, kind=kind_id)
 
 
-def make_cactus(x: float, ground_y: int, sprite: pygame.Surface, is_large: bool = True) -> Obstacle:
+def _obstacle(pool: Optional[EntityPool], cls):
+    return pool.acquire(cls) if pool is not None else cls.__new__(cls)
+
+
+def make_cactus(x: float, ground_y: int, sprite: pygame.Surface, is_large: bool = True,
+                pool: Optional[EntityPool] = None) -> Obstacle:
     # Positions comme le jeu original: LargeCactus Y=300, SmallCactus Y=325
-    if is_large:
-        y = 300
-        # Si le sprite est le plus large (3 segments), shrink plus fort
-        if sprite.get_width() >= 75:
-            shrink = 30  # Très permissif pour les grands cactus à 3 segments
-        else:
-            shrink = 13  # Légère réduction pour les autres gros cactus
-    else:
-        y = 325
-        shrink = 0  # Pas de réduction pour les petits cactus (déjà étroits)
-    return Obstacle(x=x, y=y, sprite=sprite, kind="cactus", shrink_hitbox=shrink)
+    y = CACTUS_Y_LARGE if is_large else CACTUS_Y_SMALL
+    # Si le sprite est le plus large (3 segments), shrink plus fort
+    shrink = cactus_shrink(sprite.get_width(), is_large)
+    return _obstacle(pool, Obstacle).setup(x=x, y=y, sprite=sprite, kind="cactus", shrink_hitbox=shrink)
 
 
-def make_bird(x: float, ground_y: int, sprites: List[pygame.Surface], height_mode: int = 0) -> Obstacle:
+def make_bird(x: float, ground_y: int, sprites: List[pygame.Surface], height_mode: int = 0,
+              pool: Optional[EntityPool] = None) -> Obstacle:
     # Hauteurs des oiseaux comme le jeu Chrome:
     # - Haut (mode 0): y=200 - Passer dessous, impossible à sauter
     # - Moyen (mode 1): y=280 - Se baisser ou passer dessous
     # - Bas (mode 2): y=340 - SAUTER par-dessus (vole au niveau du sol)
-    bird_heights = [200, 280, 340]
-    y = bird_heights[height_mode % 3]
-    return Obstacle(x=x, y=y, sprite=sprites[0], kind="bird", sprites=sprites, shrink_hitbox=20)
+    y = BIRD_HEIGHTS[height_mode % 3]
+    return _obstacle(pool, Obstacle).setup(x=x, y=y, sprite=sprites[0], kind="bird", sprites=sprites,
+                                           shrink_hitbox=BIRD_SHRINK)
+
+
+class Bonus:
+    """Bonus = obstacle spécial (rond doré) à collecter"""
+    __slots__ = ("x", "y", "size", "rect", "collected", "passed")
+    kind = "bonus"
+
+    def __init__(self, x: float, y: int, size: int = BONUS_SIZE):
+        self.setup(x, y, size)
+
+    def setup(self, x: float, y: int, size: int = BONUS_SIZE) -> Bonus:
+        import pygame
+
+        self.x = x
+        self.y = y
+        self.size = size
+        self.rect = pygame.Rect(self.x, self.y, self.size, self.size)
+        self.collected = False
+        self.passed = False
+        return self
+
+    def update(self, speed: float, dt: float) -> None:
+        k = min(1.0, dt * 60.0)  # Plafonne k pour stabilité
+        self.x -= speed * k
+        self.rect.x = int(self.x)
+
+    def draw(self, surface: pygame.Surface) -> pygame.Rect:
+        import pygame
+
+        color = (255, 215, 0)
+        center = (int(self.x + self.size // 2), int(self.y + self.size // 2))
+        radius = self.size // 2
+        return pygame.draw.circle(surface, color, center, radius)
+
+    def offscreen(self) -> bool:
+        return self.x + self.rect.width < 0
+
+    def state(self) -> ObstacleState:
+        return ObstacleState(x=self.x, y=self.y, w=self.size, h=self.size, kind=2)
+
+
+def make_bonus(x: float, y: int, pool: Optional[EntityPool] = None) -> Bonus:
+    return _obstacle(pool, Bonus).setup(x, y)
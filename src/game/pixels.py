@@ -0,0 +1,138 @@
+"""Observations en pixels: image du monde réduite en niveaux de gris + pile des k dernières images.
+
+Deux sources d'image (--pixel_source):
+- raster: les rectangles (hitbox) du dino et des obstacles sont remplis
+  directement à la résolution finale en NumPy. Marche avec les deux moteurs
+  (World et HeadlessWorld donnent la même image) et ne touche pas à SDL.
+- sprites: rendu des sprites dans une surface hors écran (moteur pygame),
+  réduite par pygame.transform.smoothscale puis lue sans copie par surfarray.
+
+Seule la bande de jeu (VIEW_Y, sous le ciel vide) est gardée, sur toute la largeur.
+"""
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+from .constants import BG_COLOR, TRACK_Y
+
+VIEW_Y = (80, 420)  # lignes gardées: sommet du saut .. bas de la piste
+
+# intensités du mode raster (fond noir): le type d'obstacle se lit dans la valeur
+_GROUND = 64
+_DINO = 255
+_KIND_VALUES = {"cactus": 200, "bird": 150, "bonus": 100}
+
+
+class FrameStack:
+    """Les k dernières images (H, W) uint8, lues comme une vue contiguë (k, H, W) sans copie.
+
+    Anneau de `slots` images suivi d'une copie de ses k-1 premières: la fenêtre
+    des k dernières est toujours d'un seul tenant. Une vue reste valable pendant
+    slots - k images poussées (assez pour garder obs et next_obs d'un step).
+    """
+
+    def __init__(self, k: int, shape: Tuple[int, int], slots: int = 0):
+        self.k = int(k)
+        self.slots = max(int(slots), 2 * self.k)
+        self.buf = np.zeros((self.slots + self.k - 1,) + tuple(shape), dtype=np.uint8)
+        self.t = -1  # index de la dernière image poussée
+
+    def next_frame(self) -> np.ndarray:
+        """Tampon où dessiner la prochaine image (à valider par push())"""
+        return self.buf[(self.t + 1) % self.slots]
+
+    def push(self) -> np.ndarray:
+        self.t += 1
+        i = self.t % self.slots
+        if i < self.k - 1:
+            self.buf[i + self.slots] = self.buf[i]
+        return self.view()
+
+    def fill(self) -> np.ndarray:
+        """Début d'épisode: la prochaine image (déjà dessinée) répétée k fois"""
+        first = self.next_frame()
+        self.push()
+        for _ in range(self.k - 1):
+            np.copyto(self.next_frame(), first)
+            self.push()
+        return self.view()
+
+    def view(self) -> np.ndarray:
+        s = (self.t - self.k + 1) % self.slots
+        return self.buf[s:s + self.k]
+
+
+class RasterView:
+    """Image size x size du monde, rectangles remplis en NumPy (pas de SDL)"""
+
+    def __init__(self, width: int, height: int, size: int):
+        self.size = int(size)
+        top, bottom = VIEW_Y
+        self.sx = self.size / float(width)
+        self.sy = self.size / float(bottom - top)
+        self.top = top
+        self.background = np.zeros((self.size, self.size), dtype=np.uint8)
+        self._fill(self.background, (0, TRACK_Y, width, 2), _GROUND)
+
+    def _fill(self, out: np.ndarray, rect, value: int) -> None:
+        x, y, w, h = rect
+        n = self.size
+        # au moins une case par objet visible, même plus petit qu'un pixel réduit
+        x0 = min(max(int(x * self.sx), 0), n)
+        x1 = min(max(int(math.ceil((x + w) * self.sx)), x0 + 1), n)
+        y0 = min(max(int((y - self.top) * self.sy), 0), n)
+        y1 = min(max(int(math.ceil((y + h - self.top) * self.sy)), y0 + 1), n)
+        out[y0:y1, x0:x1] = value
+
+    def draw(self, world, out: np.ndarray) -> None:
+        np.copyto(out, self.background)
+        for ob in world.obstacles:
+            self._fill(out, tuple(ob.rect), _KIND_VALUES[ob.kind])
+        self._fill(out, tuple(world.dino.rect), _DINO)
+
+
+class SpriteView:
+    """Sprites dessinés hors écran, réduits par smoothscale, puis niveaux de gris en NumPy"""
+
+    def __init__(self, width: int, height: int, size: int):
+        import pygame
+
+        self._pygame = pygame
+        self.size = int(size)
+        self.surface = pygame.Surface((width, height), depth=32)
+        top, bottom = VIEW_Y
+        self.view = self.surface.subsurface((0, top, width, bottom - top))
+        self.small = pygame.Surface((self.size, self.size), depth=32)
+        self.bg_color = BG_COLOR
+        self._weights = np.array([77, 150, 29], dtype=np.uint16)  # luminance (BT.601) sur 8 bits
+
+    def draw(self, world, out: np.ndarray) -> None:
+        pygame, surf = self._pygame, self.surface
+        # comme Renderer.draw, sans nuages ni HUD
+        surf.fill(self.bg_color)
+        track = world.assets.track
+        for tx in range(0, surf.get_width() + track.get_width(), track.get_width()):
+            surf.blit(track, (tx, TRACK_Y))
+        surf.blit(world.dino.sprite(), (int(world.dino.x), int(world.dino.y)))
+        for ob in world.obstacles:
+            if hasattr(ob, "sprite"):
+                surf.blit(ob.sprite, (int(ob.x), int(ob.y)))
+            elif hasattr(ob, "draw"):
+                ob.draw(surf)
+        pygame.transform.smoothscale(self.view, (self.size, self.size), self.small)
+        rgb = pygame.surfarray.pixels3d(self.small)  # (W, H, 3), vue sur la surface
+        try:
+            gray = rgb @ self._weights  # (W, H) uint16
+            np.right_shift(gray, 8, out=gray)
+            out[...] = gray.T
+        finally:
+            del rgb
+
+
+def make_view(source: str, width: int, height: int, size: int):
+    if source == "sprites":
+        return SpriteView(width, height, size)
+    return RasterView(width, height, size)
@@ -0,0 +1,29 @@
+from typing import Dict, List, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class EntityPool:
+    """Free-list d'entités réutilisables (obstacles, bonus, nuages), une liste par classe.
+
+    acquire() renvoie une instance non initialisée: l'appelant doit appeler sa
+    méthode setup(). Une entité relâchée peut être réutilisée au spawn suivant,
+    il ne faut donc pas garder de référence vers un obstacle sorti du monde.
+    """
+    __slots__ = ("_free",)
+
+    def __init__(self):
+        self._free: Dict[type, List] = {}
+
+    def acquire(self, cls: Type[T]) -> T:
+        free = self._free.get(cls)
+        if free:
+            return free.pop()
+        return cls.__new__(cls)
+
+    def release(self, entity) -> None:
+        self._free.setdefault(type(entity), []).append(entity)
+
+    def release_all(self, entities) -> None:
+        for entity in entities:
+            self.release(entity)
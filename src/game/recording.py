@@ -0,0 +1,244 @@
+"""Enregistrement compact d'épisodes et relecture déterministe.
+
+Un épisode tient en quelques Ko: la graine de sa bande de spawn (--spawn_tape),
+les paramètres du jeu, les actions de chaque frame en run-length encoding et
+quelques sommes de contrôle de l'état du monde. La relecture rejoue les actions
+dans un World neuf (pygame ou headless) et vérifie les sommes en chemin.
+
+python -m src.main --replay logs/runs/<run>/episodes [--replay_speed 4] [--replay_seek death]
+"""
+from __future__ import annotations
+
+import glob
+import json
+import os
+import zlib
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+RECORDING_FORMAT = 1
+CHECKSUM_EVERY = 600  # frames entre deux sommes de contrôle (10 s à 60 fps)
+
+# paramètres nécessaires pour reconstruire le monde à l'identique
+WORLD_KEYS = ("width", "height", "spawn_mode", "spawn_distance", "obstacles", "base_speed", "max_speed",
+              "gravity", "jump_vel", "acceleration", "fps")
+
+_KIND_IDS = {"cactus": 0, "bird": 1, "bonus": 2}
+
+
+def world_checksum(world) -> int:
+    """CRC32 de l'état observable (mêmes valeurs pour World et HeadlessWorld)"""
+    d = world.dino
+    values = [world.distance, world.speed, world.score, d.x, d.y, d.vy, float(d.on_ground), *tuple(d.rect)]
+    for ob in world.obstacles:
+        values += [_KIND_IDS[ob.kind], ob.x, ob.y]
+    return zlib.crc32(np.array(values, dtype=np.float64).tobytes())
+
+
+def rle_encode(actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    actions = np.asarray(actions)
+    if len(actions) == 0:
+        return np.zeros(0, dtype=np.uint8), np.zeros(0, dtype=np.uint32)
+    starts = np.flatnonzero(np.r_[True, actions[1:] != actions[:-1]])
+    runs = np.diff(np.r_[starts, len(actions)])
+    return actions[starts].astype(np.uint8), runs.astype(np.uint32)
+
+
+def rle_decode(values: np.ndarray, runs: np.ndarray) -> np.ndarray:
+    return np.repeat(values, runs)
+
+
+@dataclass
+class EpisodeRecording:
+    seed: int  # graine de la bande de spawn
+    world: dict  # WORLD_KEYS
+    values: np.ndarray  # actions (RLE)
+    runs: np.ndarray
+    checksums: List[Tuple[int, int]]  # (frame, crc) après la frame
+    score: float = 0.0
+    death_frame: Optional[int] = None  # index de la frame de collision
+    meta: dict = field(default_factory=dict)  # épisode, step d'entraînement...
+
+    @property
+    def frames(self) -> int:
+        return int(self.runs.sum())
+
+    def save(self, path: str) -> None:
+        header = {"format": RECORDING_FORMAT, "seed": self.seed, "world": self.world, "checksums": self.checksums,
+                  "score": self.score, "death_frame": self.death_frame, "meta": self.meta}
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, header=np.array(json.dumps(header)), values=self.values, runs=self.runs)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "EpisodeRecording":
+        with np.load(path) as data:
+            header = json.loads(str(data["header"]))
+            if header.get("format") != RECORDING_FORMAT:
+                raise ValueError(f"Unsupported episode recording format in {path}: {header.get('format')}")
+            values, runs = data["values"], data["runs"]
+        return cls(seed=int(header["seed"]), world=header["world"], values=values, runs=runs,
+                   checksums=[tuple(c) for c in header["checksums"]], score=header["score"],
+                   death_frame=header["death_frame"], meta=header.get("meta", {}))
+
+
+class EpisodeRecorder:
+    """Accumule les actions d'un épisode (RLE au fil de l'eau) et ses sommes de contrôle"""
+
+    def __init__(self, world_params: dict):
+        self.world_params = {k: world_params[k] for k in WORLD_KEYS}
+        self.seed: Optional[int] = None
+
+    def begin(self, seed: int) -> None:
+        self.seed = int(seed)
+        self.values: List[int] = []
+        self.runs: List[int] = []
+        self.checksums: List[Tuple[int, int]] = []
+        self.frame = 0
+        self.death_frame: Optional[int] = None
+
+    def record(self, action: int, world, done: bool) -> None:
+        if self.values and self.values[-1] == action:
+            self.runs[-1] += 1
+        else:
+            self.values.append(action)
+            self.runs.append(1)
+        self.frame += 1
+        if done and self.death_frame is None:
+            self.death_frame = self.frame - 1
+            self.checksums.append((self.frame - 1, world_checksum(world)))
+        elif self.frame % CHECKSUM_EVERY == 0:
+            self.checksums.append((self.frame - 1, world_checksum(world)))
+
+    def finish(self, world, meta: Optional[dict] = None) -> Optional[EpisodeRecording]:
+        if self.seed is None or self.frame == 0:
+            return None
+        if not self.checksums or self.checksums[-1][0] != self.frame - 1:
+            self.checksums.append((self.frame - 1, world_checksum(world)))
+        rec = EpisodeRecording(seed=self.seed, world=self.world_params, values=np.array(self.values, dtype=np.uint8),
+                               runs=np.array(self.runs, dtype=np.uint32), checksums=self.checksums,
+                               score=float(world.score), death_frame=self.death_frame, meta=dict(meta or {}))
+        self.seed = None
+        return rec
+
+
+class TopEpisodes:
+    """Garde dans out_dir les `keep` meilleurs épisodes (par score); les autres fichiers sont supprimés"""
+
+    def __init__(self, out_dir: str, keep: int):
+        self.out_dir = out_dir
+        self.keep = int(keep)
+        os.makedirs(out_dir, exist_ok=True)
+        self.kept: List[Tuple[float, str]] = sorted(
+            (EpisodeRecording.load(p).score, p) for p in glob.glob(os.path.join(out_dir, "*.npz")))
+
+    def offer(self, rec: EpisodeRecording, name: str) -> Optional[str]:
+        if len(self.kept) >= self.keep and rec.score <= self.kept[0][0]:
+            return None
+        path = os.path.join(self.out_dir, f"{name}_s{int(rec.score):05d}.npz")
+        rec.save(path)
+        self.kept.append((rec.score, path))
+        self.kept.sort()
+        while len(self.kept) > self.keep:
+            _, old = self.kept.pop(0)
+            if os.path.exists(old):
+                os.remove(old)
+        return path
+
+
+def build_replay_world(rec: EpisodeRecording, assets=None, engine: str = "pygame"):
+    import argparse
+
+    from .world import build_world
+
+    args = argparse.Namespace(**rec.world, engine=engine, spawn_tape=1, spawn_tape_file=None)
+    world = build_world(args, assets)
+    world.spawner.seed_next_episode(rec.seed)
+    world.reset()
+    return world
+
+
+class ReplayDesync(RuntimeError):
+    pass
+
+
+def replay_frames(rec: EpisodeRecording, world, start: int = 0):
+    """Rejoue l'épisode dans `world` (déjà reset sur la graine); yield l'index de frame à partir de `start`.
+
+    Les frames avant `start` sont jouées sans yield (avance rapide). Lève
+    ReplayDesync si une somme de contrôle ne correspond pas.
+    """
+    dt = 1.0 / rec.world["fps"]
+    checks = dict(rec.checksums)
+    for i, action in enumerate(rle_decode(rec.values, rec.runs)):
+        world.step(int(action), dt)
+        crc = checks.get(i)
+        if crc is not None and world_checksum(world) != crc:
+            raise ReplayDesync(f"Replay diverged from the recording at frame {i}")
+        if i >= start:
+            yield i
+
+
+def resolve_recording(path: str) -> str:
+    """Fichier, ou dossier d'épisodes: le meilleur score"""
+    if os.path.isdir(path):
+        files = glob.glob(os.path.join(path, "*.npz"))
+        if not files:
+            raise FileNotFoundError(f"No episode recording in {path}")
+        return max(files, key=lambda p: EpisodeRecording.load(p).score)
+    return path
+
+
+def replay(args) -> None:
+    """--replay: relecture dans le Renderer (ou vérification seule avec --render 0)"""
+    path = resolve_recording(args.replay)
+    rec = EpisodeRecording.load(path)
+    start = 0
+    if args.replay_seek == "death":
+        start = max(0, (rec.death_frame if rec.death_frame is not None else rec.frames - 1) - 2 * rec.world["fps"])
+    elif args.replay_seek:
+        start = int(args.replay_seek)
+    print(f"Replay: {path}  score={int(rec.score)}  frames={rec.frames}  "
+          f"mort={'frame ' + str(rec.death_frame) if rec.death_frame is not None else 'non'}")
+
+    if not args.render:
+        world = build_replay_world(rec, engine="headless")
+        for _ in replay_frames(rec, world):
+            pass
+        print(f"OK: {len(rec.checksums)} sommes de contrôle vérifiées, score rejoué={int(world.score)}")
+        return
+
+    from ..main import load_game_assets
+    from .capture import capture_from_args
+    from .renderer import Renderer
+
+    world = build_replay_world(rec, load_game_assets(args))
+    speed = max(args.replay_speed, 1e-3)
+    skip = max(1, int(round(speed)))  # frames simulées par image affichée
+    fps = int(round(rec.world["fps"] * min(speed, 1.0))) or 1
+    # capture seule (sans fenêtre): inutile d'attendre le temps réel
+    realtime = not (args.capture and os.environ.get("SDL_VIDEODRIVER") == "dummy")
+    renderer = Renderer(world.width, world.height, fps, realtime=realtime,
+                        capture=capture_from_args(args, (world.width, world.height), fps, realtime),
+                        dirty=bool(args.dirty_render))
+    last = start
+    try:
+        for i in replay_frames(rec, world, start):
+            last = i
+            if (i - start) % skip:
+                continue
+            if renderer.handle_events().quit:
+                return
+            renderer.draw(world, human_hint=f"Replay frame {i}/{rec.frames}")
+            renderer.tick()
+        # dernière image (game over si collision) pendant 2 s
+        for _ in range(2 * renderer.fps):
+            if renderer.handle_events().quit:
+                return
+            renderer.draw(world, game_over=rec.death_frame is not None and last >= rec.death_frame)
+            renderer.tick()
+    finally:
+        renderer.close()
@@ -1,10 +1,11 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, List, Optional
 import os
 
 import pygame
 
-from .constants import BG_COLOR, FG_COLOR
+from .clock import SimClock
+from .constants import BG_COLOR, FG_COLOR, TRACK_Y
 
 
 @dataclass
@@ -12,20 +13,34 @@ class RenderState:
     quit: bool = False
 
 
+
 class Renderer:
-    def __init__(self, width: int, height: int, fps: int):
+    """Rendu pygame. En mode `dirty` (--dirty_render 1), seules les zones qui changent sont redessinées:
+
+    fond + piste pré-composés en une surface, effacement des rectangles de
+    l'image précédente, HUD composé de glyphes en cache, puis
+    display.update(rectangles) au lieu d'un flip plein écran.
+    """
+
+    def __init__(self, width: int, height: int, fps: int, realtime: bool = True, capture=None, dirty: bool = False):
         pygame.init()
         # Centrer la fenêtre sur l'écran
         os.environ['SDL_VIDEO_CENTERED'] = '1'
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("T-Rex AI (Pygame)")
-        self.clock = pygame.time.Clock()
+        self.clock = SimClock(fps, realtime=realtime)
         self.fps = fps
         self.font = pygame.font.SysFont("arial", 20)
+        # FrameCapture (game/capture.py): copie de chaque image affichée, encodée à part
+        self.capture = capture
+        self.dirty = dirty
+        self._background: Optional[pygame.Surface] = None
+        self._prev_rects: Optional[List[pygame.Rect]] = None  # None: prochaine image en plein écran
+        self._glyphs: Dict[str, pygame.Surface] = {}
 
     def tick(self) -> float:
-        # dt seconds
-        return self.clock.tick(self.fps) / 1000.0
+        # dt fixe (1/fps), attente seulement en mode realtime
+        return self.clock.tick()
 
     def handle_events(self) -> RenderState:
         rs = RenderState(quit=False)
@@ -35,6 +50,10 @@ class Renderer:
         return rs
 
     def draw(self, world, human_hint: Optional[str] = None, game_over: bool = False) -> None:
+        if self.dirty and not game_over:
+            self._draw_dirty(world, human_hint)
+            return
+        self._prev_rects = None
         self.screen.fill(BG_COLOR)
 
         # Nuages (arrière-plan)
@@ -43,7 +62,7 @@ class Renderer:
 
         # Track (sol) à y=380 comme le jeu original
         track = world.assets.track
-        track_y = 380
+        track_y = TRACK_Y
         track_width = track.get_width()
         for tx in range(0, world.width + track_width, track_width):
             self.screen.blit(track, (tx, track_y))
@@ -85,7 +104,63 @@ class Renderer:
             text_y = reset_y + reset_img.get_height() + 20
             self.screen.blit(restart_text, (text_x, text_y))
 
+        if self.capture is not None:
+            self.capture.grab(self.screen)
         pygame.display.flip()
 
+    def _static_layer(self, world) -> pygame.Surface:
+        """Fond + bande de piste, composés une fois"""
+        if self._background is None:
+            bg = pygame.Surface(self.screen.get_size()).convert()
+            bg.fill(BG_COLOR)
+            track = world.assets.track
+            for tx in range(0, world.width + track.get_width(), track.get_width()):
+                bg.blit(track, (tx, TRACK_Y))
+            self._background = bg
+        return self._background
+
+    def _blit_text(self, text: str, pos) -> pygame.Rect:
+        """Texte du HUD glyphe par glyphe (un font.render par caractère, la première fois)"""
+        x, y = pos
+        rect = pygame.Rect(x, y, 0, 0)
+        for ch in text:
+            glyph = self._glyphs.get(ch)
+            if glyph is None:
+                glyph = self._glyphs[ch] = self.font.render(ch, True, FG_COLOR)
+            rect.union_ip(self.screen.blit(glyph, (x, y)))
+            x += glyph.get_width()
+        return rect
+
+    def _draw_dirty(self, world, human_hint: Optional[str]) -> None:
+        screen = self.screen
+        bg = self._static_layer(world)
+        if self._prev_rects is None:
+            screen.blit(bg, (0, 0))
+            erased = [screen.get_rect()]
+        else:
+            # l'écran redevient le fond là où l'image précédente a dessiné
+            for r in self._prev_rects:
+                screen.blit(bg, r, r)
+            erased = self._prev_rects
+
+        drawn = [screen.blit(cloud.image, (int(cloud.x), int(cloud.y))) for cloud in world.clouds]
+        drawn.append(screen.blit(world.dino.sprite(), (int(world.dino.x), int(world.dino.y))))
+        for ob in world.obstacles:
+            if hasattr(ob, "sprite"):
+                drawn.append(screen.blit(ob.sprite, (int(ob.x), int(ob.y))))
+            elif hasattr(ob, "draw"):
+                drawn.append(ob.draw(screen))
+        drawn.append(self._blit_text(f"Score: {int(world.score)}  Speed: {world.speed:.2f}", (10, 10)))
+        if human_hint:
+            drawn.append(self._blit_text(human_hint, (10, 35)))
+
+        if self.capture is not None:
+            self.capture.grab(screen)
+        pygame.display.update(erased + drawn)
+        self._prev_rects = drawn
+
     def close(self) -> None:
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
         pygame.quit()
@@ -0,0 +1,215 @@
+"""Bandes de spawn: la suite d'obstacles d'un épisode, tirée d'avance.
+
+Chaque épisode a son np.random.Generator (graine d'épisode): la suite
+(type, sprite / hauteur d'oiseau, écart avant le suivant) est générée par blocs
+de TAPE_CHUNK tirages vectorisés, puis lue avec un curseur. Le spawner ne
+touche plus au module `random` pendant l'épisode: deux envs d'un même
+processus ne se perturbent pas, et la course ne dépend que de la graine.
+
+python -m src.game.spawn_tape --seeds 0-99 --out tapes.npz [--spawn_mode ...]
+écrit les bandes d'une liste de graines; --spawn_tape_file les relit sans
+rien générer (les graines absentes du fichier sont générées).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .spawner import (_LARGE_CACTI, _SMALL_CACTI, RANDOM_GAP_MAX, RANDOM_GAP_MIN, SpawnConfig, Spawner, SpawnSpec,
+                      spawn_options)
+
+TAPE_KINDS = ("cactus_small", "cactus_large", "bird", "bonus")
+TAPE_CHUNK = 64  # tirages par bloc: la bande ne dépend pas de sa longueur
+TAPE_FORMAT = 1
+
+# par type de TAPE_KINDS: index de la 1re variante et nb de variantes (cacti, hauteurs d'oiseau, bonus bas/haut)
+_VARIANT_BASE = np.array([_SMALL_CACTI[0], _LARGE_CACTI[0], 0, 0], dtype=np.float64)
+_VARIANT_COUNT = np.array([len(_SMALL_CACTI), len(_LARGE_CACTI), 3, 2], dtype=np.float64)
+
+# SpawnSpec partagés (lecture seule): lire la bande n'alloue rien
+_SPECS = {(k, v): SpawnSpec(kind, v) for k, kind in enumerate(TAPE_KINDS) for v in range(8)}
+
+
+class SpawnTape:
+    """Suite d'obstacles d'un épisode: kind (index TAPE_KINDS), variant, gap (px avant le suivant)"""
+
+    def __init__(self, seed: int, cfg: SpawnConfig):
+        self.seed = int(seed)
+        self.cfg = cfg
+        self._rng = np.random.default_rng(self.seed)
+        self._options = np.array([TAPE_KINDS.index(k) for k in spawn_options(cfg.obstacle_types)], dtype=np.int8)
+        self.kind = np.empty(0, dtype=np.int8)
+        self.variant = np.empty(0, dtype=np.int8)
+        self.gap = np.empty(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def extend(self) -> None:
+        """Ajoute TAPE_CHUNK obstacles (un tirage NumPy par colonne)"""
+        rng, n = self._rng, TAPE_CHUNK
+        kind = self._options[rng.integers(len(self._options), size=n)]
+        # variante = premier index du type + floor(u * nb de variantes)
+        variant = (_VARIANT_BASE[kind] + rng.random(n) * _VARIANT_COUNT[kind]).astype(np.int8)
+        if self.cfg.mode == "random":
+            gap = rng.uniform(RANDOM_GAP_MIN, RANDOM_GAP_MAX, size=n).astype(np.float32)
+        else:
+            gap = np.full(n, float(self.cfg.spawn_distance_px), dtype=np.float32)
+        self._append(kind, variant, gap)
+
+    def _append(self, kind: np.ndarray, variant: np.ndarray, gap: np.ndarray) -> None:
+        if len(self.kind):
+            kind, variant, gap = (np.concatenate(p) for p in ((self.kind, kind), (self.variant, variant), (self.gap, gap)))
+        self.kind, self.variant, self.gap = kind, variant, gap
+
+    def ensure(self, n: int) -> None:
+        while len(self) < n:
+            self.extend()
+
+    @classmethod
+    def generate(cls, seed: int, cfg: SpawnConfig, length: int = TAPE_CHUNK) -> "SpawnTape":
+        tape = cls(seed, cfg)
+        tape.ensure(length)
+        return tape
+
+    @classmethod
+    def from_arrays(cls, seed: int, cfg: SpawnConfig, kind, variant, gap) -> "SpawnTape":
+        """Bande relue: les blocs suivants sont regénérés depuis la graine si l'épisode la dépasse"""
+        tape = cls(seed, cfg)
+        for _ in range(len(kind) // TAPE_CHUNK):
+            tape._skip_chunk()
+        tape._append(np.asarray(kind, dtype=np.int8), np.asarray(variant, dtype=np.int8),
+                     np.asarray(gap, dtype=np.float32))
+        return tape
+
+    def _skip_chunk(self) -> None:
+        # avance le générateur comme extend() sans rien garder
+        rng, n = self._rng, TAPE_CHUNK
+        rng.integers(len(self._options), size=n)
+        rng.random(n)
+        if self.cfg.mode == "random":
+            rng.uniform(RANDOM_GAP_MIN, RANDOM_GAP_MAX, size=n)
+
+
+def _config_dict(cfg: SpawnConfig) -> dict:
+    return {"mode": cfg.mode, "spawn_distance_px": cfg.spawn_distance_px, "obstacle_types": list(cfg.obstacle_types)}
+
+
+def save_tapes(path: str, tapes: List[SpawnTape]) -> None:
+    """Un .npz: graines, longueurs et colonnes [E, L] (L multiple de TAPE_CHUNK) + en-tête JSON"""
+    cfg = tapes[0].cfg
+    if any(_config_dict(t.cfg) != _config_dict(cfg) for t in tapes):
+        raise ValueError("All tapes of a file must share one spawn config")
+    length = max(len(t) for t in tapes)
+    kind = np.zeros((len(tapes), length), dtype=np.int8)
+    variant = np.zeros_like(kind)
+    gap = np.zeros((len(tapes), length), dtype=np.float32)
+    for i, t in enumerate(tapes):
+        kind[i, :len(t)] = t.kind
+        variant[i, :len(t)] = t.variant
+        gap[i, :len(t)] = t.gap
+    meta = {"format": TAPE_FORMAT, "chunk": TAPE_CHUNK, "config": _config_dict(cfg)}
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), seeds=np.array([t.seed for t in tapes], dtype=np.int64),
+                 lengths=np.array([len(t) for t in tapes], dtype=np.int64), kind=kind, variant=variant, gap=gap)
+    os.replace(tmp, path)
+
+
+def load_tapes(path: str, cfg: SpawnConfig) -> Dict[int, SpawnTape]:
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        if meta.get("format") != TAPE_FORMAT or meta.get("chunk") != TAPE_CHUNK:
+            raise ValueError(f"Unsupported spawn tape file {path}: {meta}")
+        if meta["config"] != _config_dict(cfg):
+            raise ValueError(f"Spawn tapes in {path} were made for {meta['config']}, not {_config_dict(cfg)}")
+        seeds, lengths = data["seeds"], data["lengths"]
+        kind, variant, gap = data["kind"], data["variant"], data["gap"]
+    return {int(s): SpawnTape.from_arrays(int(s), cfg, kind[i, :n], variant[i, :n], gap[i, :n])
+            for i, (s, n) in enumerate(zip(seeds, lengths))}
+
+
+class TapeSpawner(Spawner):
+    """Lit la bande de l'épisode; mêmes règles de spawn que Regular/RandomSpawner.
+
+    La graine d'épisode vient de seed_next_episode(), sinon d'un seul tirage du
+    module `random` au reset (donc reproductible après utils.set_seed).
+    """
+
+    def __init__(self, cfg: SpawnConfig, tapes: Optional[Dict[int, SpawnTape]] = None):
+        super().__init__(cfg)
+        self.tapes = tapes or {}
+        self.tape: Optional[SpawnTape] = None
+        self.cursor = 0
+        self.next_spawn_gap = 0.0
+        self._next_seed: Optional[int] = None
+
+    def seed_next_episode(self, seed: int) -> None:
+        self._next_seed = int(seed)
+
+    def reset(self, world, seed: Optional[int] = None) -> None:
+        if seed is None:
+            seed = self._next_seed if self._next_seed is not None else random.getrandbits(63)
+        self._next_seed = None
+        tape = self.tapes.get(seed)
+        self.tape = tape if tape is not None else SpawnTape.generate(seed, self.cfg)
+        self.cursor = 0
+        super().reset(world, seed)
+
+    def update(self, world) -> None:
+        if self.first and len(world.obstacles) == 0:
+            world.obstacles.append(self._spawn_one(world))
+            self.last_spawn_distance = world.distance
+            self.first = False
+            return
+        if (world.distance - self.last_spawn_distance) >= self.next_spawn_gap:
+            world.obstacles.append(self._spawn_one(world))
+            self.last_spawn_distance = world.distance
+
+    def _draw_spec(self) -> SpawnSpec:
+        tape, i = self.tape, self.cursor
+        if i >= len(tape):
+            tape.extend()
+        self.cursor = i + 1
+        # écart avant l'obstacle suivant, tiré avec celui-ci (comme RandomSpawner)
+        self.next_spawn_gap = float(tape.gap[i])
+        return _SPECS[int(tape.kind[i]), int(tape.variant[i])]
+
+
+def parse_seeds(text: str) -> List[int]:
+    """"0-99" ou "1,5,9" (plages et listes combinables)"""
+    seeds = []
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            seeds.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            seeds.append(int(part))
+    return seeds
+
+
+def main() -> None:
+    from .spawner import build_config
+
+    p = argparse.ArgumentParser("Générer des bandes de spawn")
+    p.add_argument("--seeds", type=str, required=True, help="Graines d'épisode, ex. 0-99 ou 1,2,3")
+    p.add_argument("--out", type=str, required=True)
+    p.add_argument("--length", type=int, default=TAPE_CHUNK, help="Obstacles par bande (arrondi au bloc)")
+    p.add_argument("--spawn_mode", type=str, default="regular", choices=["regular", "random"])
+    p.add_argument("--spawn_distance", type=int, default=600)
+    p.add_argument("--obstacles", type=str, default="cactus,bird,bonus")
+    a = p.parse_args()
+    cfg = build_config(a.spawn_mode, a.spawn_distance, a.obstacles)
+    tapes = [SpawnTape.generate(s, cfg, a.length) for s in parse_seeds(a.seeds)]
+    save_tapes(a.out, tapes)
+    print(f"{len(tapes)} bandes de {len(tapes[0])} obstacles: {a.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 import random
-from .obstacles import make_cactus, make_bird
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
+
+from .geometry import N_LARGE_CACTI, N_SMALL_CACTI, SPAWN_MARGIN
+
+_LARGE_CACTI = tuple(range(N_LARGE_CACTI))
+_SMALL_CACTI = tuple(range(N_LARGE_CACTI, N_LARGE_CACTI + N_SMALL_CACTI))
+
+# Intervalle du mode random (pixels de distance parcourue)
+RANDOM_GAP_MIN = 400
+RANDOM_GAP_MAX = 600
+
 
 @dataclass
 class SpawnConfig:
@@ -9,13 +18,38 @@ class SpawnConfig:
     spawn_distance_px: int
     obstacle_types: List[str]
 
+
+@dataclass
+class SpawnSpec:
+    kind: str  # "cactus_small" | "cactus_large" | "bird" | "bonus"
+    variant: int  # index dans assets.cacti, hauteur d'oiseau, ou bonus bas(0)/haut(1)
+
+
+def spawn_options(active: List[str]) -> List[str]:
+    """Liste des tirages possibles selon les types d'obstacles actifs"""
+    options = []
+    if "cactus" in active:
+        options.extend(["cactus_small", "cactus_large"])
+    if "bird" in active:
+        options.append("bird")
+    if "bonus" in active:
+        options.append("bonus")
+
+    if not options:
+        options = ["cactus_large"]
+    return options
+
+
 class Spawner:
     def __init__(self, cfg: SpawnConfig):
         self.cfg = cfg
         self.last_spawn_distance = 0.0
         self.first = True
 
-    def reset(self, world) -> None:
+    def seed_next_episode(self, seed: int) -> None:
+        """Graine du prochain épisode (seul TapeSpawner s'en sert; les autres suivent `random`)"""
+
+    def reset(self, world, seed: Optional[int] = None) -> None:
         self.last_spawn_distance = 0.0
         self.first = True
         self._reset_internal() # Hook pour les enfants
@@ -27,57 +61,21 @@ class Spawner:
         raise NotImplementedError
 
     def _spawn_one(self, world):
-        """Logique de génération commune et centralisée"""
-        x = world.width + 100
-        active = self.cfg.obstacle_types
-
-        # 1. Construire la liste des options possibles selon la config
-        options = []
-        if "cactus" in active:
-            options.extend(["cactus_small", "cactus_large"])
-        if "bird" in active:
-            options.append("bird")
-        if "bonus" in active:
-            options.append("bonus")
+        """Tire le prochain obstacle et le fait construire par le monde (pygame ou headless)"""
+        return world.make_obstacle(self._draw_spec(), world.width + SPAWN_MARGIN)
 
-        if not options:
-            options = ["cactus_large"]
-
-        choice = random.choice(options)
+    def _draw_spec(self) -> SpawnSpec:
+        """Logique de génération commune et centralisée"""
+        choice = random.choice(spawn_options(self.cfg.obstacle_types))
 
         if choice == "bird":
-            hm = random.randint(0, 2)
-            return make_bird(x=x, ground_y=world.ground_y, sprites=world.assets.birds, height_mode=hm)
+            return SpawnSpec("bird", random.randint(0, 2))
         elif choice == "cactus_large":
-            sprite = random.choice(world.assets.cacti[:3]) if len(world.assets.cacti) >= 3 else random.choice(world.assets.cacti)
-            return make_cactus(x=x, ground_y=world.ground_y, sprite=sprite, is_large=True)
+            return SpawnSpec("cactus_large", random.choice(_LARGE_CACTI))
         elif choice == "cactus_small":
-            sprite = random.choice(world.assets.cacti[3:6]) if len(world.assets.cacti) > 3 else random.choice(world.assets.cacti)
-            return make_cactus(x=x, ground_y=world.ground_y, sprite=sprite, is_large=False)
-        elif choice == "bonus": 
-            # Bonus = obstacle spécial (rond doré) s
-            import pygame
-            class SimpleBonus:
-                def __init__(self, x, y, size=32):
-                    self.x = x
-                    self.y = y
-                    self.size = size
-                    self.rect = pygame.Rect(self.x, self.y, self.size, self.size)
-                    self.collected = False
-                    self.kind = "bonus"
-                def update(self, speed, dt):
-                    k = min(1.0, dt * 60.0)  # Plafonne k pour stabilité
-                    self.x -= speed * k
-                    self.rect.x = int(self.x)
-                def draw(self, surface):
-                    color = (255, 215, 0)
-                    center = (int(self.x + self.size // 2), int(self.y + self.size // 2))
-                    radius = self.size // 2
-                    pygame.draw.circle(surface, color, center, radius)
-                def offscreen(self):
-                    return self.x + self.rect.width < 0
-            y = world.ground_y - 20 if random.random() < 0.5 else world.ground_y - 120
-            return SimpleBonus(x, y)
+            return SpawnSpec("cactus_small", random.choice(_SMALL_CACTI))
+        # Bonus au sol ou en hauteur
+        return SpawnSpec("bonus", 0 if random.random() < 0.5 else 1)
 
 
 class RegularSpawner(Spawner):
@@ -99,34 +97,42 @@ class RandomSpawner(Spawner):
     """Intervalle aléatoire entre min et max"""
 
     def _reset_internal(self):
-        self.next_spawn_gap = random.uniform(400, 600)
+        self.next_spawn_gap = random.uniform(RANDOM_GAP_MIN, RANDOM_GAP_MAX)
 
     def update(self, world) -> None:
         # Initialisation du gap si premier run
         if not hasattr(self, 'next_spawn_gap'):
-            self.next_spawn_gap = random.uniform(400, 600)
+            self.next_spawn_gap = random.uniform(RANDOM_GAP_MIN, RANDOM_GAP_MAX)
 
         if self.first and len(world.obstacles) == 0:
             world.obstacles.append(self._spawn_one(world))
             self.last_spawn_distance = world.distance
             self.first = False
-            self.next_spawn_gap = random.uniform(400, 600)
+            self.next_spawn_gap = random.uniform(RANDOM_GAP_MIN, RANDOM_GAP_MAX)
             return
 
         if (world.distance - self.last_spawn_distance) >= self.next_spawn_gap:
             world.obstacles.append(self._spawn_one(world))
             self.last_spawn_distance = world.distance
             # On recadre le prochain spawn
-            self.next_spawn_gap = random.uniform(400, 600)
+            self.next_spawn_gap = random.uniform(RANDOM_GAP_MIN, RANDOM_GAP_MAX)
 
-# Factory inchangée...
-def build_spawner(mode: str, spawn_distance_px: int, obstacles_str: str) -> Spawner:
+def build_config(mode: str, spawn_distance_px: int, obstacles_str: str) -> SpawnConfig:
     obstacle_types = [s.strip() for s in obstacles_str.split(",") if s.strip()]
     if not obstacle_types:
         obstacle_types = ["cactus"]
+    return SpawnConfig(mode=mode, spawn_distance_px=spawn_distance_px, obstacle_types=obstacle_types)
+
+
+def build_spawner(mode: str, spawn_distance_px: int, obstacles_str: str,
+                  tape: bool = False, tape_file: Optional[str] = None) -> Spawner:
+    cfg = build_config(mode, spawn_distance_px, obstacles_str)
 
-    cfg = SpawnConfig(mode=mode, spawn_distance_px=spawn_distance_px, obstacle_types=obstacle_types)
+    if tape or tape_file:
+        # obstacles tirés d'avance par épisode (np.random.Generator), voir spawn_tape.py
+        from .spawn_tape import TapeSpawner, load_tapes
 
+        return TapeSpawner(cfg, load_tapes(tape_file, cfg) if tape_file else None)
     if mode == "regular":
         return RegularSpawner(cfg)
     elif mode == "random":
@@ -0,0 +1,289 @@
+"""N parties de T-Rex simulées en parallèle, en struct-of-arrays NumPy.
+
+Mêmes règles que World/HeadlessWorld (physique, animation qui change la
+taille des hitbox, spawn regular/random, bonus, collisions AABB), mais
+chaque step traite tous les envs en quelques opérations vectorisées.
+Les envs terminés sont réinitialisés automatiquement.
+
+Le tirage des obstacles utilise un np.random.Generator propre au VectorWorld:
+les courses ne sont pas identiques à celles de World pour une même seed.
+"""
+import math
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .constants import GROUND_Y
+from .geometry import (
+    BIRD_ANIM_SPEED, BIRD_HEIGHTS, BIRD_SHRINK, BONUS_SIZE, BONUS_Y_OFFSETS, CACTUS_Y_LARGE, CACTUS_Y_SMALL,
+    DINO_ANIM_SPEED, DINO_DUCK_OFFSET, DINO_SHRINK, DINO_X, N_LARGE_CACTI, N_SMALL_CACTI, SPAWN_MARGIN,
+    SpriteGeometry, cactus_shrink,
+)
+from .spawner import RANDOM_GAP_MAX, RANDOM_GAP_MIN, spawn_options
+
+KIND_CACTUS, KIND_BIRD, KIND_BONUS = 0, 1, 2
+
+
+@dataclass
+class VectorInfo:
+    score: np.ndarray
+    speed: np.ndarray
+    distance: np.ndarray
+    bonus_collected: np.ndarray
+    truncated: np.ndarray  # max_steps atteint sans collision
+    # valides là où done | truncated (valeurs avant l'auto-reset)
+    episode_score: np.ndarray
+    episode_steps: np.ndarray
+
+
+class VectorWorld:
+    def __init__(self, n_envs: int, width: int, geometry: SpriteGeometry,
+                 spawn_mode: str, spawn_distance_px: int, obstacle_types: List[str],
+                 base_speed: float, max_speed: float, gravity: float, jump_vel: float,
+                 acceleration: float = 0.001, capacity: Optional[int] = None,
+                 max_steps: Optional[int] = None, seed: Optional[int] = None):
+        self.n = int(n_envs)
+        self.width = width
+        self.base_speed = float(base_speed)
+        self.max_speed = float(max_speed)
+        self.gravity = float(gravity)
+        self.jump_vel = float(jump_vel)
+        self.acceleration = float(acceleration)
+        self.max_steps = max_steps
+        self.random_gaps = spawn_mode == "random"
+        self.spawn_distance = float(spawn_distance_px)
+        self.rng = np.random.default_rng(seed)
+
+        self.ground_y = float(GROUND_Y)
+        self.ground_y_duck = float(GROUND_Y + DINO_DUCK_OFFSET)
+        self.dino_x = float(DINO_X)
+        # tailles du dino: [run1, run2, duck1, duck2, jump]
+        self.dino_sizes = np.array(list(geometry.dino_run) + list(geometry.dino_duck) + [geometry.dino_jump], dtype=np.int64)
+
+        self._build_spawn_table(geometry, obstacle_types)
+
+        if capacity is None:
+            # obstacles simultanés max: de width+marge jusqu'à -largeur, au moins un gap entre deux
+            min_gap = RANDOM_GAP_MIN if self.random_gaps else max(1.0, self.spawn_distance)
+            span = width + SPAWN_MARGIN + int(self.spawn_sizes[:, :, 0].max())
+            capacity = int(math.ceil(span / (min_gap * 0.999))) + 2
+        self.capacity = int(capacity)
+
+        n, c = self.n, self.capacity
+        # Dino
+        self.y = np.empty(n)
+        self.vy = np.empty(n)
+        self.on_ground = np.empty(n, dtype=bool)
+        self.ducking = np.empty(n, dtype=bool)
+        self.anim_frame = np.empty(n, dtype=np.int64)
+        self.anim_timer = np.empty(n)
+        # Monde
+        self.speed = np.empty(n)
+        self.distance = np.empty(n)
+        self.score = np.empty(n)
+        self.steps = np.empty(n, dtype=np.int64)
+        self.first = np.empty(n, dtype=bool)
+        self.last_spawn = np.empty(n)
+        self.next_gap = np.empty(n)
+        # Table d'obstacles (n, capacity)
+        self.ob_active = np.zeros((n, c), dtype=bool)
+        self.ob_x = np.zeros((n, c))
+        self.ob_y = np.zeros((n, c))
+        self.ob_kind = np.zeros((n, c), dtype=np.int64)
+        self.ob_spec = np.zeros((n, c), dtype=np.int64)  # ligne dans la table de spawn
+        self.ob_frame = np.zeros((n, c), dtype=np.int64)
+        self.ob_timer = np.zeros((n, c))
+        self.ob_passed = np.zeros((n, c), dtype=bool)
+        self.ob_collected = np.zeros((n, c), dtype=bool)
+
+        self.reset()
+
+    @classmethod
+    def from_args(cls, args, n_envs: int, geometry: SpriteGeometry, seed: Optional[int] = None) -> "VectorWorld":
+        obstacle_types = [s.strip() for s in args.obstacles.split(",") if s.strip()] or ["cactus"]
+        return cls(
+            n_envs=n_envs, width=args.width, geometry=geometry,
+            spawn_mode=args.spawn_mode, spawn_distance_px=args.spawn_distance, obstacle_types=obstacle_types,
+            base_speed=args.base_speed, max_speed=args.max_speed,
+            gravity=args.gravity, jump_vel=args.jump_vel, acceleration=args.acceleration,
+            max_steps=args.max_steps, seed=seed,
+        )
+
+    def _build_spawn_table(self, geometry: SpriteGeometry, obstacle_types: List[str]) -> None:
+        """Une ligne par obstacle concret: kind, y, shrink, tailles des 2 frames d'animation"""
+        rows = []  # (kind, y, shrink, (w0, h0), (w1, h1))
+        for i in range(N_LARGE_CACTI):
+            size = geometry.cacti[i]
+            rows.append((KIND_CACTUS, CACTUS_Y_LARGE, cactus_shrink(size[0], True), size, size))
+        for i in range(N_LARGE_CACTI, N_LARGE_CACTI + N_SMALL_CACTI):
+            size = geometry.cacti[i]
+            rows.append((KIND_CACTUS, CACTUS_Y_SMALL, cactus_shrink(size[0], False), size, size))
+        for y in BIRD_HEIGHTS:
+            rows.append((KIND_BIRD, y, BIRD_SHRINK, geometry.birds[0], geometry.birds[1]))
+        for off in BONUS_Y_OFFSETS:
+            rows.append((KIND_BONUS, GROUND_Y - off, 0, (BONUS_SIZE, BONUS_SIZE), (BONUS_SIZE, BONUS_SIZE)))
+
+        self.spawn_kind = np.array([r[0] for r in rows], dtype=np.int64)
+        self.spawn_y = np.array([r[1] for r in rows], dtype=np.float64)
+        self.spawn_shrink = np.array([r[2] for r in rows], dtype=np.int64)
+        self.spawn_sizes = np.array([(r[3], r[4]) for r in rows], dtype=np.int64)  # (rows, frame, wh)
+
+        # Même tirage en deux temps que Spawner._draw_spec: option puis variante
+        first_row = {
+            "cactus_large": (0, N_LARGE_CACTI),
+            "cactus_small": (N_LARGE_CACTI, N_SMALL_CACTI),
+            "bird": (N_LARGE_CACTI + N_SMALL_CACTI, len(BIRD_HEIGHTS)),
+            "bonus": (N_LARGE_CACTI + N_SMALL_CACTI + len(BIRD_HEIGHTS), len(BONUS_Y_OFFSETS)),
+        }
+        options = spawn_options(obstacle_types)
+        self.option_first = np.array([first_row[o][0] for o in options], dtype=np.int64)
+        self.option_count = np.array([first_row[o][1] for o in options], dtype=np.int64)
+
+    def _draw_gaps(self, count: int) -> np.ndarray:
+        if self.random_gaps:
+            return self.rng.uniform(RANDOM_GAP_MIN, RANDOM_GAP_MAX, size=count)
+        return np.full(count, self.spawn_distance)
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        idx = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        if len(idx) == 0:
+            return
+        self.y[idx] = self.ground_y
+        self.vy[idx] = 0.0
+        self.on_ground[idx] = True
+        self.ducking[idx] = False
+        self.anim_frame[idx] = 0
+        self.anim_timer[idx] = 0.0
+        self.speed[idx] = self.base_speed
+        self.distance[idx] = 0.0
+        self.score[idx] = 0.0
+        self.steps[idx] = 0
+        self.first[idx] = True
+        self.last_spawn[idx] = 0.0
+        self.next_gap[idx] = self._draw_gaps(len(idx))
+        self.ob_active[idx] = False
+
+    def _spawn(self, env_idx: np.ndarray) -> None:
+        # emplacement libre: premier slot inactif de la ligne (ignoré si la table est pleine)
+        free = ~self.ob_active[env_idx]
+        has_free = free.any(axis=1)
+        env_idx = env_idx[has_free]
+        if len(env_idx) == 0:
+            return
+        slot = free[has_free].argmax(axis=1)
+
+        opt = self.rng.integers(0, len(self.option_first), size=len(env_idx))
+        row = self.option_first[opt] + (self.rng.random(len(env_idx)) * self.option_count[opt]).astype(np.int64)
+
+        self.ob_active[env_idx, slot] = True
+        self.ob_x[env_idx, slot] = float(self.width + SPAWN_MARGIN)
+        self.ob_y[env_idx, slot] = self.spawn_y[row]
+        self.ob_kind[env_idx, slot] = self.spawn_kind[row]
+        self.ob_spec[env_idx, slot] = row
+        self.ob_frame[env_idx, slot] = 0
+        self.ob_timer[env_idx, slot] = 0.0
+        self.ob_passed[env_idx, slot] = False
+        self.ob_collected[env_idx, slot] = False
+
+    def step(self, actions: np.ndarray, dt: float) -> tuple:
+        """Applique une action par env; renvoie (done[n], VectorInfo)."""
+        k = min(1.0, dt * 60.0)
+        actions = np.asarray(actions)
+
+        # Actions: jump (au sol, pas baissé), duck (au sol), sinon se relever
+        jump = (actions == 1) & self.on_ground & ~self.ducking
+        self.vy[jump] = self.jump_vel
+        self.on_ground[jump] = False
+        duck = (actions == 2) & self.on_ground
+        self.ducking[duck] = True
+        self.y[duck] = self.ground_y_duck
+        stand = (actions != 1) & (actions != 2) & self.ducking
+        self.ducking[stand] = False
+        self.y[stand & self.on_ground] = self.ground_y
+
+        # Vitesse, distance, score
+        np.minimum(self.speed + self.acceleration * k, self.max_speed, out=self.speed)
+        self.distance += self.speed * k
+        np.round(self.distance * 0.025, out=self.score)
+        self.steps += 1
+
+        # Physique du dino
+        air = ~self.on_ground
+        self.ducking[air] = False
+        self.vy[air] += self.gravity * k
+        self.y[air] += self.vy[air] * k
+        land = air & (self.y >= self.ground_y)
+        self.y[land] = self.ground_y
+        self.vy[land] = 0.0
+        self.on_ground[land] = True
+
+        ground = self.on_ground
+        self.anim_timer[ground] += dt
+        flip = ground & (self.anim_timer >= DINO_ANIM_SPEED)
+        self.anim_timer[flip] = 0.0
+        self.anim_frame[flip] = 1 - self.anim_frame[flip]
+
+        sprite = np.where(~ground, 4, np.where(self.ducking, 2, 0) + self.anim_frame)
+        size = self.dino_sizes[sprite]
+        iy = self.y.astype(np.int64)
+        d_l = int(self.dino_x) + DINO_SHRINK[0] // 2
+        d_t = iy + DINO_SHRINK[1]
+        d_r = d_l + size[:, 0] - DINO_SHRINK[0]
+        d_b = d_t + size[:, 1] - DINO_SHRINK[1]
+
+        # Spawn (premier obstacle au premier step, puis tous les gap pixels)
+        spawn = self.first | (self.distance - self.last_spawn >= self.next_gap)
+        if spawn.any():
+            env_idx = np.flatnonzero(spawn)
+            self._spawn(env_idx)
+            self.last_spawn[env_idx] = self.distance[env_idx]
+            self.first[env_idx] = False
+            if self.random_gaps:
+                self.next_gap[env_idx] = self._draw_gaps(len(env_idx))
+
+        # Obstacles: déplacement, hitbox du frame courant, puis animation des oiseaux
+        active = self.ob_active
+        self.ob_x -= (self.speed * k)[:, None]
+        spec = self.ob_spec
+        shrink = self.spawn_shrink[spec]
+        ob_size = self.spawn_sizes[spec, self.ob_frame]
+        o_l = self.ob_x.astype(np.int64) + shrink
+        o_t = self.ob_y.astype(np.int64) + shrink
+        o_w = ob_size[..., 0] - 2 * shrink
+        o_h = ob_size[..., 1] - shrink
+
+        bird = active & (self.ob_kind == KIND_BIRD)
+        self.ob_timer[bird] += dt
+        flip = bird & (self.ob_timer >= BIRD_ANIM_SPEED)
+        self.ob_timer[flip] = 0.0
+        self.ob_frame[flip] = 1 - self.ob_frame[flip]
+
+        self.ob_passed |= active & (self.ob_x + o_w < self.dino_x)
+        active &= ~((self.ob_x + o_w < 0) | self.ob_collected)
+
+        # Collisions AABB dino / obstacles
+        hit = (active & (d_l < o_l + o_w) & (d_t[:, None] < o_t + o_h)
+               & (d_r[:, None] > o_l) & (d_b[:, None] > o_t))
+        bonus_hit = hit & (self.ob_kind == KIND_BONUS)
+        got_bonus = bonus_hit.any(axis=1)
+        if got_bonus.any():
+            # seul le premier bonus touché (le plus à gauche) est collecté
+            env_idx = np.flatnonzero(got_bonus)
+            slot = np.where(bonus_hit[env_idx], self.ob_x[env_idx], np.inf).argmin(axis=1)
+            self.ob_collected[env_idx, slot] = True
+            hit[env_idx, slot] = False
+            self.score[env_idx] += 10
+        done = hit.any(axis=1)
+
+        if self.max_steps is None:
+            truncated = np.zeros(self.n, dtype=bool)
+        else:
+            truncated = ~done & (self.steps >= self.max_steps)
+        info = VectorInfo(
+            score=self.score.copy(), speed=self.speed.copy(), distance=self.distance.copy(),
+            bonus_collected=got_bonus, truncated=truncated,
+            episode_score=self.score.copy(), episode_steps=self.steps.copy(),
+        )
+        self.reset(done | truncated)
+        return done, info
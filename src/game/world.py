@@ -1,29 +1,43 @@
-from dataclasses import dataclass
 from typing import List, Optional
 import random
 
 from .constants import GROUND_Y
 from .dino import Dino
-from .obstacles import Obstacle
-from .spawner import Spawner
+from .geometry import DINO_X, bonus_y
+from .obstacles import Obstacle, make_bird, make_bonus, make_cactus
+from .pool import EntityPool
+from .spawner import Spawner, SpawnSpec, build_spawner
 
 
-@dataclass
 class WorldInfo:
-    score: float
-    speed: float
-    distance: float
-    bonus_collected: bool = False
+    """Infos d'un step. World.step renvoie toujours la même instance, mise à jour en place."""
+    __slots__ = ("score", "speed", "distance", "bonus_collected")
+
+    def __init__(self, score: float, speed: float, distance: float, bonus_collected: bool = False):
+        self.score = score
+        self.speed = speed
+        self.distance = distance
+        self.bonus_collected = bonus_collected
+
+    def __repr__(self) -> str:
+        return (f"WorldInfo(score={self.score!r}, speed={self.speed!r}, distance={self.distance!r}, "
+                f"bonus_collected={self.bonus_collected!r})")
 
 
 class Cloud:
     """Nuage décoratif qui se déplace en arrière-plan"""
+    __slots__ = ("x", "y", "image", "width")
+
     def __init__(self, x: float, y: float, image):
+        self.setup(x, y, image)
+
+    def setup(self, x: float, y: float, image) -> "Cloud":
         self.x = x
         self.y = y
         self.image = image
         self.width = image.get_width()
-    
+        return self
+
     def update(self, speed: float, dt: float) -> None:
         k = min(1.0, dt * 60.0)  # Plafonne k pour stabilité
         self.x -= speed * k * 0.5  # Les nuages bougent plus lentement
@@ -58,6 +72,19 @@ class World:
         self.speed = self.base_speed
         self.distance = 0.0
 
+        # Les nuages (cosmétiques) ont leur propre générateur: ils ne consomment
+        # pas le flux `random` du spawner, donc la course ne dépend pas du décor.
+        self.cloud_rng = random.Random(0)
+
+        # Obstacles et nuages sortis du monde sont recyclés au lieu d'être réalloués
+        self.pool = EntityPool()
+        self.obstacles = []
+        self.clouds: List[Cloud] = []
+        self.info = WorldInfo(score=0.0, speed=self.speed, distance=0.0)
+        # Statistiques d'épisode (évaluation): obstacles passés par type, type fatal
+        self.passed_by_kind = {"cactus": 0, "bird": 0, "bonus": 0}
+        self.killed_by: Optional[str] = None
+
         self.reset()
 
     def reset(self, seed: Optional[int] = None) -> None:
@@ -67,7 +94,7 @@ class World:
         self.distance = 0.0
 
         self.dino = Dino(
-            x=80,
+            x=DINO_X,
             ground_y=self.ground_y,
             jump_vel=self.jump_vel,
             gravity=self.gravity,
@@ -77,32 +104,55 @@ class World:
             sprite_duck1=self.assets.dino_duck1,
             sprite_duck2=self.assets.dino_duck2,
         )
+        self.passed_by_kind = dict.fromkeys(self.passed_by_kind, 0)
+        self.killed_by = None
+        self.pool.release_all(self.obstacles)
+        self.pool.release_all(self.clouds)
         self.obstacles = []
-        self.clouds: List[Cloud] = []
+        self.clouds = []
         # Créer quelques nuages initiaux
         self._spawn_initial_clouds()
-        self.spawner.reset(self)
+        self.spawner.reset(self, seed)
 
     def _spawn_initial_clouds(self) -> None:
         """Créer quelques nuages au démarrage"""
+        rng = self.cloud_rng
         for i in range(3):
-            x = random.randint(200, self.width) + i * 400
-            y = random.randint(50, 120)
-            self.clouds.append(Cloud(x, y, self.assets.cloud))
+            x = rng.randint(200, self.width) + i * 400
+            y = rng.randint(50, 120)
+            self.clouds.append(self.pool.acquire(Cloud).setup(x, y, self.assets.cloud))
     
     def _update_clouds(self, dt: float) -> None:
         """Mettre à jour et spawner des nuages"""
+        gone = False
         for cloud in self.clouds:
             cloud.update(self.speed, dt)
-        
+            gone = gone or cloud.offscreen()
+
         # Retirer les nuages hors écran
-        self.clouds = [c for c in self.clouds if not c.offscreen()]
+        if gone:
+            for c in self.clouds:
+                if c.offscreen():
+                    self.pool.release(c)
+            self.clouds = [c for c in self.clouds if not c.offscreen()]
         
         # Spawner un nouveau nuage aléatoirement
-        if len(self.clouds) < 5 and random.random() < 0.01:
-            x = self.width + random.randint(100, 300)
-            y = random.randint(50, 120)
-            self.clouds.append(Cloud(x, y, self.assets.cloud))
+        rng = self.cloud_rng
+        if len(self.clouds) < 5 and rng.random() < 0.01:
+            x = self.width + rng.randint(100, 300)
+            y = rng.randint(50, 120)
+            self.clouds.append(self.pool.acquire(Cloud).setup(x, y, self.assets.cloud))
+
+    def make_obstacle(self, spec: SpawnSpec, x: float):
+        """Construit l'obstacle pygame correspondant à un tirage du spawner"""
+        if spec.kind == "bird":
+            return make_bird(x=x, ground_y=self.ground_y, sprites=self.assets.birds, height_mode=spec.variant,
+                             pool=self.pool)
+        if spec.kind == "bonus":
+            return make_bonus(x, bonus_y(self.ground_y, spec.variant), pool=self.pool)
+        sprite = self.assets.cacti[spec.variant]
+        return make_cactus(x=x, ground_y=self.ground_y, sprite=sprite, is_large=spec.kind == "cactus_large",
+                           pool=self.pool)
 
     def _update_speed(self, dt: float) -> None:
         """
@@ -113,6 +163,65 @@ class World:
         k = min(1.0, dt * 60.0)  # PLAFONNER k pour éviter accélération due aux FPS bas
         self.speed = min(self.max_speed, self.speed + (self.acceleration * k))
 
+    def _advance_obstacles(self, dt: float) -> bool:
+        """Passe unique sur les obstacles: déplacement, passés, expirés, bonus, collision.
+
+        Tous les obstacles apparaissent à droite et défilent à la même vitesse:
+        la liste reste triée par x. Les expirés sont donc en tête (retirés d'un
+        seul del), et ceux dont x dépasse le bord droit du dino ne peuvent pas
+        le toucher, ni aucun des suivants.
+        """
+        dino = self.dino
+        drect = dino.rect
+        d_left, d_right, dino_x = drect.left, drect.right, dino.x
+        speed = self.speed
+        obstacles = self.obstacles
+
+        done = False
+        self.last_bonus_collected = False
+        head = 0  # nb d'obstacles expirés en tête de liste
+        stray = None  # expirés hors tête (spawn_distance < largeur d'un obstacle)
+        near = True
+        for i, ob in enumerate(obstacles):
+            ob.update(speed, dt)
+            rect = ob.rect
+            right = ob.x + rect.width
+            # Marquer les obstacles passés (pour le système de récompense)
+            if right < dino_x and not ob.passed:
+                ob.passed = True
+                self.passed_by_kind[ob.kind] += 1
+            # Hors écran, ou bonus collecté au step précédent
+            if right < 0 or ob.collected:
+                if i == head:
+                    head += 1
+                else:
+                    stray = stray or []
+                    stray.append(ob)
+                continue
+            if near and ob.x >= d_right:
+                near = False
+            if not near or rect.right <= d_left or not drect.colliderect(rect):
+                continue
+            if ob.kind == "bonus" and not self.last_bonus_collected:
+                # seul le premier bonus touché est collecté, les suivants tuent
+                ob.collected = True
+                self.score += 10
+                self.last_bonus_collected = True
+            else:
+                done = True
+                self.killed_by = ob.kind
+
+        pool = self.pool
+        if stray:
+            pool.release_all(stray)
+            self.obstacles = [ob for ob in obstacles[head:] if not any(ob is s for s in stray)]
+        if head:
+            for i in range(head):
+                pool.release(obstacles[i])
+            if not stray:
+                del obstacles[:head]
+        return done
+
     def step(self, action: int, dt: float) -> tuple[bool, WorldInfo]:
         # action: 0 nothing, 1 jump, 2 duck
         if action == 1:
@@ -135,32 +244,31 @@ class World:
         self.spawner.update(self)
         self._update_clouds(dt)
 
-        for ob in self.obstacles:
-            ob.update(self.speed, dt)
-
-        # Marquer les obstacles passés (pour le système de récompense)
-        for ob in self.obstacles:
-            if ob.x + ob.rect.width < self.dino.x and not getattr(ob, 'passed', False):
-                ob.passed = True
-
-
-
+        done = self._advance_obstacles(dt)
+        info = self.info
+        info.score = self.score
+        info.speed = self.speed
+        info.distance = self.distance
+        info.bonus_collected = self.last_bonus_collected
+        return done, info
 
-        # Remove collected bonus obstacles so they disappear
-        self.obstacles = [ob for ob in self.obstacles if not ob.offscreen() and not getattr(ob, 'collected', False)]
 
+def build_world(args, assets=None):
+    """World pygame, ou HeadlessWorld si --engine headless (assets facultatifs)."""
+    spawner = build_spawner(args.spawn_mode, args.spawn_distance, args.obstacles,
+                            tape=bool(getattr(args, "spawn_tape", 0)), tape_file=getattr(args, "spawn_tape_file", None))
+    kwargs = dict(
+        width=args.width,
+        height=args.height,
+        spawner=spawner,
+        base_speed=args.base_speed,
+        max_speed=args.max_speed,
+        gravity=args.gravity,
+        jump_vel=args.jump_vel,
+        acceleration=args.acceleration,
+    )
+    if getattr(args, "engine", "pygame") == "headless":
+        from .headless import HeadlessWorld, default_geometry
 
-        # Gestion des bonus comme obstacles (plus besoin de liste séparée)
-        for ob in self.obstacles:
-            if getattr(ob, 'collected', None) is not None and not ob.collected and self.dino.rect.colliderect(ob.rect):
-                ob.collected = True
-                self.score += 10
-                self.last_bonus_collected = True
-                break
-        else:
-            self.last_bonus_collected = False
-
-
-        done = any(self.dino.rect.colliderect(ob.rect) for ob in self.obstacles if not getattr(ob, 'collected', False))
-        info = WorldInfo(score=self.score, speed=self.speed, distance=self.distance, bonus_collected=self.last_bonus_collected)
-        return done, info
+        return HeadlessWorld(geometry=default_geometry(assets), **kwargs)
+    return World(assets=assets, **kwargs)
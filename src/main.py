@@ -14,26 +14,101 @@ def _init_pygame_for_assets(render: bool) -> None:
     pygame.display.set_mode((1, 1))
 
 
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
+
+
+def load_game_assets(args):
+    """Sprites pygame, ou None en headless sans rendu (géométrie lue par build_world).
+
+    Avec un cache à jour (python -m src.game.asset_cache), les sprites lisent les
+    pixels mappés en mémoire: sans rendu, ni SDL ni décodage de PNG.
+    """
+    if args.engine == "headless" and not args.render:
+        return None
+    from .game.asset_cache import open_asset_cache
+    from .utils import startup
+
+    cache = open_asset_cache(ASSETS_DIR)
+    if cache is not None and not args.render:
+        with startup.phase("asset decode"):
+            return cache.game_assets()
+
+    with startup.phase("sdl init"):
+        from .game.assets import load_assets
+
+        _init_pygame_for_assets(render=bool(args.render))
+    with startup.phase("asset decode"):
+        if cache is not None:
+            return cache.game_assets(convert=True)
+        return load_assets(ASSETS_DIR)
+
+
 def main() -> None:
     from .cli import build_parser
     from .paths import prepare_run_dirs
-    from .game.assets import load_assets
-    from .utils import set_seed
-    from .training.train import train
-    from .training.eval import play
+    from .utils import set_seed, startup
 
-    args = build_parser().parse_args()
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.startup_profile:
+        startup.start()
 
-    set_seed(args.seed)
-    _init_pygame_for_assets(render=bool(args.render))
+    if args.export:
+        from .ai.export import export_policy
+
+        if not args.model:
+            parser.error("--export requires --model <best|latest dir>")
+        print(f"Exported policy: {export_policy(args.model, args.export_out)}")
+        return
 
-    assets = load_assets(os.path.join(os.path.dirname(__file__), "..", "assets"))
+    if args.obs == "pixels":
+        unsupported = [flag for flag, on in (("--actors", args.actors > 0), ("--eval_every", args.eval_every > 0),
+                                             ("--eval", args.eval), ("--league", args.league),
+                                             ("--export", args.export)) if on]
+        if unsupported:
+            # ces modes jouent la politique NumPy (réseau dense sur 9 features)
+            parser.error(f"--obs pixels is not supported with {', '.join(unsupported)}")
+        if args.pixel_source == "sprites" and args.engine == "headless":
+            parser.error("--pixel_source sprites needs --engine pygame (use --pixel_source raster headless)")
 
+    if args.capture and not args.render:
+        parser.error("--capture requires --render 1 (use SDL_VIDEODRIVER=dummy without a display)")
+
+    if args.replay:
+        from .game.recording import replay
+
+        replay(args)
+        return
+    if args.record_top > 0 and not (args.spawn_tape or args.spawn_tape_file):
+        parser.error("--record_top requires --spawn_tape 1 (the course is replayed from the tape seed)")
+
+    set_seed(args.seed)
     run = prepare_run_dirs(args.models_dir, args.logs_dir, args.run_name, resume=args.resume)
 
+    if args.eval:
+        # chaque worker charge ses sprites et la politique NumPy: ni rendu ni TensorFlow ici
+        from .training.evaluate import evaluate
+
+        evaluate(args, run)
+        return
+    if args.league:
+        from .training.league import league
+
+        league(args, run)
+        return
+
+    assets = load_game_assets(args)
+
+    # chaque mode n'importe que ce qu'il utilise: TensorFlow seulement pour l'entraînement
     if args.train:
+        with startup.phase("imports"):
+            from .training.train import train
+
         train(args, run, assets)
     else:
+        with startup.phase("imports"):
+            from .training.eval import play
+
         play(args, run, assets)
 
 
@@ -0,0 +1,232 @@
+"""Entraînement acteurs/learner (--actors M).
+
+M processus acteurs jouent chacun leur partie avec une copie NumPy de la
+politique et leur propre epsilon, et envoient leurs transitions par paquets.
+Le processus principal (learner) possède le DQNAgent (réseau TF + replay),
+insère les paquets, entraîne au même ratio que la boucle mono-process
+(1 update pour train_freq transitions) et rediffuse les poids aux acteurs par
+mémoire partagée tous les --weights_sync_every updates.
+"""
+from __future__ import annotations
+
+import copy
+import multiprocessing as mp
+import queue
+import random
+import time
+from collections import deque
+from typing import Deque, List
+
+import numpy as np
+
+from ..ai.shared_weights import SharedWeights, WeightsSpec
+from ..paths import RunPaths, save_args
+from .logger import CSVLogger, EvalLogger, ThroughputLogger
+
+LOG_EVERY_S = 10.0
+
+
+def actor_epsilon_floor(actor_id: int, n_actors: int, epsilon_end: float) -> float:
+    """Plancher d'epsilon propre à chaque acteur (schéma Ape-X: 0.4 ** (1 + 7 i / (M - 1))).
+
+    Les acteurs couvrent de l'exploration large à quasi greedy; jamais sous epsilon_end.
+    """
+    if n_actors <= 1:
+        return epsilon_end
+    return max(epsilon_end, 0.4 ** (1 + 7 * actor_id / (n_actors - 1)))
+
+
+def _actor_main(actor_id: int, args, spec: WeightsSpec, out: mp.Queue, stop, epsilon_start: float) -> None:
+    # pas de TensorFlow ici: la politique est évaluée en NumPy
+    from ..env.action_repeat import wrap_action_repeat
+    from ..env.trex_env import TrexEnv
+    from ..game.clock import SimClock
+    from ..main import load_game_assets
+    from ..utils import set_seed
+
+    args = copy.copy(args)
+    args.render = 0
+    seed = args.seed + 1 + actor_id
+    set_seed(seed)
+    rng = random.Random(seed)
+
+    weights = SharedWeights.attach(spec)
+    policy = weights.policy()
+    clock = SimClock(args.fps)
+    env = wrap_action_repeat(TrexEnv(args, load_game_assets(args), render=False), args, clock=clock)
+
+    n_actions = policy.n_actions
+    eps_floor = actor_epsilon_floor(actor_id, args.actors, args.epsilon_end)
+    # la boucle mono-process décroît epsilon à chaque update, soit tous les train_freq steps de jeu
+    decay = max(1, args.epsilon_decay_steps * args.train_freq)
+
+    chunk = args.actor_chunk
+    s = np.zeros((chunk, policy.obs_dim), dtype=np.float32)
+    s2 = np.zeros_like(s)
+    a = np.zeros(chunk, dtype=np.int64)
+    r = np.zeros(chunk, dtype=np.float32)
+    d = np.zeros(chunk, dtype=np.float32)
+    n = 0
+    episodes: List[tuple] = []
+    total_steps = 0
+
+    def send(items) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(items, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        while not stop.is_set():
+            obs = env.reset()
+            total_reward = 0.0
+            steps = 0
+            frames = 0
+            while True:
+                weights.pull_into(policy)
+                eps = max(eps_floor, epsilon_start - (epsilon_start - eps_floor) * min(1.0, total_steps / decay))
+                if rng.random() < eps:
+                    action = rng.randrange(n_actions)
+                else:
+                    action = policy.act(obs)
+                res = env.step(action, clock.tick())
+
+                s[n] = obs
+                a[n] = action
+                r[n] = res.reward
+                s2[n] = res.obs
+                d[n] = res.done
+                n += 1
+                if n == chunk:
+                    if not send((s.copy(), a.copy(), r.copy(), s2.copy(), d.copy(), episodes)):
+                        return
+                    n = 0
+                    episodes = []
+
+                obs = res.obs
+                total_reward += res.reward
+                steps += 1
+                total_steps += 1
+                frames += res.info.get("frames", 1)
+                if res.done or frames >= args.max_steps or stop.is_set():
+                    break
+            episodes.append((res.info["score"], total_reward, steps, eps))
+    finally:
+        env.close()
+        weights.close()
+
+
+def train_distributed(args, run: RunPaths) -> None:
+    from ..ai.agent import DQNAgent
+    from ..ai.checkpoint import CheckpointWriter
+    from .train import agent_config
+
+    save_args(run.logs_run_dir, args)
+    logger = CSVLogger(run.logs_run_dir)
+    throughput = ThroughputLogger(run.logs_run_dir)
+
+    agent = DQNAgent(agent_config(args))
+    if args.resume:
+        agent.load(args.resume)
+
+    ckpt = CheckpointWriter()
+    evaluator = None
+    if args.eval_every > 0:
+        from .evaluate import BackgroundEvaluator, promote_best
+
+        evaluator = BackgroundEvaluator(args)
+        eval_logger = EvalLogger(run.logs_run_dir)
+    weights = SharedWeights.create(agent.numpy_policy())
+    ctx = mp.get_context("spawn")  # pas de fork d'un processus qui a initialisé TF
+    transitions = ctx.Queue(maxsize=4 * args.actors)
+    stop = ctx.Event()
+    actors = [
+        ctx.Process(target=_actor_main, args=(i, args, weights.spec(), transitions, stop, agent.epsilon), daemon=True)
+        for i in range(args.actors)
+    ]
+    for p in actors:
+        p.start()
+
+    recent_scores: Deque[float] = deque(maxlen=20)
+    best_avg = agent.best_score or 0.0
+    losses: List[float] = []
+    ep = 0
+    env_steps = updates = pending = 0
+    t_start = t_log = time.perf_counter()
+    steps_log = updates_log = 0
+
+    try:
+        while ep < args.episodes:
+            try:
+                s, a, r, s2, d, episodes = transitions.get(timeout=1.0)
+            except queue.Empty:
+                if not any(p.is_alive() for p in actors):
+                    raise RuntimeError("All actor processes exited")
+                continue
+
+            agent.remember_batch(s, a, r, s2, d)
+            env_steps += len(a)
+            pending += len(a)
+            # même ratio que la boucle mono-process: 1 update pour train_freq transitions
+            while pending >= args.train_freq:
+                pending -= args.train_freq
+                loss = agent.train_step()
+                if loss is None:
+                    continue
+                losses.append(loss)
+                updates += 1
+                if updates % args.weights_sync_every == 0:
+                    weights.publish(agent.numpy_policy())
+
+            for score, total_reward, steps, eps in episodes:
+                ep += 1
+                recent_scores.append(score)
+                avg20 = float(np.mean(recent_scores))
+                loss_avg = float(np.mean(losses)) if losses else None
+                losses = []
+
+                if (ep % args.save_every) == 0:
+                    agent.save_async(run.latest_dir, ckpt)
+                if evaluator is not None:
+                    if ep % args.eval_every == 0:
+                        evaluator.submit(agent, ep)
+                    promote_best(evaluator.poll(), agent, ckpt, run.best_dir, eval_logger)
+                elif avg20 > best_avg:
+                    best_avg = avg20
+                    agent.best_score = best_avg
+                    agent.save_async(run.best_dir, ckpt)
+                logger.log(ep, score, total_reward, steps, eps, loss_avg)
+                if ep >= args.episodes:
+                    break
+
+            now = time.perf_counter()
+            if now - t_log >= LOG_EVERY_S:
+                env_rate = (env_steps - steps_log) / (now - t_log)
+                update_rate = (updates - updates_log) / (now - t_log)
+                throughput.log(now - t_start, env_steps, updates, env_rate, update_rate)
+                avg20 = float(np.mean(recent_scores)) if recent_scores else 0.0
+                print(f"[EP {ep}] avg20={avg20:.1f} env-steps/s={env_rate:,.0f} updates/s={update_rate:,.0f} "
+                      f"(actors={args.actors})")
+                t_log, steps_log, updates_log = now, env_steps, updates
+    finally:
+        stop.set()
+        # vider la file pour débloquer les acteurs en attente sur put()
+        deadline = time.perf_counter() + 5.0
+        while any(p.is_alive() for p in actors) and time.perf_counter() < deadline:
+            try:
+                transitions.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for p in actors:
+            if p.is_alive():
+                p.terminate()
+            p.join()
+        weights.close()
+
+    if evaluator is not None:
+        promote_best(evaluator.close(), agent, ckpt, run.best_dir, eval_logger)
+    agent.save_async(run.latest_dir, ckpt)
+    ckpt.close()
@@ -2,40 +2,62 @@ from __future__ import annotations
 
 import os
 
-from ..ai.agent import AgentConfig, DQNAgent
+from ..ai.export import load_policy
+from ..ai.numpy_policy import NumpyPolicy
+from ..env.action_repeat import wrap_action_repeat
+from ..env.pixels import wrap_pixels
+from ..env.recorder import wrap_recorder
 from ..env.rollout import run_episode
 from ..env.trex_env import TrexEnv
+from ..game.capture import capture_from_args
 from ..paths import RunPaths
+from ..utils import startup
+
+
+class PolicyPlayer:
+    """Agent glouton en NumPy pour run_episode (même act() que DQNAgent), sans TensorFlow"""
+
+    def __init__(self, policy: NumpyPolicy):
+        self.policy = policy
+
+    def act(self, obs, training: bool = False) -> int:
+        return self.policy.act(obs)
+
+
+def resolve_model_path(args, run: RunPaths) -> str:
+    """--model, sinon le best du run courant"""
+    model_path = args.model or run.best_dir
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model dir not found: {model_path}")
+    return model_path
 
 
 def play(args, run: RunPaths, assets) -> None:
-    env = TrexEnv(args, assets, render=bool(args.render))
+    with startup.phase("env init"):
+        base_env = TrexEnv(args, assets, render=bool(args.render))
+        if args.render:
+            base_env.renderer.dirty = bool(args.dirty_render)
+        if args.capture:
+            base_env.renderer.capture = capture_from_args(args, (args.width, args.height), args.fps,
+                                                          bool(args.realtime))
+        env = wrap_recorder(base_env, args, run.logs_run_dir)
+    if not bool(args.human):
+        env = wrap_pixels(wrap_action_repeat(env, args), args)
 
     agent = None
     if not bool(args.human):
-        cfg = AgentConfig(
-            obs_dim=9,
-            n_actions=3,
-            gamma=args.gamma,
-            lr=args.lr,
-            batch_size=args.batch_size,
-            buffer_size=args.buffer_size,
-            train_start=args.train_start,
-            target_update=args.target_update,
-            epsilon_start=0.0,
-            epsilon_end=0.0,
-            epsilon_decay_steps=1,
-        )
-        agent = DQNAgent(cfg)
-
-        model_dir = args.model
-        if not model_dir:
-            # fallback: best du run courant
-            model_dir = run.best_dir
-        if os.path.isdir(model_dir):
-            agent.load(model_dir)
-        else:
-            raise FileNotFoundError(f"Model dir not found: {model_dir}")
+        with startup.phase("model load"):
+            if args.obs == "pixels":
+                # réseau convolutif: pas de miroir NumPy, on joue avec le modèle Keras
+                from ..ai.agent import DQNAgent
+                from .train import agent_config
+
+                agent = DQNAgent(agent_config(args))
+                agent.load(resolve_model_path(args, run))
+            else:
+                # policy.npz exporté, sinon weights.npz / model.keras (TF importé seulement pour ce dernier)
+                agent = PolicyPlayer(load_policy(resolve_model_path(args, run)))
+    env = startup.first_step(env)
 
     res = run_episode(env, agent=agent, training=False, human=bool(args.human), max_steps=args.max_steps)
     print(f"Score: {int(res.score)}  Steps: {res.steps}  Reward: {res.total_reward:.1f}")
@@ -0,0 +1,347 @@
+"""Évaluation gloutonne sur N épisodes (--eval), en parallèle sur des seeds fixes.
+
+Chaque processus du pool construit son env une fois et reçoit la politique
+NumPy (pas de TensorFlow dans les workers). L'épisode i est joué avec la seed
+seeds[i]: deux modèles évalués avec les mêmes seeds voient les mêmes obstacles.
+Arrêt anticipé: dès que l'intervalle de confiance à 95% sur le score moyen est
+assez étroit. La décision ne porte que sur le préfixe de seeds déjà terminé,
+donc le rapport ne dépend pas de l'ordre d'arrivée des résultats.
+"""
+from __future__ import annotations
+
+import copy
+import csv
+import json
+import math
+import multiprocessing as mp
+import os
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..ai.numpy_policy import NumpyPolicy
+from ..paths import RunPaths, save_args
+
+OBSTACLE_KINDS = ("cactus", "bird", "bonus")
+
+
+@dataclass
+class EpisodeResult:
+    seed: int
+    score: float
+    steps: int
+    frames: int
+    total_reward: float
+    passed: Dict[str, int] = field(default_factory=dict)  # obstacles passés par type
+    killed_by: Optional[str] = None  # type de l'obstacle fatal, None si max_steps atteint
+
+
+def eval_seeds(args) -> List[int]:
+    """--eval_seeds "1,2,3", sinon seed, seed+1, ... (--episodes seeds)"""
+    if args.eval_seeds:
+        return [int(s) for s in args.eval_seeds.split(",") if s.strip()]
+    return [args.seed + i for i in range(args.episodes)]
+
+
+def make_eval_env(args):
+    """TrexEnv sans rendu (+ frame skip) et son horloge, comme un acteur"""
+    from ..env.action_repeat import wrap_action_repeat
+    from ..env.trex_env import TrexEnv
+    from ..game.clock import SimClock
+    from ..main import load_game_assets
+
+    args = copy.copy(args)
+    args.render = 0
+    clock = SimClock(args.fps)
+    return wrap_action_repeat(TrexEnv(args, load_game_assets(args), render=False), args, clock=clock), clock
+
+
+def run_greedy_episode(env, clock, policy: NumpyPolicy, seed: int, max_steps: int) -> EpisodeResult:
+    from ..utils import set_seed
+
+    set_seed(seed)
+    env.world.spawner.seed_next_episode(seed)  # bande de spawn de cette seed (--spawn_tape)
+    obs = env.reset()
+    total_reward = 0.0
+    steps = frames = 0
+    while True:
+        res = env.step(policy.act(obs), clock.tick())
+        obs = res.obs
+        total_reward += res.reward
+        steps += 1
+        frames += res.info.get("frames", 1)
+        if res.done or frames >= max_steps:
+            break
+    world = env.world
+    return EpisodeResult(seed=seed, score=float(res.info["score"]), steps=steps, frames=frames,
+                         total_reward=float(total_reward), passed=dict(world.passed_by_kind),
+                         killed_by=world.killed_by if res.done else None)
+
+
+# --- workers du pool (état global par processus) ----------------------------
+
+_worker_state: Optional[tuple] = None
+
+
+def _init_worker(args, layers) -> None:
+    global _worker_state
+    env, clock = make_eval_env(args)
+    _worker_state = (env, clock, NumpyPolicy(layers), args.max_steps)
+
+
+def _play_seed(seed: int) -> EpisodeResult:
+    env, clock, policy, max_steps = _worker_state
+    return run_greedy_episode(env, clock, policy, seed, max_steps)
+
+
+# --- statistiques -------------------------------------------------------------
+
+def ci95_half_width(scores: List[float]) -> float:
+    """Demi-largeur de l'IC à 95% du score moyen (approximation normale)"""
+    if len(scores) < 2:
+        return math.inf
+    return 1.96 * float(np.std(scores, ddof=1)) / math.sqrt(len(scores))
+
+
+def ci_reached(scores: List[float], rel_ci: float, min_episodes: int) -> bool:
+    if rel_ci <= 0 or len(scores) < max(2, min_episodes):
+        return False
+    return ci95_half_width(scores) <= rel_ci * max(abs(float(np.mean(scores))), 1.0)
+
+
+def summarize(results: List[EpisodeResult], wall_s: float) -> dict:
+    scores = np.array([r.score for r in results], dtype=np.float64)
+    steps = np.array([r.steps for r in results], dtype=np.float64)
+    survival = {}
+    for kind in OBSTACLE_KINDS:
+        passed = sum(r.passed.get(kind, 0) for r in results)
+        deaths = sum(r.killed_by == kind for r in results)
+        met = passed + deaths
+        survival[kind] = {"passed": passed, "deaths": deaths, "survival": passed / met if met else None}
+    return {
+        "episodes": len(results),
+        "score": {
+            "mean": float(scores.mean()),
+            "median": float(np.median(scores)),
+            "std": float(scores.std(ddof=1)) if len(scores) > 1 else 0.0,
+            "p5": float(np.percentile(scores, 5)),
+            "p95": float(np.percentile(scores, 95)),
+            "min": float(scores.min()),
+            "max": float(scores.max()),
+            "ci95": ci95_half_width(scores.tolist()) if len(scores) > 1 else None,
+        },
+        "steps": {"mean": float(steps.mean()), "median": float(np.median(steps))},
+        "timeout_rate": sum(r.killed_by is None for r in results) / len(results),  # vivant à max_steps
+        "survival_by_obstacle": survival,
+        "wall_s": round(wall_s, 3),
+        "episodes_per_s": len(results) / wall_s if wall_s > 0 else None,
+    }
+
+
+def write_report(out_dir: str, report: dict, results: List[EpisodeResult]) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "eval.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(out_dir, "eval_episodes.csv"), "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["seed", "score", "steps", "frames", "total_reward"]
+                   + [f"passed_{k}" for k in OBSTACLE_KINDS] + ["killed_by"])
+        for r in results:
+            w.writerow([r.seed, int(r.score), r.steps, r.frames, round(r.total_reward, 3)]
+                       + [r.passed.get(k, 0) for k in OBSTACLE_KINDS] + [r.killed_by or ""])
+
+
+# --- harnais ------------------------------------------------------------------
+
+def evaluate_policy(args, policy: NumpyPolicy, seeds: List[int], workers: int = 1,
+                    rel_ci: float = 0.0, min_episodes: int = 20) -> tuple:
+    """Joue les seeds dans l'ordre (pool de `workers` processus); -> (résultats, arrêt anticipé)"""
+    results: List[EpisodeResult] = []
+    if workers <= 1:
+        env, clock = make_eval_env(args)
+        try:
+            for seed in seeds:
+                results.append(run_greedy_episode(env, clock, policy, seed, args.max_steps))
+                if ci_reached([r.score for r in results], rel_ci, min_episodes):
+                    return results, len(results) < len(seeds)
+        finally:
+            env.close()
+        return results, False
+
+    done: Dict[int, EpisodeResult] = {}
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(args, policy.layers)) as pool:
+        pending = {}
+        nxt = 0
+        while True:
+            # au plus 2 épisodes en vol par worker: peu de travail perdu à l'arrêt
+            while nxt < len(seeds) and len(pending) < 2 * workers:
+                pending[pool.submit(_play_seed, seeds[nxt])] = nxt
+                nxt += 1
+            if not pending:
+                return results, False
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                done[pending.pop(fut)] = fut.result()
+            # étendre le préfixe contigu et tester l'arrêt à chaque longueur
+            while len(results) in done:
+                results.append(done.pop(len(results)))
+                if ci_reached([r.score for r in results], rel_ci, min_episodes):
+                    for fut in pending:
+                        fut.cancel()
+                    return results, len(results) < len(seeds)
+
+
+def evaluate(args, run: RunPaths) -> dict:
+    from ..ai.export import load_policy
+    from .eval import resolve_model_path
+
+    model_path = resolve_model_path(args, run)
+    policy = load_policy(model_path)
+    seeds = eval_seeds(args)
+    workers = args.eval_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(seeds)))
+
+    t0 = time.perf_counter()
+    results, early = evaluate_policy(args, policy, seeds, workers=workers, rel_ci=args.eval_ci,
+                                     min_episodes=args.eval_min_episodes)
+    report = summarize(results, time.perf_counter() - t0)
+    report.update(model=os.path.abspath(model_path), seeds=[r.seed for r in results], stopped_early=early,
+                  workers=workers, max_steps=args.max_steps)
+
+    out_dir = args.eval_out or run.logs_run_dir
+    save_args(run.logs_run_dir, args)
+    write_report(out_dir, report, results)
+
+    s = report["score"]
+    surv = "  ".join(f"{k}={v['survival']:.1%}" for k, v in report["survival_by_obstacle"].items()
+                     if v["survival"] is not None)
+    print(f"Eval: {report['episodes']}/{len(seeds)} épisodes{' (IC atteint)' if early else ''}  "
+          f"score moyen={s['mean']:.1f} ±{s['ci95'] or 0:.1f}  médiane={s['median']:.0f}  "
+          f"p5={s['p5']:.0f}  p95={s['p95']:.0f}  ({report['episodes_per_s']:.2f} épisodes/s)")
+    print(f"Survie par obstacle: {surv}  timeouts={report['timeout_rate']:.1%}")
+    print(f"Rapport: {os.path.join(out_dir, 'eval.json')}")
+    return report
+
+
+# --- évaluation périodique pendant l'entraînement ---------------------------
+
+EVAL_SEED_OFFSET = 100_000  # seeds d'évaluation à l'écart de --seed
+
+
+def held_out_seeds(args) -> List[int]:
+    return [args.seed + EVAL_SEED_OFFSET + i for i in range(args.eval_episodes)]
+
+
+@dataclass
+class PeriodicEval:
+    episode: int
+    train_step: int
+    snapshot: dict  # poids évalués (Snapshot), pour promouvoir best/ sans réévaluer
+    state: object  # TrainState au moment du snapshot
+    report: dict
+
+
+def _background_eval_main(args, seeds: List[int], requests, results) -> None:
+    # priorité basse: sur une machine chargée, l'entraînement passe d'abord
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+    env, clock = make_eval_env(args)
+    try:
+        while True:
+            item = requests.get()
+            if item is None:
+                return
+            tag, layers = item
+            policy = NumpyPolicy(layers)
+            t0 = time.perf_counter()
+            episodes = [run_greedy_episode(env, clock, policy, seed, args.max_steps) for seed in seeds]
+            results.put((tag, summarize(episodes, time.perf_counter() - t0)))
+    finally:
+        env.close()
+
+
+class BackgroundEvaluator:
+    """Évaluations gloutonnes (seeds fixes mises à l'écart) dans un processus à part.
+
+    submit() copie les poids et rend la main aussitôt; poll() renvoie les
+    évaluations terminées. Une seule évaluation tourne à la fois: si une autre
+    est demandée entre-temps, seule la plus récente attend son tour.
+    """
+
+    def __init__(self, args):
+        self.seeds = held_out_seeds(args)
+        ctx = mp.get_context("spawn")  # pas de fork d'un processus qui a initialisé TF
+        self._requests = ctx.Queue()
+        self._results = ctx.Queue()
+        self._proc = ctx.Process(target=_background_eval_main, args=(args, self.seeds, self._requests, self._results),
+                                 daemon=True)
+        self._proc.start()
+        self._next_tag = 0
+        self._busy: Optional[int] = None
+        self._waiting: Optional[tuple] = None
+        self._taken: Dict[int, tuple] = {}  # tag -> (episode, snapshot, state)
+
+    def submit(self, agent, episode: int) -> None:
+        tag = self._next_tag
+        self._next_tag += 1
+        snapshot, state = agent.snapshot()
+        layers = [(w.copy(), b.copy(), relu) for w, b, relu in agent.numpy_policy().layers]
+        self._taken[tag] = (episode, snapshot, state)
+        if self._waiting is not None:
+            self._taken.pop(self._waiting[0], None)  # remplacée par une demande plus récente
+        self._waiting = (tag, layers)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._busy is None and self._waiting is not None:
+            self._requests.put(self._waiting)
+            self._busy = self._waiting[0]
+            self._waiting = None
+
+    def poll(self, timeout: Optional[float] = None) -> List[PeriodicEval]:
+        """Évaluations terminées; timeout=None: sans attendre"""
+        done = []
+        while self._busy is not None:
+            try:
+                tag, report = self._results.get(timeout=timeout) if timeout else self._results.get_nowait()
+            except queue.Empty:
+                if not self._proc.is_alive():
+                    raise RuntimeError("Background evaluator process exited")
+                break
+            self._busy = None
+            episode, snapshot, state = self._taken.pop(tag)
+            done.append(PeriodicEval(episode, state.step, snapshot, state, report))
+            self._dispatch()
+        return done
+
+    def close(self, timeout: float = 60.0) -> List[PeriodicEval]:
+        """Attend les évaluations en cours (au plus timeout s), puis arrête le processus"""
+        done = []
+        deadline = time.perf_counter() + timeout
+        while self._busy is not None and self._proc.is_alive() and time.perf_counter() < deadline:
+            done += self.poll(timeout=max(0.1, deadline - time.perf_counter()))
+        self._requests.put(None)
+        self._proc.join(timeout=5.0)
+        if self._proc.is_alive():
+            self._proc.terminate()
+        return done
+
+
+def promote_best(evals: List[PeriodicEval], agent, ckpt, best_dir: str, eval_logger) -> None:
+    """Journalise les évaluations et écrit dans best/ les poids évalués s'ils battent agent.best_score"""
+    for ev in evals:
+        eval_logger.log(ev.episode, ev.train_step, ev.report)
+        s = ev.report["score"]
+        print(f"[EVAL ep={ev.episode} step={ev.train_step}] mean={s['mean']:.1f} median={s['median']:.0f} "
+              f"p5={s['p5']:.0f}")
+        if s["mean"] > agent.best_score:
+            agent.best_score = ev.state.best_score = s["mean"]
+            ckpt.submit(best_dir, ev.snapshot, ev.state)
@@ -0,0 +1,285 @@
+"""Ligue de checkpoints (--league): tous les modèles d'un dossier sur les mêmes seeds.
+
+Les checkpoints (dossiers avec policy.npz, weights.npz ou model.keras) sont
+joués en parallèle dans un seul processus: chaque politique a E envs, toutes
+avancent d'un step ensemble et les P politiques d'une même architecture font
+un seul forward NumPy batché [P, E, obs_dim]. Chaque env garde son propre état
+`random` (le spawner tire dans le module random; inutile avec --spawn_tape),
+donc un épisode donne le même résultat que `--eval` avec la même seed.
+
+Les résultats sont mis en cache par (hash du fichier de poids, configuration du
+jeu) et par seed: relancer la ligue ne rejoue que les couples manquants.
+"""
+from __future__ import annotations
+
+import copy
+import csv
+import hashlib
+import json
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..ai.numpy_policy import POLICY_FILE, NumpyPolicy, StackedPolicy
+from ..paths import RunPaths, save_args
+from .evaluate import EpisodeResult, eval_seeds, summarize
+
+CHECKPOINT_FILES = (POLICY_FILE, "weights.npz", "model.keras")
+
+# paramètres qui changent le déroulé d'un épisode: ils font partie de la clé du cache
+ENV_KEYS = ("engine", "width", "height", "spawn_mode", "spawn_distance", "obstacles", "base_speed", "max_speed",
+            "gravity", "jump_vel", "acceleration", "fps", "frame_skip", "frame_skip_distance", "max_steps",
+            "spawn_tape", "spawn_tape_file")
+
+# réglages d'entraînement sans intérêt pour comparer des runs
+IGNORED_ARGS = {"train", "play", "eval", "export", "league", "render", "realtime", "startup_profile", "run_name",
+                "resume", "models_dir", "logs_dir", "model", "export_out", "human", "episodes", "save_every"}
+
+
+@dataclass
+class Candidate:
+    name: str  # chemin relatif à la racine de la ligue
+    path: str
+    source: str  # fichier de poids lu par load_policy
+    digest: str
+    args: Optional[dict] = None
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+def _find_args(ckpt_dir: str, logs_dir: str) -> Optional[dict]:
+    """args.json du run: à côté du checkpoint, dans le dossier du run, ou logs/runs/<run_id>"""
+    run_dir = os.path.dirname(os.path.abspath(ckpt_dir))
+    for path in (os.path.join(ckpt_dir, "args.json"), os.path.join(run_dir, "args.json"),
+                 os.path.join(logs_dir, "runs", os.path.basename(run_dir), "args.json")):
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+    return None
+
+
+def discover_checkpoints(root: str, logs_dir: str) -> List[Candidate]:
+    from ..ai.export import policy_source
+
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        if not any(name in filenames for name in CHECKPOINT_FILES):
+            continue
+        source = policy_source(dirpath)
+        found.append(Candidate(name=os.path.relpath(dirpath, root), path=dirpath, source=source,
+                               digest=_file_digest(source), args=_find_args(dirpath, logs_dir)))
+    return found
+
+
+def env_key(args) -> str:
+    config = {k: getattr(args, k, None) for k in ENV_KEYS}
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class LeagueCache:
+    """{"<digest>:<env_key>": {"<seed>": EpisodeResult}} dans un fichier JSON"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data: Dict[str, Dict[str, dict]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def get(self, key: str, seed: int) -> Optional[EpisodeResult]:
+        d = self.data.get(key, {}).get(str(seed))
+        return EpisodeResult(**d) if d is not None else None
+
+    def put(self, key: str, result: EpisodeResult) -> None:
+        self.data.setdefault(key, {})[str(result.seed)] = asdict(result)
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f)
+        os.replace(tmp, self.path)
+
+
+def play_lockstep(args, policies: List[NumpyPolicy], todo: List[List[int]], envs_per_policy: int,
+                  on_result=None) -> List[List[EpisodeResult]]:
+    """Joue todo[p] (seeds) pour chaque politique p, toutes les politiques au même pas.
+
+    Les politiques doivent avoir la même architecture. on_result(p, result) est
+    appelé à chaque épisode terminé.
+    """
+    from ..env.action_repeat import wrap_action_repeat
+    from ..env.trex_env import TrexEnv
+    from ..game.clock import SimClock
+    from ..main import load_game_assets
+
+    n_pol = len(policies)
+    n_env = max(1, min(envs_per_policy, max(len(t) for t in todo)))
+    stacked = StackedPolicy(policies)
+    args = copy.copy(args)
+    args.render = 0
+    assets = load_game_assets(args)
+    clock = SimClock(args.fps)
+    envs = [[wrap_action_repeat(TrexEnv(args, assets, render=False), args, clock=clock) for _ in range(n_env)]
+            for _ in range(n_pol)]
+
+    # avec des bandes de spawn, le module random n'intervient plus pendant l'épisode
+    swap_rng = not (getattr(args, "spawn_tape", 0) or getattr(args, "spawn_tape_file", None))
+    queues = [list(reversed(t)) for t in todo]
+    results: List[List[EpisodeResult]] = [[] for _ in range(n_pol)]
+    obs = np.zeros((n_pol, n_env, policies[0].obs_dim), dtype=np.float32)
+    active = np.zeros((n_pol, n_env), dtype=bool)
+    rng_state = [[None] * n_env for _ in range(n_pol)]
+    seed = np.zeros((n_pol, n_env), dtype=np.int64)
+    total_reward = np.zeros((n_pol, n_env))
+    steps = np.zeros((n_pol, n_env), dtype=np.int64)
+    frames = np.zeros((n_pol, n_env), dtype=np.int64)
+
+    def start(p: int, e: int) -> None:
+        if not queues[p]:
+            active[p, e] = False
+            return
+        s = queues[p].pop()
+        # même tirage que set_seed(s) + reset() dans --eval
+        random.seed(s)
+        np.random.seed(s)
+        envs[p][e].world.spawner.seed_next_episode(s)
+        obs[p, e] = envs[p][e].reset()
+        rng_state[p][e] = random.getstate()
+        seed[p, e] = s
+        total_reward[p, e] = 0.0
+        steps[p, e] = frames[p, e] = 0
+        active[p, e] = True
+
+    try:
+        for p in range(n_pol):
+            for e in range(n_env):
+                start(p, e)
+        while active.any():
+            actions = stacked.act_batch(obs)
+            for p, e in zip(*np.nonzero(active)):
+                env = envs[p][e]
+                if swap_rng:
+                    random.setstate(rng_state[p][e])
+                res = env.step(int(actions[p, e]), clock.tick())
+                if swap_rng:
+                    rng_state[p][e] = random.getstate()
+                obs[p, e] = res.obs
+                total_reward[p, e] += res.reward
+                steps[p, e] += 1
+                frames[p, e] += res.info.get("frames", 1)
+                if not (res.done or frames[p, e] >= args.max_steps):
+                    continue
+                world = env.world
+                result = EpisodeResult(seed=int(seed[p, e]), score=float(res.info["score"]), steps=int(steps[p, e]),
+                                       frames=int(frames[p, e]), total_reward=float(total_reward[p, e]),
+                                       passed=dict(world.passed_by_kind),
+                                       killed_by=world.killed_by if res.done else None)
+                results[p].append(result)
+                if on_result is not None:
+                    on_result(p, result)
+                start(p, e)
+    finally:
+        for row in envs:
+            for env in row:
+                env.close()
+    return results
+
+
+def _differing_args(candidates: List[Candidate]) -> List[str]:
+    """Clés d'args.json qui varient d'un run à l'autre (les seules utiles dans le tableau)"""
+    known = [c.args for c in candidates if c.args]
+    keys = sorted({k for a in known for k in a} - IGNORED_ARGS)
+    return [k for k in keys if len({json.dumps(a.get(k)) for a in known}) > 1]
+
+
+def write_league(out_dir: str, rows: List[dict], arg_keys: List[str]) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "league.json"), "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(out_dir, "league.csv"), "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["rank", "checkpoint", "digest", "episodes", "mean", "ci95", "median", "p5", "p95"] + arg_keys)
+        for r in rows:
+            s = r["report"]["score"]
+            w.writerow([r["rank"], r["checkpoint"], r["digest"], r["report"]["episodes"], round(s["mean"], 2),
+                        "" if s["ci95"] is None else round(s["ci95"], 2), s["median"], s["p5"], s["p95"]]
+                       + [json.dumps((r["args"] or {}).get(k)) for k in arg_keys])
+
+
+def league(args, run: RunPaths) -> List[dict]:
+    from ..ai.export import load_policy
+
+    root = args.league_root or args.models_dir
+    candidates = discover_checkpoints(root, args.logs_dir)
+    if not candidates:
+        raise FileNotFoundError(f"No checkpoint ({', '.join(CHECKPOINT_FILES)}) under {root}")
+    seeds = eval_seeds(args)
+    out_dir = args.eval_out or os.path.join(args.logs_dir, "league")
+    cache = LeagueCache(os.path.join(out_dir, "cache.json"))
+    ekey = env_key(args)
+    keys = [f"{c.digest}:{ekey}" for c in candidates]
+
+    # politiques à jouer (seeds absentes du cache), groupées par architecture
+    todo = {i: [s for s in seeds if cache.get(keys[i], s) is None] for i in range(len(candidates))}
+    groups: Dict[tuple, List[int]] = {}
+    policies: Dict[int, NumpyPolicy] = {}
+    for i, missing in todo.items():
+        if missing:
+            policies[i] = load_policy(candidates[i].path)
+            groups.setdefault(policies[i].architecture, []).append(i)
+
+    n_missing = sum(len(t) for t in todo.values())
+    print(f"Ligue: {len(candidates)} checkpoints x {len(seeds)} seeds, {n_missing} épisodes à jouer "
+          f"({len(candidates) * len(seeds) - n_missing} en cache)")
+    t0 = time.perf_counter()
+    for members in groups.values():
+        def on_result(p: int, result: EpisodeResult, members=members) -> None:
+            cache.put(keys[members[p]], result)
+
+        try:
+            play_lockstep(args, [policies[i] for i in members], [todo[i] for i in members],
+                          envs_per_policy=args.league_envs, on_result=on_result)
+        finally:
+            cache.save()  # un run interrompu garde ses épisodes terminés
+    wall = time.perf_counter() - t0
+    if n_missing:
+        print(f"{n_missing} épisodes en {wall:.1f}s ({n_missing / wall:.1f} épisodes/s)")
+
+    rows = []
+    for i, c in enumerate(candidates):
+        results = [cache.get(keys[i], s) for s in seeds]
+        report = summarize(results, 0.0)
+        report.pop("wall_s")
+        report.pop("episodes_per_s")
+        rows.append({"checkpoint": c.name, "path": os.path.abspath(c.path), "source": os.path.abspath(c.source),
+                     "digest": c.digest, "report": report, "args": c.args})
+    rows.sort(key=lambda r: -r["report"]["score"]["mean"])
+    for rank, r in enumerate(rows, 1):
+        r["rank"] = rank
+
+    arg_keys = _differing_args(candidates)
+    save_args(run.logs_run_dir, args)
+    write_league(out_dir, rows, arg_keys)
+
+    name_w = max(len("checkpoint"), *(len(r["checkpoint"]) for r in rows))
+    header = f"{'#':>3}  {'checkpoint':<{name_w}}  {'moyenne':>8}  {'±IC95':>6}  {'médiane':>7}  {'p5':>5}  {'p95':>5}"
+    print(header + "".join(f"  {k}" for k in arg_keys))
+    for r in rows:
+        s = r["report"]["score"]
+        line = (f"{r['rank']:>3}  {r['checkpoint']:<{name_w}}  {s['mean']:>8.1f}  {s['ci95'] or 0:>6.1f}  "
+                f"{s['median']:>7.0f}  {s['p5']:>5.0f}  {s['p95']:>5.0f}")
+        print(line + "".join(f"  {k}={(r['args'] or {}).get(k, '?')}" for k in arg_keys))
+    print(f"Classement: {os.path.join(out_dir, 'league.csv')}")
+    return rows
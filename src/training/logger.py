@@ -21,3 +21,36 @@ class CSVLogger:
         with open(self.path, "a", newline="", encoding="utf-8") as f:
             w = csv.writer(f)
             w.writerow([episode, int(score), float(total_reward), int(steps), float(epsilon), "" if loss_avg is None else float(loss_avg)])
+
+
+class ThroughputLogger:
+    """throughput.csv: débits acteurs (env-steps/s) et learner (updates/s), séparés"""
+    def __init__(self, logs_dir: str):
+        os.makedirs(logs_dir, exist_ok=True)
+        self.path = os.path.join(logs_dir, "throughput.csv")
+        if not os.path.exists(self.path):
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(["elapsed_s", "env_steps", "updates", "env_steps_per_s", "updates_per_s"])
+
+    def log(self, elapsed_s: float, env_steps: int, updates: int, env_steps_per_s: float, updates_per_s: float):
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow([round(elapsed_s, 3), int(env_steps), int(updates),
+                                    round(env_steps_per_s, 1), round(updates_per_s, 1)])
+
+
+class EvalLogger:
+    """eval.csv: évaluations gloutonnes périodiques, avec le step d'entraînement des poids évalués"""
+    def __init__(self, logs_dir: str):
+        os.makedirs(logs_dir, exist_ok=True)
+        self.path = os.path.join(logs_dir, "eval.csv")
+        if not os.path.exists(self.path):
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(["episode", "train_step", "eval_mean", "eval_median", "eval_p5", "eval_p95",
+                                        "eval_ci95", "eval_episodes", "eval_wall_s"])
+
+    def log(self, episode: int, train_step: int, report: dict):
+        s = report["score"]
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            ci95 = "" if s["ci95"] is None else round(s["ci95"], 3)
+            csv.writer(f).writerow([int(episode), int(train_step), round(s["mean"], 3), s["median"], round(s["p5"], 2),
+                                    round(s["p95"], 2), ci95, report["episodes"], report["wall_s"]])
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextlib
 import os
 from collections import deque
 from typing import Deque
@@ -7,18 +8,19 @@ from typing import Deque
 import numpy as np
 
 from ..ai.agent import AgentConfig, DQNAgent
+from ..ai.checkpoint import CheckpointWriter
+from ..env.action_repeat import wrap_action_repeat
+from ..env.pixels import pixel_obs_shape, wrap_pixels
+from ..env.recorder import wrap_recorder
 from ..env.trex_env import TrexEnv
+from ..game.clock import SimClock
 from ..paths import RunPaths, save_args
-from .logger import CSVLogger
+from ..utils import startup
+from .logger import CSVLogger, EvalLogger
 
 
-def train(args, run: RunPaths, assets) -> None:
-    save_args(run.logs_run_dir, args)
-    logger = CSVLogger(run.logs_run_dir)
-
-    env = TrexEnv(args, assets, render=bool(args.render))
-
-    cfg = AgentConfig(
+def agent_config(args) -> AgentConfig:
+    return AgentConfig(
         obs_dim=9,
         n_actions=3,
         gamma=args.gamma,
@@ -30,11 +32,58 @@ def train(args, run: RunPaths, assets) -> None:
         epsilon_start=args.epsilon_start,
         epsilon_end=args.epsilon_end,
         epsilon_decay_steps=args.epsilon_decay_steps,
+        prioritized=bool(args.prioritized),
+        per_alpha=args.per_alpha,
+        per_beta_start=args.per_beta_start,
+        per_beta_steps=args.per_beta_steps,
+        double_dqn=bool(args.double_dqn),
+        xla=bool(args.xla),
+        obs_shape=pixel_obs_shape(args),
     )
-    agent = DQNAgent(cfg)
 
-    if args.resume:
-        agent.load(args.resume)
+
+def train(args, run: RunPaths, assets) -> None:
+    if args.actors > 0:
+        from .distributed import train_distributed
+
+        return train_distributed(args, run)
+
+    save_args(run.logs_run_dir, args)
+    logger = CSVLogger(run.logs_run_dir)
+
+    # dt fixe: la physique ne dépend pas de la vitesse de la machine
+    clock = SimClock(args.fps, realtime=bool(args.realtime))
+    with startup.phase("env init"):
+        env = TrexEnv(args, assets, render=bool(args.render))
+        env = wrap_action_repeat(wrap_recorder(env, args, run.logs_run_dir), args, clock=clock)
+        env = wrap_pixels(env, args)
+
+    with startup.phase("model load"):
+        agent = DQNAgent(agent_config(args))
+        if args.resume:
+            agent.load(args.resume)
+    env = startup.first_step(env)
+
+    learner = None
+    if args.async_learner:
+        from ..ai.async_learner import AsyncLearner
+
+        # updates dans un thread: la boucle de jeu ne fait que act/remember
+        learner = AsyncLearner(agent, args.replay_ratio or 1.0 / args.train_freq, prefetch=args.prefetch)
+    saving = learner.paused if learner is not None else contextlib.nullcontext
+    # sauvegardes poids seuls (.npz), écrites en arrière-plan: quasi gratuites par épisode
+    ckpt = CheckpointWriter()
+
+    evaluator = None
+    if args.eval_every > 0:
+        from .evaluate import BackgroundEvaluator, promote_best
+
+        # best/ promu sur un score glouton, pas sur avg20 (bruité par l'exploration)
+        evaluator = BackgroundEvaluator(args)
+        eval_logger = EvalLogger(run.logs_run_dir)
+
+        def promote(evals) -> None:
+            promote_best(evals, agent, ckpt, run.best_dir, eval_logger)
 
     recent_scores: Deque[float] = deque(maxlen=20)
     best_avg = agent.best_score or 0.0
@@ -44,18 +93,22 @@ def train(args, run: RunPaths, assets) -> None:
         obs = env.reset()
         total_reward = 0.0
         steps = 0
+        frames = 0  # World.step joués (= steps sans --frame_skip)
         losses = []
 
         while True:
-            dt = env.tick()
+            dt = clock.tick()
             action = agent.act(obs, training=True)
             step_res = env.step(action, dt)
             next_obs, reward, done = step_res.obs, step_res.reward, step_res.done
 
-            agent.remember(obs, action, reward, next_obs, done)
+            if learner is not None:
+                learner.remember(obs, action, reward, next_obs, done)
+            else:
+                agent.remember(obs, action, reward, next_obs, done)
 
             # Train only every train_freq steps (faster!)
-            if steps % train_freq == 0:
+            if learner is None and steps % train_freq == 0:
                 loss = agent.train_step()
                 if loss is not None:
                     losses.append(loss)
@@ -63,26 +116,36 @@ def train(args, run: RunPaths, assets) -> None:
             obs = next_obs
             total_reward += reward
             steps += 1
+            frames += step_res.info.get("frames", 1)
 
             if env.render_enabled:
                 if env.render():
                     break
 
-            if done or steps >= args.max_steps:
+            if done or frames >= args.max_steps:
                 break
 
+        if learner is not None:
+            losses = learner.drain_losses()
         score = step_res.info["score"]
         loss_avg = float(np.mean(losses)) if losses else None
         recent_scores.append(score)
         avg20 = float(np.mean(recent_scores))
 
         if (ep % args.save_every) == 0:
-            agent.save(run.latest_dir)
-
-        if avg20 > best_avg:
+            with saving():
+                agent.save_async(run.latest_dir, ckpt)
+
+        if evaluator is not None:
+            if ep % args.eval_every == 0:
+                with saving():
+                    evaluator.submit(agent, ep)
+            promote(evaluator.poll())
+        elif avg20 > best_avg:
             best_avg = avg20
             agent.best_score = best_avg
-            agent.save(run.best_dir)
+            with saving():
+                agent.save_async(run.best_dir, ckpt)
 
         logger.log(ep, score, total_reward, steps, agent.epsilon, loss_avg)
 
@@ -92,5 +155,10 @@ def train(args, run: RunPaths, assets) -> None:
             if ep % 10 == 0:
                 print(f"[EP {ep}] score={int(score)} avg20={avg20:.1f} eps={agent.epsilon:.3f}")
 
-    agent.save(run.latest_dir)
+    if learner is not None:
+        learner.close()
+    if evaluator is not None:
+        promote(evaluator.close())
+    agent.save_async(run.latest_dir, ckpt)
+    ckpt.close()
     env.close()
@@ -1,6 +1,8 @@
+import contextlib
 import os
 import random
-from typing import Optional
+import time
+from typing import List, Optional, Tuple
 
 import numpy as np
 
@@ -15,3 +17,54 @@ def set_seed(seed: Optional[int]) -> None:
 
 def clamp(x: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, x))
+
+
+class StartupProfile:
+    """Chronométrage des phases de démarrage (--startup_profile); inactif par défaut"""
+
+    def __init__(self):
+        self.enabled = False
+        self.phases: List[Tuple[str, float]] = []
+        self._t0 = time.perf_counter()
+        self._done = False
+
+    def start(self) -> None:
+        self.enabled = True
+        self._t0 = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - t))
+
+    def first_step(self, env):
+        """Chronomètre le premier env.step(), puis rend la main au step d'origine (sans surcoût)"""
+        if not self.enabled:
+            return env
+        step = env.step
+
+        def timed_step(*a, **kw):
+            with self.phase("first step"):
+                res = step(*a, **kw)
+            env.step = step
+            self.report()
+            return res
+
+        env.step = timed_step
+        return env
+
+    def report(self) -> None:
+        if not self.enabled or self._done:
+            return
+        self._done = True
+        total = time.perf_counter() - self._t0
+        print("[startup] " + "  ".join(f"{name}={dt * 1e3:.0f}ms" for name, dt in self.phases) + f"  total={total * 1e3:.0f}ms")
+
+
+startup = StartupProfile()